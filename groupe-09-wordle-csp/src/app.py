@@ -1,6 +1,14 @@
+import itertools
+
 import streamlit as st
 
-from llm_agent import interroger_agent_wordle, load_dictionary
+from llm_agent import (
+    get_pattern_table,
+    interroger_agent_wordle_stream,
+    load_packed_dictionary,
+    new_session,
+    suggest_opening,
+)
 
 
 # ------------------------
@@ -16,21 +24,44 @@ st.set_page_config(
 # ------------------------
 # Dictionary + session state
 # ------------------------
-@st.cache_data
+# cache_resource : le dictionnaire compact est un np.memmap partagé entre
+# sessions (et entre workers via le fichier), pas une liste à sérialiser.
+@st.cache_resource
 def get_dictionary():
-    return load_dictionary("wordle.txt")
+    return load_packed_dictionary("wordle.txt")
+
+
+# cache_resource (et non cache_data) : la table est un np.memmap partagé,
+# on ne veut surtout pas la sérialiser / copier à chaque rerun.
+@st.cache_resource
+def get_table(_words):
+    return get_pattern_table(_words)
 
 
 DICTIONARY = get_dictionary()
+PATTERN_TABLE = get_table(DICTIONARY)
 
-if "attempts" not in st.session_state:
-    st.session_state.attempts = []  # [(GUESS, FEEDBACK), ...]
+if "session" not in st.session_state:
+    # Historique [(GUESS, FEEDBACK), ...] + candidats survivants (filtrage incrémental)
+    st.session_state.session = new_session(DICTIONARY, table=PATTERN_TABLE)
 if "history_inputs" not in st.session_state:
     st.session_state.history_inputs = []  # [{"Guess":..., "Feedback":...}, ...]
 if "history_prompts" not in st.session_state:
     st.session_state.history_prompts = []  # free-text prompts (optional)
 if "last_result" not in st.session_state:
     st.session_state.last_result = None
+if "last_trace" not in st.session_state:
+    st.session_state.last_trace = None  # tracing.TurnTrace of the last turn
+
+
+def show_trace(trace):
+    """Collapsible per-stage timings (CPU vs LLM) of a turn."""
+    with st.expander("Turn timings", expanded=False):
+        st.caption(
+            f"Total {trace.total_ms():.0f} ms: CPU {trace.total_ms('cpu'):.0f} ms, "
+            f"LLM {trace.total_ms('llm'):.0f} ms"
+        )
+        st.table(trace.rows())
 
 
 # ------------------------
@@ -52,6 +83,11 @@ mode = st.radio(
     horizontal=True,
 )
 
+if not st.session_state.session.attempts:
+    opener = suggest_opening(st.session_state.session)
+    if opener:
+        st.caption(f"Suggested first guess (opening book): **{opener}**")
+
 with st.expander("Help / expected format", expanded=False):
     st.write("Feedback letters: **V=green**, **J=yellow**, **G=gray**.")
     st.write("Recommended input: `ORATE GVVJG` or `ORATE -> GVVJG`.")
@@ -89,18 +125,34 @@ else:
 # ------------------------
 # Actions
 # ------------------------
-colA, colB = st.columns([1, 1])
+colA, colB, colC = st.columns([1, 1, 1])
 with colA:
     run_now = st.button("Solve", use_container_width=True)
 with colB:
+    undo_now = st.button("Undo last attempt", use_container_width=True)
+with colC:
     reset_now = st.button("Reset game", use_container_width=True)
 
 
+if undo_now:
+    if st.session_state.session.undo():
+        # On resynchronise la table d'affichage sur l'historique de la session
+        st.session_state.history_inputs = [
+            {"Guess": g, "Feedback": f} for g, f in st.session_state.session.attempts
+        ]
+        st.session_state.last_result = None
+        st.session_state.last_trace = None
+        st.success(f"Last attempt removed ({len(st.session_state.session)} candidates).")
+    else:
+        st.info("Nothing to undo.")
+
+
 if reset_now:
-    st.session_state.attempts = []
+    st.session_state.session.reset()
     st.session_state.history_inputs = []
     st.session_state.history_prompts = []
     st.session_state.last_result = None
+    st.session_state.last_trace = None
     st.success("Reset done.")
 
 
@@ -113,37 +165,66 @@ if run_now:
     elif not prompt.strip():
         st.error("Please enter an attempt.")
     else:
+        turn = None
         with st.spinner("Thinking..."):
             try:
                 # Keep a history of free-text prompts (optional)
                 if mode == "Free text (LLM extraction)":
                     st.session_state.history_prompts.append(prompt.strip())
 
-                result = interroger_agent_wordle(
+                # CSP + ranker only: the LLM commentary is streamed below
+                n_attempts = len(st.session_state.session.attempts)
+                turn = interroger_agent_wordle_stream(
                     prompt_utilisateur=prompt,
-                    dictionary_words=DICTIONARY,
-                    attempts=st.session_state.attempts,
+                    session=st.session_state.session,
                 )
-                st.session_state.last_result = result
 
-                # If the user used the structured mode, log it nicely
-                if mode == "Wordle (guess + feedback)":
-                    g = guess.strip().upper()
-                    f = feedback.strip().upper()
-                    if len(g) == 5 and len(f) == 5:
-                        st.session_state.history_inputs.append({"Guess": g, "Feedback": f})
+                # If the user used the structured mode, log it nicely, but only
+                # once the session accepted the attempt (parse / hard mode)
+                accepted = len(st.session_state.session.attempts) > n_attempts
+                if mode == "Wordle (guess + feedback)" and accepted:
+                    g, f = st.session_state.session.attempts[-1]
+                    st.session_state.history_inputs.append({"Guess": g, "Feedback": f})
 
             except Exception as e:
                 st.error(f"Error: {e}")
 
+        if turn is not None:
+            st.divider()
+            st.subheader("Result")
+            st.text(turn.text)
+            result = turn.text
+
+            # Ranker decision, computed only now: the CSP result is already shown
+            with st.spinner("Ranking guesses..."):
+                for decision in turn.decision:
+                    st.text(decision)
+                    result += f"\n\n{decision}"
+
+            # Stream the LLM commentary token by token (nothing if disabled)
+            tokens = iter(turn.commentary)
+            first = next(tokens, None)
+            if first is not None:
+                st.subheader("LLM commentary")
+                commentary = st.write_stream(itertools.chain([first], tokens))
+                result += f"\n\nLLM COMMENTARY:\n{commentary}"
+
+            st.session_state.last_result = result
+            st.session_state.last_trace = turn.trace
+            st.session_state.result_shown = True
+            show_trace(turn.trace)
+
 
 # ------------------------
 # Output
 # ------------------------
-if st.session_state.last_result:
+# Already displayed above when it was just computed (streamed)
+if st.session_state.last_result and not st.session_state.pop("result_shown", False):
     st.divider()
     st.subheader("Result")
     st.text(st.session_state.last_result)
+    if st.session_state.last_trace is not None:
+        show_trace(st.session_state.last_trace)
 
 
 # ------------------------
@@ -159,7 +240,8 @@ if st.session_state.history_inputs:
 # Attempts debug (optional but useful)
 # ------------------------
 with st.expander("Session attempts (debug)", expanded=False):
-    st.write(st.session_state.attempts)
+    st.write(st.session_state.session.attempts)
+    st.write(f"{len(st.session_state.session)} candidates remain.")
 
 
 # ------------------------
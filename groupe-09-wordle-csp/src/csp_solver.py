@@ -1,5 +1,7 @@
 from collections import Counter
 
+import numpy as np
+
 def wordle_feedback_vjg(secret: str, guess: str) -> str:
     """
     Feedback Wordle (FR) :
@@ -32,36 +34,159 @@ def wordle_feedback_vjg(secret: str, guess: str) -> str:
     return "".join(res)
 
 
-def solve_wordle_csp(possible_words, attempts):
+# ---------------------------------------------------------------------------
+# Représentation numérique (NumPy)
+# ---------------------------------------------------------------------------
+# Un feedback V/J/G est encodé en base 3 sur un octet :
+#   G = 0, J = 1, V = 2, position i pondérée par 3**i
+# => 3**5 = 243 motifs possibles, codes dans [0, 242] (tient dans un uint8).
+N_PATTERNS = 243
+_FEEDBACK_DIGITS = {"G": 0, "J": 1, "V": 2}
+_POW3 = np.array([1, 3, 9, 27, 81], dtype=np.uint8)
+
+
+def encode_feedback(fb: str) -> int:
     """
-    Résout Wordle par filtrage de contraintes (approche CSP "par vérification").
+    Encode un feedback V/J/G (5 caractères) en code base 3 dans [0, 242].
+    """
+    fb = fb.strip().upper()
+    if len(fb) != 5 or any(c not in _FEEDBACK_DIGITS for c in fb):
+        raise ValueError("feedback doit faire 5 caractères parmi V/J/G")
+    return sum(_FEEDBACK_DIGITS[c] * 3**i for i, c in enumerate(fb))
+
+
+def decode_feedback(code: int) -> str:
+    """
+    Inverse de encode_feedback : code base 3 -> chaîne V/J/G.
+    """
+    code = int(code)
+    if not 0 <= code < N_PATTERNS:
+        raise ValueError("code de feedback hors de [0, 242]")
+    res = []
+    for _ in range(5):
+        res.append("GJV"[code % 3])
+        code //= 3
+    return "".join(res)
+
+
+def encode_words(words) -> np.ndarray:
+    """
+    Convertit une liste de mots (5 lettres A-Z, déjà normalisés) en tableau
+    N x 5 de uint8, chaque lettre étant codée 0..25.
+    """
+    words = list(words)
+    if not words:
+        return np.zeros((0, 5), dtype=np.uint8)
+    raw = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8)
+    return (raw.reshape(len(words), 5) - ord("A")).astype(np.uint8)
+
+
+def letter_counts(letters: np.ndarray) -> np.ndarray:
+    """
+    Matrice N x 26 (uint8) : nombre d'occurrences de chaque lettre par mot.
+    """
+    n = len(letters)
+    # Un seul bincount sur les indices aplatis (ligne * 26 + lettre)
+    flat = (np.arange(n, dtype=np.int64)[:, None] * 26 + letters).ravel()
+    return np.bincount(flat, minlength=n * 26).astype(np.uint8).reshape(n, 26)
 
-    Conceptuellement :
-      - Variables : le mot secret (un mot de 5 lettres)
-      - Domaine   : possible_words (ton dictionnaire de mots 5 lettres)
-      - Contraintes : chaque (guess, feedback) impose une contrainte sur le secret :
-            feedback(secret, guess) == feedback_observé
+
+def feedback_matrix(guesses: np.ndarray, secrets: np.ndarray, secret_counts=None) -> np.ndarray:
+    """
+    Noyau vectorisé : codes de feedback de G guesses contre N secrets en une
+    seule passe (c'est la boucle chaude du filtrage, du ranker, de la table de
+    motifs et du livre d'ouvertures).
 
     Paramètres
     ----------
-    possible_words : iterable[str]
-        Liste / set / générateur de candidats (mots potentiellement secrets).
-    attempts : list[tuple[str, str]]
-        Liste des tentatives sous la forme [(guess, feedback), ...]
-        - guess : mot proposé (5 lettres)
-        - feedback : chaîne de 5 caractères dans {V, J, G}
-            V = vert, J = jaune, G = gris
+    guesses : np.ndarray
+        tableau G x 5 (uint8, lettres 0..25), cf. encode_words
+    secrets : np.ndarray
+        tableau N x 5 (uint8, lettres 0..25)
+    secret_counts : np.ndarray, optionnel
+        letter_counts(secrets) s'il est déjà calculé (ex. WordleSession.counts)
 
     Retour
     ------
-    list[str]
-        Tous les mots de possible_words compatibles avec TOUTES les contraintes.
+    np.ndarray (uint8, G x N) : codes base 3 (cf. encode_feedback).
+
+    Doublons : à la position i (non verte), la lettre L est jaune ssi le nombre
+    d'occurrences de L dans le secret hors positions vertes dépasse le nombre
+    de positions non vertes j < i du guess portant L (attribution gauche ->
+    droite de wordle_feedback_vjg). Comme une position j < i portant L est
+    soit verte soit non verte, cela revient à :
+
+        count(L, secret) > #{j < i : g_j = L} + #{j > i : g_j = L, verte}
+
+    Seul le terme "j > i" dépend du secret, et uniquement pour les lettres
+    répétées du guess : le cas courant est une lecture de la matrice de
+    comptes et une comparaison.
     """
+    guesses = np.asarray(guesses, dtype=np.uint8).reshape(-1, 5)
+    secrets = np.asarray(secrets, dtype=np.uint8).reshape(-1, 5)
+    if secret_counts is None:
+        secret_counts = letter_counts(secrets)
+    counts_by_letter = np.ascontiguousarray(secret_counts.T)    # 26 x N
+    columns = np.ascontiguousarray(secrets.T)                   # 5 x N
+    shape = (len(guesses), len(secrets))
 
-    # -------------------------------------------------------------------------
-    # 1) Nettoyage / validation des contraintes (attempts)
-    #    Objectif : ignorer toute entrée mal formée plutôt que planter le solver.
-    # -------------------------------------------------------------------------
+    green = [np.equal(guesses[:, i, None], columns[i]) for i in range(5)]
+    # same[:, i, j] : le guess porte la même lettre en i et en j
+    same = guesses[:, :, None] == guesses[:, None, :]
+
+    codes = np.zeros(shape, dtype=np.uint8)
+    digit = np.empty(shape, dtype=np.uint8)
+    for i in range(5):
+        before = same[:, i, :i].sum(axis=1, dtype=np.uint8)[:, None]
+        count = counts_by_letter[guesses[:, i]]
+        repeated = [j for j in range(i + 1, 5) if same[:, i, j].any()]
+        if repeated:
+            threshold = np.broadcast_to(before, shape).copy()
+            for j in repeated:
+                threshold += green[j] & same[:, i, j, None]
+        else:
+            threshold = before
+        yellow = np.greater(count, threshold)
+        yellow &= ~green[i]
+
+        # Chiffre base 3 de la position i : 2 (vert), 1 (jaune) ou 0
+        np.add(green[i], green[i], out=digit, dtype=np.uint8)
+        digit += yellow
+        if _POW3[i] != 1:
+            digit *= _POW3[i]
+        codes += digit
+
+    return codes
+
+
+def feedback_codes(guess: str, secrets: np.ndarray, secret_counts=None) -> np.ndarray:
+    """
+    Version vectorisée de wordle_feedback_vjg pour UN guess contre N secrets
+    (une ligne de feedback_matrix).
+
+    Paramètres
+    ----------
+    guess : str | np.ndarray
+        mot proposé (5 lettres A-Z), ou directement ses 5 lettres encodées
+    secrets : np.ndarray
+        tableau N x 5 (uint8, lettres 0..25), cf. encode_words
+
+    Retour
+    ------
+    np.ndarray (uint8, taille N) : codes base 3 (cf. encode_feedback).
+    """
+    if isinstance(guess, str):
+        g = encode_words([guess.strip().upper()])
+    else:
+        g = np.asarray(guess, dtype=np.uint8).reshape(1, 5)
+    return feedback_matrix(g, secrets, secret_counts)[0]
+
+
+def clean_attempts(attempts) -> list:
+    """
+    Nettoyage / validation des contraintes (attempts).
+    Objectif : ignorer toute entrée mal formée plutôt que planter le solver.
+    """
     cleaned_attempts = []
 
     for item in attempts:
@@ -94,33 +219,515 @@ def solve_wordle_csp(possible_words, attempts):
 
         cleaned_attempts.append((guess, fb))
 
+    return cleaned_attempts
+
+
+# ---------------------------------------------------------------------------
+# Contraintes compilées (lettres / positions / comptages)
+# ---------------------------------------------------------------------------
+class WordleConstraints:
+    """
+    Compilation d'un historique de tentatives en contraintes explicites :
+      - fixed[i]        : lettre imposée à la position i (-1 si libre)    (verts)
+      - forbidden[i, L] : la lettre L est interdite à la position i        (jaunes/gris)
+      - min_count[L]    : nombre minimal d'occurrences de L                (verts + jaunes)
+      - max_count[L]    : nombre maximal d'occurrences de L (5 = libre)    (gris => exact)
+
+    Équivalence avec le filtrage par feedback (wordle_feedback_vjg) :
+    pour une lettre L d'un guess, le secret contient EXACTEMENT V+J occurrences
+    de L si l'une des positions de L est grise, et AU MOINS V+J sinon.
+    Les jaunes étant attribués de gauche à droite, un feedback où un gris de L
+    précède un jaune de L (hors verts) est impossible : la contrainte est
+    alors marquée insatisfiable, comme le serait la comparaison de feedbacks.
+    """
+
+    def __init__(self):
+        self.fixed = np.full(5, -1, dtype=np.int16)
+        self.forbidden = np.zeros((5, 26), dtype=bool)
+        self.min_count = np.zeros(26, dtype=np.uint8)
+        self.max_count = np.full(26, 5, dtype=np.uint8)
+        self.satisfiable = True
+
+    @classmethod
+    def from_attempts(cls, attempts) -> "WordleConstraints":
+        cons = cls()
+        for guess, fb in clean_attempts(attempts):
+            cons.add(guess, fb)
+        return cons
+
+    def add(self, guess: str, fb: str) -> None:
+        """Ajoute une tentative DÉJÀ normalisée (cf. clean_attempts)."""
+        g = encode_words([guess])[0]
+        seen_gray = set()
+
+        for i in range(5):
+            letter = int(g[i])
+            if fb[i] == "V":
+                if self.fixed[i] not in (-1, letter):
+                    self.satisfiable = False
+                self.fixed[i] = letter
+            else:
+                # Jaune ou gris : la lettre n'est pas à cette position
+                self.forbidden[i, letter] = True
+                if fb[i] == "G":
+                    seen_gray.add(letter)
+                elif letter in seen_gray:
+                    # Jaune après un gris de la même lettre : feedback impossible
+                    self.satisfiable = False
+
+        for letter in set(g.tolist()):
+            n_hits = sum(1 for i in range(5) if g[i] == letter and fb[i] != "G")
+            self.min_count[letter] = max(self.min_count[letter], n_hits)
+            if letter in seen_gray:
+                self.max_count[letter] = min(self.max_count[letter], n_hits)
+
+    def mask(self, letters: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Masque booléen des mots (lignes de `letters` / `counts`) compatibles.
+        """
+        n = len(letters)
+        if not self.satisfiable:
+            return np.zeros(n, dtype=bool)
+
+        ok = np.ones(n, dtype=bool)
+        for i in range(5):
+            if self.fixed[i] >= 0:
+                ok &= letters[:, i] == self.fixed[i]
+            if self.forbidden[i].any():
+                ok &= ~self.forbidden[i][letters[:, i]]
+
+        for letter in np.flatnonzero(self.min_count > 0):
+            ok &= counts[:, letter] >= self.min_count[letter]
+        for letter in np.flatnonzero(self.max_count < 5):
+            ok &= counts[:, letter] <= self.max_count[letter]
+        return ok
+
+    def hard_mask(self, letters: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Masque des guesses autorisés en mode difficile : ils réutilisent les
+        indices révélés (verts à leur place, verts + jaunes au moins autant de
+        fois). Les gris et les positions interdites des jaunes restent jouables.
+        """
+        ok = np.ones(len(letters), dtype=bool)
+        for i in np.flatnonzero(self.fixed >= 0):
+            ok &= letters[:, i] == self.fixed[i]
+        for letter in np.flatnonzero(self.min_count > 0):
+            ok &= counts[:, letter] >= self.min_count[letter]
+        return ok
+
+
+def solve_wordle_csp(possible_words, attempts, table=None):
+    """
+    Résout Wordle par filtrage de contraintes (approche CSP "par vérification").
+
+    Conceptuellement :
+      - Variables : le mot secret (un mot de 5 lettres)
+      - Domaine   : possible_words (ton dictionnaire de mots 5 lettres)
+      - Contraintes : chaque (guess, feedback) impose une contrainte sur le secret :
+            feedback(secret, guess) == feedback_observé
+
+    Paramètres
+    ----------
+    possible_words : iterable[str]
+        Liste / set / générateur de candidats (mots potentiellement secrets).
+    attempts : list[tuple[str, str]]
+        Liste des tentatives sous la forme [(guess, feedback), ...]
+        - guess : mot proposé (5 lettres)
+        - feedback : chaîne de 5 caractères dans {V, J, G}
+            V = vert, J = jaune, G = gris
+    table : PatternTable, optionnel
+        Table de motifs précalculée (cf. pattern_table.py). Si fournie, le
+        filtrage se fait par lecture + comparaison vectorisée au lieu de
+        simuler le feedback mot par mot.
+
+    Retour
+    ------
+    list[str]
+        Tous les mots de possible_words compatibles avec TOUTES les contraintes.
+    """
+
     # -------------------------------------------------------------------------
-    # 2) Filtrage du dictionnaire
-    #    Pour chaque mot candidat w, on vérifie toutes les contraintes :
-    #        wordle_feedback_vjg(w, guess) doit être EXACTEMENT fb
-    #    Si une contrainte échoue, w est éliminé.
+    # 1) Nettoyage / validation des contraintes (attempts)
+    # -------------------------------------------------------------------------
+    cleaned_attempts = clean_attempts(attempts)
+
     # -------------------------------------------------------------------------
+    # 1bis) Table de motifs (optionnelle) : filtrage vectorisé
+    #    Pour chaque tentative, la ligne table[guess] donne le code du feedback
+    #    pour tous les secrets : un mot reste ssi code == code observé.
+    # -------------------------------------------------------------------------
+    if table is not None:
+        return _solve_with_table(possible_words, cleaned_attempts, table)
+
+    # -------------------------------------------------------------------------
+    # 2) Compilation des tentatives en contraintes lettres / positions / comptages
+    # -------------------------------------------------------------------------
+    constraints = WordleConstraints()
+    for guess, fb in cleaned_attempts:
+        constraints.add(guess, fb)
+
+    # -------------------------------------------------------------------------
+    # 3) Filtrage du dictionnaire par masques booléens vectorisés
+    #    Le dictionnaire est vu comme un tableau N x 5 (lettres) + N x 26
+    #    (comptages) ; chaque contrainte élimine des lignes en une opération.
+    # -------------------------------------------------------------------------
+    words = [w.strip().upper() for w in possible_words]
+    # On ignore ce qui n'a pas exactement 5 lettres
+    words = [w for w in words if len(w) == 5]
+
+    # Les mots hors A-Z (accents, tirets...) ne rentrent pas dans le tableau :
+    # ils passent par la vérification historique, feedback par feedback.
+    is_az = [w.isascii() and w.isalpha() for w in words]
+    letters = encode_words([w for w, ok in zip(words, is_az) if ok])
+    keep = iter(constraints.mask(letters, letter_counts(letters)).tolist())
+
     solutions = []
+    for w, ok in zip(words, is_az):
+        if ok:
+            if next(keep):
+                solutions.append(w)
+        elif all(wordle_feedback_vjg(w, guess) == fb for guess, fb in cleaned_attempts):
+            solutions.append(w)
 
+    return solutions
+
+
+def hard_mode_guesses(guess_words, attempts) -> list:
+    """
+    Guesses de `guess_words` jouables en mode difficile après `attempts`
+    (cf. WordleConstraints.hard_mask). La liste des guesses autorisés peut
+    être plus large que celle des secrets possibles (solve_wordle_csp).
+    """
+    words = [w.strip().upper() for w in guess_words]
+    words = [w for w in words if len(w) == 5 and w.isascii() and w.isalpha()]
+    cons = WordleConstraints.from_attempts(attempts)
+    letters = encode_words(words)
+    keep = cons.hard_mask(letters, letter_counts(letters))
+    return [w for w, ok in zip(words, keep.tolist()) if ok]
+
+
+def _solve_with_table(possible_words, cleaned_attempts, table):
+    """
+    Filtrage via la table de motifs : un masque booléen sur les secrets de la
+    table, affiné tentative par tentative.
+    Les mots de possible_words absents de la table passent par le chemin
+    classique (wordle_feedback_vjg).
+    """
+    mask = np.ones(table.n_secrets, dtype=bool)
+    for guess, fb in cleaned_attempts:
+        mask &= table.row(guess) == encode_feedback(fb)
+
+    solutions = []
     for w in possible_words:
-        # Normalisation du candidat
         w = w.strip().upper()
-
-        # On ignore ce qui n'a pas exactement 5 lettres
         if len(w) != 5:
             continue
+        idx = table.index.get(w)
+        if idx is not None:
+            if mask[idx]:
+                solutions.append(w)
+        elif all(wordle_feedback_vjg(w, guess) == fb for guess, fb in cleaned_attempts):
+            solutions.append(w)
 
-        # Hypothèse : w est valide tant qu'aucune contrainte ne le contredit
-        ok = True
+    return solutions
 
-        for guess, fb in cleaned_attempts:
-            # Contrainte principale (modèle Wordle exact, y compris doublons)
-            if wordle_feedback_vjg(w, guess) != fb:
-                ok = False
-                break  # inutile de tester les autres contraintes
 
-        if ok:
-            solutions.append(w)
+# ---------------------------------------------------------------------------
+# Session incrémentale
+# ---------------------------------------------------------------------------
+def _dictionary_arrays(dictionary_words):
+    """(mots, lettres N x 5) d'un dictionnaire : liste de str ou PackedDictionary."""
+    letters = getattr(dictionary_words, "letters", None)
+    if letters is not None:
+        # Dictionnaire compact (packed_dictionary.PackedDictionary) : les
+        # lettres sont déjà encodées (memmap), aucun mot n'est décodé ici
+        return dictionary_words, letters
+    words = [w.strip().upper() for w in dictionary_words]
+    words = [w for w in words if len(w) == 5]
+    return words, encode_words(words)
 
-    return solutions
 
+def _with_guesses(words, letters, guess_words):
+    """
+    Ajoute aux mots-réponses les guesses autorisés qui n'en font pas partie :
+    les indices 0..n_réponses-1 restent ceux des réponses, les guesses
+    supplémentaires viennent à la suite (dans leur ordre d'origine).
+    """
+    guess_list, guess_letters = _dictionary_arrays(guess_words)
+    weights = 26 ** np.arange(4, -1, -1, dtype=np.int32)
+    extra = np.flatnonzero(~np.isin(guess_letters.astype(np.int32) @ weights,
+                                    letters.astype(np.int32) @ weights))
+    if len(extra) == 0:
+        return words, letters
+    combined = list(words) + [guess_list[int(i)] for i in extra]
+    return combined, np.concatenate([np.asarray(letters), np.asarray(guess_letters)[extra]])
+
+
+def _matching_table(table, words, letters):
+    # La table n'est exploitable que si elle est indexée sur le même dictionnaire
+    if table is not None and len(table.words) == len(words) and np.array_equal(table.letters, letters):
+        return table
+    return None
+
+
+class WordleSession:
+    """
+    État d'une partie : les indices (dans le dictionnaire) des mots encore
+    compatibles avec l'historique.
+
+    Au lieu de re-filtrer tout le dictionnaire à chaque tour, add_attempt
+    n'applique que la NOUVELLE contrainte aux candidats survivants : le coût
+    d'un tour est proportionnel au nombre de candidats restants.
+
+    Chaque tour empile un nouveau tableau d'indices : undo() et reset()
+    reviennent à un état précédent sans rien recalculer.
+
+    guess_words : liste de guesses autorisés plus large que les réponses
+    (optionnelle). Les mots absents des réponses sont ajoutés à la fin de
+    `words` : ils peuvent être joués et classés, jamais candidats.
+
+    hard_mode : chaque guess doit réutiliser les indices révélés. L'ensemble
+    des guesses jouables (guess_pool) est empilé comme les candidats et
+    restreint à chaque tour par les seuls NOUVEAUX indices, via un index
+    lettre / position précalculé.
+    """
+
+    def __init__(self, dictionary_words, table=None, guess_words=None, hard_mode: bool = False):
+        self.words, self.letters = _dictionary_arrays(dictionary_words)
+        self.n_answers = len(self.words)
+        if guess_words is not None:
+            self.words, self.letters = _with_guesses(self.words, self.letters, guess_words)
+        self.counts = letter_counts(self.letters)
+        self.table = _matching_table(table, self.words, self.letters)
+        self.hard_mode = hard_mode
+        self.attempts = []
+        self._history = [np.arange(self.n_answers, dtype=np.int32)]
+        # Mode difficile : (verts fixés, comptages minimaux) et guesses jouables
+        self._hints = [(np.full(5, -1, dtype=np.int16), np.zeros(26, dtype=np.uint8))]
+        self._eligible = [np.arange(len(self.words), dtype=np.int32)]
+        self._position_index = None
+
+    @property
+    def candidates(self) -> np.ndarray:
+        """Indices (int32) des mots encore possibles."""
+        return self._history[-1]
+
+    @property
+    def guess_pool(self) -> np.ndarray:
+        """Indices (int32) des guesses jouables (tous, hors mode difficile)."""
+        return self._eligible[-1]
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def candidate_words(self, limit=None) -> list:
+        idx = self.candidates if limit is None else self.candidates[:limit]
+        return [self.words[i] for i in idx]
+
+    def _keep(self, guess: str, fb: str, idx: np.ndarray) -> np.ndarray:
+        # Table dense : simple lecture des colonnes survivantes.
+        # Sinon : noyau feedback_codes sur le sous-ensemble seulement
+        # (et non sur tout le dictionnaire, comme une ligne de table sparse).
+        if self.table is not None and self.table.dense and guess in self.table.index:
+            return self.table.row(guess)[idx] == encode_feedback(fb)
+        return feedback_codes(guess, self.letters[idx], self.counts[idx]) == encode_feedback(fb)
+
+    # -----------------------------------------------------------------------
+    # Mode difficile
+    # -----------------------------------------------------------------------
+    def _positions(self) -> np.ndarray:
+        # index[i, L] : masque des mots ayant la lettre L en position i
+        # (construit une fois, au premier vert)
+        if self._position_index is None:
+            self._position_index = (self.letters.T[:, None, :] == np.arange(26, dtype=np.uint8)[None, :, None])
+        return self._position_index
+
+    def allows(self, guess: str) -> bool:
+        """Vrai si `guess` respecte les indices révélés (toujours vrai hors mode difficile)."""
+        if not self.hard_mode:
+            return True
+        fixed, min_count = self._hints[-1]
+        g = encode_words([guess])[0]
+        if any(fixed[i] not in (-1, g[i]) for i in range(5)):
+            return False
+        return bool(np.all(np.bincount(g, minlength=26) >= min_count))
+
+    def _push_hints(self, guess: str, fb: str) -> None:
+        fixed, min_count = self._hints[-1]
+        g = encode_words([guess])[0]
+        new_fixed = fixed.copy()
+        new_min = min_count.copy()
+        for i in range(5):
+            if fb[i] == "V":
+                new_fixed[i] = g[i]
+        hits = np.bincount(g[[i for i in range(5) if fb[i] != "G"]], minlength=26)
+        np.maximum(new_min, hits.astype(np.uint8), out=new_min)
+        self._hints.append((new_fixed, new_min))
+
+        eligible = self._eligible[-1]
+        if self.hard_mode:
+            # Seuls les indices nouveaux filtrent les guesses encore jouables
+            keep = np.ones(len(eligible), dtype=bool)
+            index = None
+            for i in np.flatnonzero(new_fixed != fixed):
+                index = self._positions() if index is None else index
+                keep &= index[i, new_fixed[i]][eligible]
+            for letter in np.flatnonzero(new_min > min_count):
+                keep &= self.counts[eligible, letter] >= new_min[letter]
+            eligible = eligible[keep]
+        self._eligible.append(eligible)
+
+    def add_attempt(self, guess: str, fb: str, known_candidates=None) -> int:
+        """
+        Ajoute une tentative et filtre les candidats restants.
+        Retourne le nombre de candidats après filtrage.
+
+        known_candidates : indices déjà connus du résultat (ex. livre
+        d'ouvertures) ; le filtrage est alors sauté.
+        """
+        cleaned = clean_attempts([(guess, fb)])
+        if not cleaned:
+            raise ValueError(f"Tentative invalide: {guess!r} -> {fb!r}")
+        guess, fb = cleaned[0]
+        if not self.allows(guess):
+            raise ValueError(f"Mode difficile : {guess} ne réutilise pas les indices révélés")
+
+        if known_candidates is not None:
+            self._history.append(np.asarray(known_candidates, dtype=np.int32))
+        else:
+            idx = self.candidates
+            self._history.append(idx[self._keep(guess, fb, idx)])
+        self._push_hints(guess, fb)
+        self.attempts.append((guess, fb))
+        return len(self)
+
+    def undo(self) -> bool:
+        """Annule la dernière tentative. Retourne False s'il n'y en a pas."""
+        if not self.attempts:
+            return False
+        self._history.pop()
+        self._hints.pop()
+        self._eligible.pop()
+        self.attempts.pop()
+        return True
+
+    def reset(self) -> None:
+        """Revient au dictionnaire complet (sans recalcul)."""
+        del self._history[1:]
+        del self._hints[1:]
+        del self._eligible[1:]
+        self.attempts.clear()
+
+
+# ---------------------------------------------------------------------------
+# Plusieurs plateaux (Quordle / Octordle)
+# ---------------------------------------------------------------------------
+SOLVED_FEEDBACK = "VVVVV"
+
+
+class MultiBoardSession:
+    """
+    Partie sur plusieurs plateaux joués avec les MÊMES guesses (un secret par
+    plateau). Le dictionnaire (mots, lettres, table) est partagé ; chaque
+    plateau garde ses propres indices de candidats.
+
+    À chaque tour, les candidats de tous les plateaux non résolus sont
+    concaténés et filtrés en une seule passe : un appel au noyau
+    feedback_codes (ou une lecture de ligne de la table dense), comparé au
+    code attendu de chaque plateau, puis redécoupé par plateau.
+
+    Comme WordleSession, chaque tour empile un état : undo() / reset() sans
+    recalcul.
+    """
+
+    def __init__(self, dictionary_words, n_boards: int, table=None):
+        if n_boards < 1:
+            raise ValueError(f"Nombre de plateaux invalide: {n_boards}")
+        self.words, self.letters = _dictionary_arrays(dictionary_words)
+        self.counts = letter_counts(self.letters)
+        self.table = _matching_table(table, self.words, self.letters)
+        self.n_boards = n_boards
+        self.attempts = []   # [(GUESS, [FEEDBACK ou None si plateau déjà résolu])]
+        full = np.arange(len(self.words), dtype=np.int32)
+        # Pile d'états : (candidats par plateau, plateau résolu ?)
+        self._history = [([full] * n_boards, (False,) * n_boards)]
+
+    @property
+    def boards(self) -> list:
+        """Indices (int32) des mots encore possibles, un tableau par plateau."""
+        return self._history[-1][0]
+
+    @property
+    def solved(self) -> tuple:
+        return self._history[-1][1]
+
+    @property
+    def unsolved(self) -> list:
+        """Numéros (0..n-1) des plateaux non résolus."""
+        return [b for b in range(self.n_boards) if not self.solved[b]]
+
+    @property
+    def finished(self) -> bool:
+        return all(self.solved)
+
+    def candidate_words(self, board: int, limit=None) -> list:
+        idx = self.boards[board] if limit is None else self.boards[board][:limit]
+        return [self.words[i] for i in idx]
+
+    def _codes(self, guess: str, idx: np.ndarray) -> np.ndarray:
+        if self.table is not None and self.table.dense and guess in self.table.index:
+            return self.table.row(guess)[idx]
+        return feedback_codes(guess, self.letters[idx], self.counts[idx])
+
+    def add_attempt(self, guess: str, feedbacks) -> list:
+        """
+        Ajoute un guess joué sur tous les plateaux.
+
+        feedbacks : un feedback V/J/G par plateau NON résolu, dans l'ordre des
+        plateaux. Retourne le nombre de candidats de chaque plateau.
+        """
+        active = self.unsolved
+        if not active:
+            raise ValueError("Tous les plateaux sont déjà résolus")
+        feedbacks = list(feedbacks)
+        if len(feedbacks) != len(active):
+            raise ValueError(f"{len(active)} feedback(s) attendu(s), {len(feedbacks)} reçu(s)")
+        cleaned = clean_attempts([(guess, fb) for fb in feedbacks])
+        if len(cleaned) != len(feedbacks):
+            raise ValueError(f"Tentative invalide: {guess!r} -> {feedbacks!r}")
+        guess = cleaned[0][0]
+        feedbacks = [fb for _, fb in cleaned]
+
+        boards = list(self.boards)
+        solved = list(self.solved)
+
+        # Filtrage groupé : une seule évaluation du noyau pour tous les plateaux
+        parts = [boards[b] for b in active]
+        sizes = [len(p) for p in parts]
+        idx = np.concatenate(parts)
+        expected = np.repeat([encode_feedback(fb) for fb in feedbacks], sizes).astype(np.uint8)
+        keep = self._codes(guess, idx) == expected
+        for b, part, mask in zip(active, parts, np.split(keep, np.cumsum(sizes)[:-1])):
+            boards[b] = part[mask]
+
+        per_board = [None] * self.n_boards
+        for b, fb in zip(active, feedbacks):
+            per_board[b] = fb
+            solved[b] = fb == SOLVED_FEEDBACK
+
+        self._history.append((boards, tuple(solved)))
+        self.attempts.append((guess, per_board))
+        return [len(c) for c in boards]
+
+    def undo(self) -> bool:
+        """Annule le dernier guess. Retourne False s'il n'y en a pas."""
+        if not self.attempts:
+            return False
+        self._history.pop()
+        self.attempts.pop()
+        return True
+
+    def reset(self) -> None:
+        """Revient au dictionnaire complet sur tous les plateaux (sans recalcul)."""
+        del self._history[1:]
+        self.attempts.clear()
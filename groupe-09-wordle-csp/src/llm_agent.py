@@ -1,10 +1,72 @@
 import json
+import os
 import re
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
 
-import ollama
+from csp_solver import SOLVED_FEEDBACK, MultiBoardSession, WordleSession, encode_feedback
+from llm_client import make_client
+from opening_book import OPENING_BOOK_FILE, OpeningBook
+from packed_dictionary import PackedDictionary
+from pattern_table import dictionary_checksum, load_pattern_table
+from ranker import rank_guesses, rank_guesses_multi
+from tracing import TurnTrace
 
-from csp_solver import solve_wordle_csp
+
+# ---------------------------------------------------------------------------
+# Table de motifs (cf. pattern_table.py)
+# ---------------------------------------------------------------------------
+# WORDLE_PATTERN_TABLE = dense | sparse | off
+#   dense  : matrice complète sur disque (construite au 1er lancement, mmap ensuite)
+#   sparse : lignes calculées à la demande (pas de fichier)
+#   off    : filtrage historique mot par mot
+PATTERN_TABLE_MODE = os.environ.get("WORDLE_PATTERN_TABLE", "sparse")
+
+
+def get_pattern_table(dictionary_words):
+    """Table de motifs selon PATTERN_TABLE_MODE (None si désactivée)."""
+    return load_pattern_table(dictionary_words, PATTERN_TABLE_MODE)
+
+
+def new_session(dictionary_words, table=None, guess_words=None, hard_mode: bool = False) -> WordleSession:
+    """
+    Session de jeu (candidats survivants + historique) pour un dictionnaire.
+    guess_words : guesses autorisés en plus des réponses ; hard_mode : les
+    guesses doivent réutiliser les indices révélés.
+    """
+    return WordleSession(dictionary_words, table=table, guess_words=guess_words, hard_mode=hard_mode)
+
+
+def new_multi_session(dictionary_words, n_boards: int, table=None) -> MultiBoardSession:
+    """Partie multi-plateaux (Quordle = 4, Octordle = 8) sur un dictionnaire."""
+    return MultiBoardSession(dictionary_words, n_boards, table=table)
+
+
+# ---------------------------------------------------------------------------
+# Livre d'ouvertures (cf. opening_book.py), chargé à la première utilisation
+# ---------------------------------------------------------------------------
+# Clé : sha256 du dictionnaire -> OpeningBook, ou None si absent / périmé
+# (régénération : python opening_book.py)
+_OPENING_BOOKS = {}
+
+
+def get_opening_book(words) -> Optional[OpeningBook]:
+    key = dictionary_checksum(words)
+    if key not in _OPENING_BOOKS:
+        try:
+            _OPENING_BOOKS[key] = OpeningBook.load(words, OPENING_BOOK_FILE)
+        except FileNotFoundError:
+            _OPENING_BOOKS[key] = None
+        except ValueError as e:
+            print(f"Opening book ignored ({e}). Run: python opening_book.py")
+            _OPENING_BOOKS[key] = None
+    return _OPENING_BOOKS[key]
+
+
+def suggest_opening(session: WordleSession) -> Optional[str]:
+    """Premier guess conseillé (livre d'ouvertures), None si indisponible."""
+    book = get_opening_book(session.words)
+    return book.first_guess if book is not None else None
 
 
 # ---------------------------------------------------------------------------
@@ -27,6 +89,28 @@ def load_dictionary(filename: str) -> list[str]:
         return []
 
 
+def load_packed_dictionary(filename: str, packed_path: Optional[str] = None):
+    """
+    Dictionnaire compact (cf. packed_dictionary.py) construit depuis `filename`,
+    stocké dans `packed_path` (défaut : même nom, extension .dict).
+
+    Le fichier binaire est (re)généré si `filename` a changé, puis mappé en
+    mémoire : pas de relecture ligne par ligne, et une seule copie physique
+    partagée entre processus.
+
+    Retourne :
+      - un PackedDictionary (séquence de mots + tableau `letters`)
+      - [] si ni `filename` ni le fichier compact ne sont disponibles
+    """
+    if packed_path is None:
+        packed_path = os.path.splitext(filename)[0] + ".dict"
+    try:
+        return PackedDictionary.open(filename, packed_path, verbose=True)
+    except OSError:
+        print(f"File '{filename}' not found.")
+        return []
+
+
 # ---------------------------------------------------------------------------
 # Normalization helpers
 # ---------------------------------------------------------------------------
@@ -96,6 +180,25 @@ def normalize_feedback(s: str) -> Optional[str]:
 #   "ORATE -> GVVJG"
 _DIRECT = re.compile(r"^\s*([A-Za-z]{5})\s*(?:->\s*)?([VvJjGg]{5})\s*$")
 
+# Multi-plateaux : un feedback par plateau NON résolu, dans l'ordre
+#   "ORATE GVVJG GGGGJ JGGVG"
+#   "ORATE -> GVVJG, GGGGJ, JGGVG"
+_MULTI = re.compile(r"^\s*([A-Za-z]{5})\s*(?:->\s*)?((?:[VvJjGg]{5}[\s,;|/]*)+)$")
+_FEEDBACK = re.compile(r"[VvJjGg]{5}")
+
+
+# ---------------------------------------------------------------------------
+# Client LLM (cf. llm_client.py) : cache, budget de temps, backend configurable
+# ---------------------------------------------------------------------------
+_LLM_CLIENT = None
+
+
+def get_llm_client():
+    global _LLM_CLIENT
+    if _LLM_CLIENT is None:
+        _LLM_CLIENT = make_client()
+    return _LLM_CLIENT
+
 
 # ---------------------------------------------------------------------------
 # LLM extraction (fallback)
@@ -114,10 +217,9 @@ def extract_attempt_from_text(user_text: str) -> Optional[dict]:
 
     Retour :
       - {"guess": "ORATE", "feedback": "GVVJG"} si extraction OK
-      - None sinon
+      - None sinon (y compris si le LLM dépasse son budget de temps)
     """
-    response = ollama.chat(
-        model="llama3.1",
+    response = get_llm_client().chat(
         messages=[
             {
                 "role": "user",
@@ -155,7 +257,10 @@ def extract_attempt_from_text(user_text: str) -> Optional[dict]:
         ],
     )
 
-    # Ollama renvoie typiquement un dict avec "message"
+    if response is None:
+        return None
+
+    # Le client renvoie toujours un dict avec "message"
     msg = response.get("message", {}) or {}
     tool_calls = msg.get("tool_calls") or []
     if not tool_calls:
@@ -184,43 +289,173 @@ def extract_attempt_from_text(user_text: str) -> Optional[dict]:
 
 
 # ---------------------------------------------------------------------------
-# Full agent (CSP + LLM ranking)
+# Full agent (CSP + ranker local + commentaire LLM optionnel)
 # ---------------------------------------------------------------------------
+# Nombre de mots affichés dans le classement du ranker
+RANKING_SIZE = 3
+
+# Nombre max de candidats recopiés dans le prompt du commentaire LLM
 MAX_CANDIDATES_TO_LLM = 40
 
+# WORDLE_LLM_COMMENTARY = 0 pour désactiver le commentaire LLM
+USE_LLM_COMMENTARY = os.environ.get("WORDLE_LLM_COMMENTARY", "1") != "0"
+
+
+def format_ranking(ranking) -> str:
+    """Mise en forme du classement du ranker (Chosen word + Top N)."""
+    lines = [f"Chosen word: {ranking[0].word}", "", "Priority ranking:", ""]
+    for i, s in enumerate(ranking, 1):
+        tag = "" if s.is_candidate else ", not a candidate"
+        lines.append(
+            f"{i}. {s.word}  ({s.entropy:.2f} bits, ~{s.expected_remaining:.1f} words left{tag})"
+        )
+    return "\n".join(lines)
+
+
+def _commentary_prompt(ranking, possible) -> str:
+    shown = possible[:MAX_CANDIDATES_TO_LLM]
+    return f"""
+You are an expert Wordle coach.
+
+A solver has already chosen the next guess by maximizing the expected
+information over ALL remaining candidates. Do NOT propose another word.
+
+Solver ranking (word, expected information in bits):
+{[(s.word, round(s.entropy, 2)) for s in ranking]}
 
-def interroger_agent_wordle(prompt_utilisateur: str, dictionary_words, attempts: list):
+Remaining candidates ({len(possible)} total, first {len(shown)} shown):
+{shown}
+
+In 2-3 short sentences, explain why "{ranking[0].word}" is a good guess now.
+"""
+
+
+def llm_commentary_stream(ranking, possible) -> Iterator[str]:
+    """
+    Commentaire LLM sur la décision du ranker, token par token.
+    Le LLM ne choisit plus le mot : il explique / nuance le choix déjà fait.
+    L'appel ne démarre qu'à la première itération du générateur.
+    """
+    messages = [{"role": "user", "content": _commentary_prompt(ranking, possible)}]
+    try:
+        yield from get_llm_client().stream(messages)
+    except Exception as e:
+        # Une erreur / absence d'Ollama ne doit pas casser l'affichage du tour
+        yield f"(LLM commentary unavailable: {e})"
+
+
+@dataclass
+class AgentTurn:
+    """
+    Résultat d'un tour :
+      - text : résultat CSP (tentative ajoutée, candidats), disponible
+               immédiatement, avant tout calcul du ranker
+      - commentary : commentaire LLM, à consommer token par token
+                     (itérateur vide si désactivé ou si le tour a échoué)
+      - trace : temps et nombre de candidats par étape (cf. tracing.py) ;
+                l'étape "llm_commentary" s'ajoute quand le commentaire a
+                été entièrement lu
+      - decision : décision du ranker (un bloc de texte), calculée à la
+                   première lecture ; à lire avant le commentaire et avant
+                   le tour suivant (il classe l'état courant de la session)
+    """
+    text: str
+    commentary: Iterator[str] = field(default_factory=lambda: iter(()))
+    trace: TurnTrace = field(default_factory=TurnTrace)
+    decision: Iterator[str] = field(default_factory=lambda: iter(()))
+
+
+class _LazyRanking:
+    """
+    Classement du ranker calculé à la première demande (étape "ranking" de
+    la trace), partagé par la décision et le commentaire LLM d'un tour.
+    """
+
+    def __init__(self, trace: TurnTrace, compute, candidates_before: int, ranking=None, **info):
+        self.trace = trace
+        self.compute = compute
+        self.candidates_before = candidates_before
+        self.ranking = ranking
+        self.info = info
+
+    def get(self):
+        if self.ranking is None:
+            with self.trace.stage("ranking", candidates_before=self.candidates_before) as st:
+                self.ranking = self.compute()
+                st.info.update(self.info)
+        return self.ranking
+
+    def decision(self, header: str) -> Iterator[str]:
+        yield f"{header}:\n{format_ranking(self.get())}"
+
+    def commentary(self, possible) -> Iterator[str]:
+        yield from llm_commentary_stream(self.get(), possible)
+
+
+def _finish_after(trace: TurnTrace, chunks: Iterator[str]) -> Iterator[str]:
+    try:
+        yield from chunks
+    finally:
+        trace.finish()
+
+
+def _end_turn(trace: TurnTrace, text: str, commentary=None, decision=None) -> AgentTurn:
+    # Sans commentaire, la trace se termine avec la décision (ou tout de suite) ;
+    # sinon elle se termine avec le stream
+    if commentary is None:
+        if decision is None:
+            trace.finish()
+            return AgentTurn(text, trace=trace)
+        return AgentTurn(text, trace=trace, decision=_finish_after(trace, decision))
+    return AgentTurn(text, trace.traced("llm_commentary", commentary), trace,
+                     decision=iter(()) if decision is None else decision)
+
+
+def interroger_agent_wordle_stream(
+    prompt_utilisateur: str, session: WordleSession, use_llm: Optional[bool] = None
+) -> AgentTurn:
     """
-    Pipeline complet de l'agent Wordle.
+    Pipeline complet de l'agent Wordle, en mode "streaming" : le résultat CSP
+    est renvoyé dès le filtrage (AgentTurn.text) ; la décision du ranker
+    (AgentTurn.decision) puis le commentaire LLM (AgentTurn.commentary) sont
+    calculés à la lecture.
 
     Entrées :
       - prompt_utilisateur : texte brut utilisateur (ex: "ORATE -> GVVJG" ou phrase libre)
-      - dictionary_words : liste de mots 5 lettres (domaine CSP)
-      - attempts : historique MUTABLE des tentatives [(guess, feedback), ...]
-                  (persisté entre tours côté Streamlit/session_state)
+      - session : WordleSession MUTABLE (historique + candidats survivants),
+                  persistée entre tours côté Streamlit/session_state ou CLI
+      - use_llm : commentaire LLM sur la décision (défaut USE_LLM_COMMENTARY)
 
     Étapes :
       1) parse direct via regex (rapide, déterministe)
       2) fallback extraction via LLM si le texte est libre
-      3) append dans l'historique
-      4) CSP: filtrage des candidats compatibles
-      5) si trop de candidats, on sous-échantillonne ceux envoyés au LLM (coût/latence)
-      6) LLM: propose un ranking / next guess parmi les candidats
+      3) ajout dans l'historique de la session
+      4) CSP: filtrage incrémental (seule la nouvelle contrainte est appliquée
+         aux candidats survivants)
+      5) ranker local (paresseux) : gain d'information attendu de chaque
+         guess autorisé, calculé sur TOUS les candidats (cf. ranker.py)
+      6) LLM (optionnel) : commentaire sur la décision du ranker (générateur)
     """
 
+    trace = TurnTrace(prompt_utilisateur or "")
+
     # 1) Parsing direct : si l'utilisateur donne un format structuré, pas besoin de LLM
-    m = _DIRECT.match(prompt_utilisateur or "")
+    with trace.stage("parse") as st:
+        m = _DIRECT.match(prompt_utilisateur or "")
+        st.info["matched"] = bool(m)
     if m:
         guess = m.group(1).upper()
         feedback = m.group(2).upper()
     else:
         # 2) Fallback : extraction sémantique via LLM (cas "texte libre")
-        extracted = extract_attempt_from_text(prompt_utilisateur)
+        with trace.stage("llm_extraction", kind="llm"):
+            extracted = extract_attempt_from_text(prompt_utilisateur)
         if not extracted:
-            return (
+            return _end_turn(
+                trace,
                 "Could not extract a valid attempt.\n"
                 "Expected format: 'ORATE GVVJG' or 'ORATE -> GVVJG' "
-                "(V=green, J=yellow, G=gray)."
+                "(V=green, J=yellow, G=gray).",
             )
         guess = extracted["guess"]
         feedback = extracted["feedback"]
@@ -229,76 +464,176 @@ def interroger_agent_wordle(prompt_utilisateur: str, dictionary_words, attempts:
     guess = normalize_guess(guess)
     feedback = normalize_feedback(feedback)
     if not guess or not feedback:
-        return "Invalid guess/feedback after normalization. Please use 5 letters and V/J/G."
-
-    # 3) Mise à jour de l'historique des contraintes
-    attempts.append((guess, feedback))
-
-    # 4) CSP solving = filtrage du domaine par toutes les contraintes collectées
-    possible = solve_wordle_csp(dictionary_words, attempts)
+        return _end_turn(trace, "Invalid guess/feedback after normalization. Please use 5 letters and V/J/G.")
+
+    # 3) + 4) Mise à jour de l'historique et filtrage incrémental :
+    #         la nouvelle contrainte ne s'applique qu'aux candidats survivants.
+    #         1er tour avec l'ouverture du livre : candidats et second guess
+    #         sont lus directement (aucun filtrage, aucun ranking).
+    ranking = None
+    rejected = None
+    with trace.stage("filter", candidates_before=len(session)) as st:
+        book = get_opening_book(session.words) if not session.attempts else None
+        try:
+            if book is not None and guess == book.first_guess:
+                code = encode_feedback(feedback)
+                session.add_attempt(guess, feedback, known_candidates=book.candidates(code))
+                # Le second guess du livre ignore le mode difficile : on reclasse
+                if not session.hard_mode:
+                    ranking = book.second_ranking(code)[:RANKING_SIZE]
+                st.info["opening_book"] = True
+            else:
+                session.add_attempt(guess, feedback)
+        except ValueError as e:
+            # Mode difficile : guess qui ne réutilise pas les indices révélés
+            rejected = str(e)
+        st.candidates_after = len(session)
+    if rejected:
+        return _end_turn(trace, f"Attempt rejected: {rejected}")
+    with trace.stage("candidates", candidates_before=len(session)) as st:
+        possible = session.candidate_words()
+        st.candidates_after = len(possible)
 
     # Si plus aucun mot ne satisfait les contraintes, il y a incohérence (erreur feedback,
     # mot hors dictionnaire, ou extraction incorrecte)
     if not possible:
-        return (
+        return _end_turn(
+            trace,
             "No solution matches the current constraints.\n"
             f"Last attempt: {guess} -> {feedback}\n"
-            f"History: {attempts}"
+            f"History: {session.attempts}",
         )
 
-    # 5) On limite le nombre de candidats envoyés au LLM (latence + coût)
-    candidates_for_llm = possible[:]
-
-    if len(candidates_for_llm) > MAX_CANDIDATES_TO_LLM:
-        # Heuristique simple : favoriser les mots avec plus de lettres distinctes
-        # (souvent bon pour "explorer" en Wordle)
-        candidates_for_llm = sorted(
-            candidates_for_llm, key=lambda w: len(set(w)), reverse=True
-        )[:MAX_CANDIDATES_TO_LLM]
+    # 5) Ranker local : chaque guess du dictionnaire est évalué sur l'ensemble
+    #    des candidats (pas de troncature), pool de processus si nécessaire.
+    #    Calculé seulement à la lecture de la décision : le résultat CSP
+    #    s'affiche sans attendre le ranking.
+    lazy = _LazyRanking(
+        trace, lambda: rank_guesses(session, top=RANKING_SIZE), len(possible),
+        ranking=ranking or None, guesses_scored=len(session.guess_pool),
+    )
 
-    # 6) LLM ranking : on lui donne la liste, et on lui interdit d'inventer
-    prompt_final = f"""
-You are an expert Wordle solver.
+    # Affichage "humain" : on montre un extrait des candidats CSP
+    shown = ", ".join(possible[:30]) + ("..." if len(possible) > 30 else "")
 
-You are given a list of valid 5-letter ENGLISH words.
-You MUST choose words ONLY from this list.
-It is strictly forbidden to invent or modify any word.
+    text = (
+        f"ADDED ATTEMPT: {guess} -> {feedback}\n"
+        f"POSSIBLE WORDS ({len(possible)}):\n{shown}"
+    )
+    decision = lazy.decision("SOLVER DECISION")
 
-List of possible words:
-{candidates_for_llm}
+    # 6) Commentaire LLM optionnel : générateur paresseux, l'appel au LLM ne
+    #    commence que lorsque l'interface lit le premier token
+    if use_llm is None:
+        use_llm = USE_LLM_COMMENTARY
+    if not use_llm:
+        return _end_turn(trace, text, decision=decision)
+    return _end_turn(trace, text, lazy.commentary(possible), decision)
 
-Return STRICTLY:
 
-Chosen word: <WORD>
+def interroger_agent_wordle(prompt_utilisateur: str, session: WordleSession, use_llm: Optional[bool] = None) -> str:
+    """
+    Version "bloquante" : attend la fin du commentaire LLM et renvoie une
+    seule chaîne prête à afficher (cf. interroger_agent_wordle_stream).
+    """
+    return _join_turn(interroger_agent_wordle_stream(prompt_utilisateur, session, use_llm=use_llm))
 
-Priority ranking:
 
-1. <WORD>
-2. <WORD>
-3. <WORD>
-"""
+def _join_turn(turn: AgentTurn) -> str:
+    text = "\n\n".join([turn.text, *turn.decision])
+    commentary = "".join(turn.commentary)
+    if commentary:
+        return f"{text}\n\nLLM COMMENTARY:\n{commentary}"
+    return text
 
-    final_response = ollama.chat(
-        model="llama3.1",
-        messages=[{"role": "user", "content": prompt_final}],
-    )
 
-    content = final_response["message"]["content"]
+# ---------------------------------------------------------------------------
+# Agent multi-plateaux (Quordle / Octordle)
+# ---------------------------------------------------------------------------
+def format_boards(session: MultiBoardSession, limit: int = 15) -> str:
+    """Candidats restants de chaque plateau (ou mot trouvé)."""
+    lines = []
+    for b, idx in enumerate(session.boards):
+        if session.solved[b]:
+            solved_by = next(g for g, fbs in session.attempts if fbs[b] == SOLVED_FEEDBACK)
+            lines.append(f"Board {b + 1}: SOLVED ({solved_by})")
+            continue
+        words = session.candidate_words(b, limit=limit)
+        shown = ", ".join(words) + ("..." if len(idx) > limit else "")
+        lines.append(f"Board {b + 1} ({len(idx)}): {shown}")
+    return "\n".join(lines)
+
+
+def interroger_agent_multi_stream(
+    prompt_utilisateur: str, session: MultiBoardSession, use_llm: Optional[bool] = None
+) -> AgentTurn:
+    """
+    Un tour multi-plateaux : "GUESS FB1 FB2 ..." avec un feedback par plateau
+    non résolu (pas d'extraction LLM dans ce mode).
 
-    # Affichage "humain" : on montre un extrait des candidats CSP
-    shown = ", ".join(possible[:30]) + ("..." if len(possible) > 30 else "")
+    Le filtrage de tous les plateaux est groupé (MultiBoardSession.add_attempt)
+    et le guess suivant maximise l'information cumulée sur les plateaux non
+    résolus (rank_guesses_multi).
+    """
+    trace = TurnTrace(prompt_utilisateur or "")
+    with trace.stage("parse") as st:
+        m = _MULTI.match(prompt_utilisateur or "")
+        st.info["matched"] = bool(m)
+    if not m:
+        return _end_turn(
+            trace,
+            "Could not parse the attempt.\n"
+            f"Expected format: 'ORATE GVVJG GGGGJ ...' with one feedback per unsolved board "
+            f"({len(session.unsolved)} expected).",
+        )
+    guess = normalize_guess(m.group(1))
+    feedbacks = [fb.upper() for fb in _FEEDBACK.findall(m.group(2))]
 
-    note = ""
-    if len(possible) > MAX_CANDIDATES_TO_LLM:
-        note = (
-            f"\n(Note: CSP found {len(possible)} words; "
-            f"only {MAX_CANDIDATES_TO_LLM} were sent to the LLM.)\n"
+    before = sum(len(session.boards[b]) for b in session.unsolved)
+    with trace.stage("filter", candidates_before=before) as st:
+        try:
+            session.add_attempt(guess, feedbacks)
+        except ValueError as e:
+            error = e
+        else:
+            error = None
+        st.candidates_after = sum(len(session.boards[b]) for b in session.unsolved)
+        st.info["boards"] = len(feedbacks)
+    if error is not None:
+        return _end_turn(trace, f"Invalid attempt: {error}")
+
+    added = " | ".join(f"B{b + 1} {fb}" for b, fb in enumerate(session.attempts[-1][1]) if fb)
+    if session.finished:
+        return _end_turn(trace, f"ADDED ATTEMPT: {guess} -> {added}\n\nAll boards solved!")
+
+    # Comme en mode simple : la tentative reste dans l'historique ('undo' pour l'annuler)
+    empty = [b + 1 for b in session.unsolved if len(session.boards[b]) == 0]
+    if empty:
+        return _end_turn(
+            trace,
+            f"No solution matches the constraints on board(s) {empty}.\n"
+            f"Last attempt: {guess} -> {added}\n"
+            f"History: {session.attempts}",
         )
 
-    return (
-        f"ADDED ATTEMPT: {guess} -> {feedback}\n"
-        f"POSSIBLE WORDS ({len(possible)}):\n{shown}\n"
-        f"{note}\n"
-        f"LLM DECISION:\n{content}"
+    lazy = _LazyRanking(
+        trace, lambda: rank_guesses_multi(session, top=RANKING_SIZE), st.candidates_after,
+        boards=len(session.unsolved),
     )
+    text = (
+        f"ADDED ATTEMPT: {guess} -> {added}\n"
+        f"BOARDS:\n{format_boards(session)}"
+    )
+    decision = lazy.decision(f"SOLVER DECISION (combined over {len(session.unsolved)} boards)")
+
+    if use_llm is None:
+        use_llm = USE_LLM_COMMENTARY
+    if not use_llm:
+        return _end_turn(trace, text, decision=decision)
+    possible = [w for b in session.unsolved for w in session.candidate_words(b, limit=MAX_CANDIDATES_TO_LLM)]
+    return _end_turn(trace, text, lazy.commentary(possible), decision)
+
 
+def interroger_agent_multi(prompt_utilisateur: str, session: MultiBoardSession, use_llm: Optional[bool] = None) -> str:
+    """Version "bloquante" de interroger_agent_multi_stream."""
+    return _join_turn(interroger_agent_multi_stream(prompt_utilisateur, session, use_llm=use_llm))
@@ -0,0 +1,323 @@
+import asyncio
+import hashlib
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Iterator, Optional
+
+
+# ---------------------------------------------------------------------------
+# Configuration (variables d'environnement)
+# ---------------------------------------------------------------------------
+# WORDLE_LLM_BACKEND : ollama (défaut) | local (stand-in déterministe, sans réseau)
+# WORDLE_LLM_MODEL   : modèle Ollama
+# WORDLE_LLM_TIMEOUT : budget max (secondes) d'un appel avant abandon
+# WORDLE_LLM_HTTP_TIMEOUT : délai max (secondes) d'une requête HTTP Ollama ;
+#                      un appel abandonné libère son thread au plus tard là
+# WORDLE_LLM_CACHE   : fichier sqlite du cache disque ("" pour le désactiver)
+LLM_BACKEND = os.environ.get("WORDLE_LLM_BACKEND", "ollama")
+LLM_MODEL = os.environ.get("WORDLE_LLM_MODEL", "llama3.1")
+LLM_TIMEOUT_S = float(os.environ.get("WORDLE_LLM_TIMEOUT", "20"))
+LLM_HTTP_TIMEOUT_S = float(os.environ.get("WORDLE_LLM_HTTP_TIMEOUT", "60"))
+LLM_CACHE_FILE = os.environ.get("WORDLE_LLM_CACHE", "llm_cache.sqlite")
+
+# Threads d'appel au backend par client
+LLM_WORKERS = 4
+
+# Taille du cache mémoire (nombre de réponses)
+LRU_SIZE = 256
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+# Un backend expose :
+#   - chat(model, messages, tools) -> dict "simple" (sérialisable JSON) :
+#       {"message": {"content": str, "tool_calls": [...]}}
+#   - stream(model, messages) -> itérateur de morceaux de texte (tokens)
+def _plain_message(response) -> dict:
+    # Selon la version, ollama renvoie un dict ou un objet pydantic (ChatResponse)
+    if hasattr(response, "model_dump"):
+        response = response.model_dump()
+    msg = dict(response.get("message", {}) or {})
+    tool_calls = []
+    for call in msg.get("tool_calls") or []:
+        fn = call.get("function", {}) or {}
+        tool_calls.append({"function": {"name": fn.get("name"), "arguments": fn.get("arguments")}})
+    return {"message": {"content": msg.get("content") or "", "tool_calls": tool_calls}}
+
+
+class OllamaBackend:
+    """
+    Appel réel au serveur Ollama local. Chaque requête HTTP est bornée par
+    timeout_s (délai httpx) : un appel abandonné par LLMClient ne garde pas
+    son thread indéfiniment.
+    """
+
+    name = "ollama"
+
+    def __init__(self, timeout_s: float = LLM_HTTP_TIMEOUT_S):
+        self.timeout_s = timeout_s
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import ollama
+
+            self._client = ollama.Client(timeout=self.timeout_s)
+        return self._client
+
+    def chat(self, model: str, messages: list, tools=None) -> dict:
+        kwargs = {"tools": tools} if tools else {}
+        return _plain_message(self._get_client().chat(model=model, messages=messages, **kwargs))
+
+    def stream(self, model: str, messages: list) -> Iterator[str]:
+        for chunk in self._get_client().chat(model=model, messages=messages, stream=True):
+            token = _plain_message(chunk)["message"]["content"]
+            if token:
+                yield token
+
+
+class LocalBackend:
+    """
+    Stand-in déterministe pour les tests et benchmarks (aucun réseau).
+
+    - avec tools : extrait par regex un feedback (5 lettres V/J/G, espacées ou
+      non) et le premier autre mot de 5 lettres, et renvoie un tool call comme
+      le ferait le modèle
+    - sans tools : réponse fixe dérivée du prompt (même prompt -> même réponse)
+    """
+
+    name = "local"
+
+    _FEEDBACK = re.compile(r"(?<![A-Za-z'])([VJG](?:\s*[VJG]){4})(?![A-Za-z'])", re.IGNORECASE)
+    _WORD = re.compile(r"(?<![A-Za-z'])[A-Za-z]{5}(?![A-Za-z'])")
+
+    def chat(self, model: str, messages: list, tools=None) -> dict:
+        text = messages[-1]["content"] if messages else ""
+        if tools:
+            user_text = text.split("USER TEXT:", 1)[-1]
+            args = {"guess": "", "feedback": ""}
+            fb = self._FEEDBACK.search(user_text)
+            if fb:
+                words = [w for w in self._WORD.findall(user_text) if w.lower() != fb.group(1).lower()]
+                if words:
+                    args = {"guess": words[0].upper(), "feedback": re.sub(r"\s", "", fb.group(1)).upper()}
+            name = tools[0]["function"]["name"]
+            return {"message": {"content": "", "tool_calls": [{"function": {"name": name, "arguments": args}}]}}
+
+        return {"message": {"content": self._answer(text), "tool_calls": []}}
+
+    def stream(self, model: str, messages: list) -> Iterator[str]:
+        text = messages[-1]["content"] if messages else ""
+        for i, word in enumerate(self._answer(text).split(" ")):
+            yield word if i == 0 else " " + word
+
+    @staticmethod
+    def _answer(text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:8]
+        return f"[local model {digest}] No commentary available offline."
+
+
+BACKENDS = {"ollama": OllamaBackend, "local": LocalBackend}
+
+
+# ---------------------------------------------------------------------------
+# Cache : LRU mémoire + sqlite sur disque
+# ---------------------------------------------------------------------------
+def normalize_prompt(text: str) -> str:
+    """Espaces multiples / sauts de ligne -> un espace, bords supprimés."""
+    return " ".join(text.split())
+
+
+def cache_key(model: str, messages: list, tools=None) -> str:
+    payload = {
+        "model": model,
+        "messages": [{"role": m.get("role"), "content": normalize_prompt(m.get("content", ""))}
+                     for m in messages],
+        "tools": tools or None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, size: int = LRU_SIZE, path: Optional[str] = None):
+        self.size = size
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT)")
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                return self._mem[key]
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value = json.loads(row[0])
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        self._remember(key, value)
+        if self._db is not None:
+            with self._lock:
+                self._db.execute("INSERT OR REPLACE INTO llm_cache VALUES (?, ?)",
+                                 (key, json.dumps(value)))
+                self._db.commit()
+
+    def _remember(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._mem[key] = value
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.size:
+                self._mem.popitem(last=False)
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+class LLMClient:
+    """
+    Point d'accès unique au LLM :
+      - cache (LRU + disque) indexé par modèle + prompt normalisé
+      - budget de temps par appel : au-delà, chat() renvoie None et le tour
+        continue sans LLM (la réponse tardive est tout de même mise en cache)
+      - variante asynchrone achat()
+      - stream() : texte token par token, sous le même budget de temps
+
+    Les appels tournent sur un pool de LLM_WORKERS threads. Un appel abandonné
+    (timeout) continue jusqu'à sa réponse ou au délai HTTP du backend ; si
+    tous les threads sont ainsi occupés, un nouveau pool est créé pour les
+    appels suivants (l'ancien s'arrête de lui-même une fois ses appels finis).
+    """
+
+    def __init__(self, backend=None, model: str = LLM_MODEL,
+                 timeout_s: float = LLM_TIMEOUT_S, cache: Optional[ResponseCache] = None):
+        self.backend = backend if backend is not None else OllamaBackend()
+        self.model = model
+        self.timeout_s = timeout_s
+        self.cache = cache if cache is not None else ResponseCache()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=LLM_WORKERS, thread_name_prefix="llm")
+        self._generation = 0    # numéro du pool courant
+        self._running = 0       # appels en cours sur le pool courant
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self._running >= LLM_WORKERS:
+                # Pool saturé (appels abandonnés encore en cours) : on le remplace
+                self._executor.shutdown(wait=False)
+                self._executor = ThreadPoolExecutor(max_workers=LLM_WORKERS, thread_name_prefix="llm")
+                self._generation += 1
+                self._running = 0
+            self._running += 1
+            generation = self._generation
+            executor = self._executor
+
+        def run():
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    if generation == self._generation:
+                        self._running -= 1
+
+        return executor.submit(run)
+
+    def _call(self, key: str, messages: list, tools) -> dict:
+        response = self.backend.chat(self.model, messages, tools)
+        self.cache.put(key, response)
+        return response
+
+    def chat(self, messages: list, tools=None, timeout_s: Optional[float] = None) -> Optional[dict]:
+        key = cache_key(self.model, messages, tools)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        future = self._submit(self._call, key, messages, tools)
+        try:
+            return future.result(timeout=self.timeout_s if timeout_s is None else timeout_s)
+        except FutureTimeout:
+            return None
+
+    def stream(self, messages: list, timeout_s: Optional[float] = None) -> Iterator[str]:
+        """
+        Génère la réponse token par token.
+
+        Le backend tourne dans un thread qui alimente une file ; on arrête de
+        lire quand le budget est épuisé (le thread termine quand même et met la
+        réponse complète en cache). Une réponse en cache est renvoyée d'un bloc.
+        """
+        key = cache_key(self.model, messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached["message"]["content"]
+            return
+
+        tokens = queue.Queue()
+        done = object()
+
+        def produce():
+            parts = []
+            try:
+                for token in self.backend.stream(self.model, messages):
+                    parts.append(token)
+                    tokens.put(token)
+                self.cache.put(key, {"message": {"content": "".join(parts), "tool_calls": []}})
+            except Exception as e:
+                tokens.put(e)
+            finally:
+                tokens.put(done)
+
+        self._submit(produce)
+        deadline = time.monotonic() + (self.timeout_s if timeout_s is None else timeout_s)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                item = tokens.get(timeout=remaining)
+            except queue.Empty:
+                return
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    async def achat(self, messages: list, tools=None, timeout_s: Optional[float] = None) -> Optional[dict]:
+        key = cache_key(self.model, messages, tools)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        future = asyncio.wrap_future(self._submit(self._call, key, messages, tools))
+        try:
+            # shield : en cas de timeout, l'appel continue et remplira le cache
+            return await asyncio.wait_for(asyncio.shield(future),
+                                          self.timeout_s if timeout_s is None else timeout_s)
+        except asyncio.TimeoutError:
+            return None
+
+
+def make_client(backend: Optional[str] = None) -> LLMClient:
+    """Client configuré par les variables d'environnement WORDLE_LLM_*."""
+    name = (backend or LLM_BACKEND).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Backend LLM inconnu: {name} ({'/'.join(BACKENDS)})")
+    return LLMClient(backend=BACKENDS[name](), cache=ResponseCache(path=LLM_CACHE_FILE or None))
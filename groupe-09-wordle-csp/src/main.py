@@ -1,3 +1,4 @@
+import argparse
 import sys
 
 # ---------------------------------------------------------------------------
@@ -14,7 +15,17 @@ try:
 except Exception:
     KEYBOARD_AVAILABLE = False
 
-from llm_agent import interroger_agent_wordle, load_dictionary
+from llm_agent import (
+    get_pattern_table,
+    interroger_agent_multi_stream,
+    interroger_agent_wordle_stream,
+    load_packed_dictionary,
+    new_multi_session,
+    new_session,
+    suggest_opening,
+)
+from optimal import solve_optimal
+from ranker import rank_guesses
 
 
 def main():
@@ -29,22 +40,63 @@ def main():
               * parse l'entrée (regex ou LLM fallback)
               * ajoute la contrainte à l'historique
               * filtre les candidats via CSP
-              * demande au LLM de proposer un ranking / next guess
+              * classe les prochains guess (ranker local)
+              * affiche le commentaire LLM au fil des tokens
     """
+    parser = argparse.ArgumentParser(description="Wordle solver CLI (CSP + Ollama).")
+    parser.add_argument("--boards", type=int, default=1,
+                        help="number of boards played at once (4 = Quordle, 8 = Octordle)")
+    parser.add_argument("--hard", action="store_true",
+                        help="hard mode: suggested guesses reuse every revealed hint")
+    parser.add_argument("--guesses", type=str, default=None,
+                        help="allowed-guess list (one word per line), larger than the answer list")
+    args = parser.parse_args()
+    multi = args.boards > 1
+    if multi and (args.hard or args.guesses):
+        print("--hard and --guesses only apply to single-board games.")
+        sys.exit(1)
+
     print("--- Wordle Solver (Ollama + CSP) ---")
-    print("Input format: GUESS FEEDBACK  (V=green, J=yellow, G=gray)")
-    print("Examples: ORATE GVVJG   |   ORATE -> GVVJG")
+    if multi:
+        print(f"Multi-board mode: {args.boards} boards.")
+        print("Input format: GUESS FB1 FB2 ...  (one feedback per unsolved board, V=green, J=yellow, G=gray)")
+        print("Example: ORATE GVVJG GGGGJ JGGVG GGGGG")
+    else:
+        print("Input format: GUESS FEEDBACK  (V=green, J=yellow, G=gray)")
+        print("Examples: ORATE GVVJG   |   ORATE -> GVVJG")
+    print("Commands: 'undo' (cancel last attempt), 'reset' (new game), "
+          "'optimal' / 'optimal worst' (branch-and-bound best guess, expected / worst-case).")
     print("Quit: type 'quit' or press Ctrl+C.\n")
 
-    # 1) Chargement du dictionnaire (domaine CSP)
-    dictionary = load_dictionary("wordle.txt")
+    # 1) Chargement du dictionnaire (domaine CSP) : fichier compact mappé en
+    #    mémoire, régénéré automatiquement si wordle.txt a changé
+    dictionary = load_packed_dictionary("wordle.txt")
     if not dictionary:
         # Si le dictionnaire est vide, le solver ne peut pas fonctionner.
         print("Dictionary is empty. Please check 'wordle.txt'.")
         sys.exit(1)
 
-    # 2) Historique des tentatives (contraintes) conservé pendant la session
-    attempts = []
+    # Table de motifs (mappée en mémoire une seule fois pour toute la session)
+    table = get_pattern_table(dictionary)
+
+    # 2) Session de jeu : historique des tentatives + candidats survivants
+    #    (filtrage incrémental, undo/reset sans recalcul)
+    #    Liste de guesses séparée : les mots hors réponses sont ajoutés à la
+    #    session (ils peuvent être joués et classés, jamais candidats)
+    if multi:
+        session = new_multi_session(dictionary, args.boards, table=table)
+    else:
+        guess_words = load_packed_dictionary(args.guesses) if args.guesses else None
+        if args.guesses and not guess_words:
+            print(f"Guess list is empty. Please check '{args.guesses}'.")
+            sys.exit(1)
+        session = new_session(dictionary, table=table, guess_words=guess_words, hard_mode=args.hard)
+        if args.hard:
+            print("Hard mode: every guess must reuse the revealed hints.")
+
+    opener = suggest_opening(session)
+    if opener:
+        print(f"Suggested first guess (opening book): {opener}\n")
 
     # 3) Boucle interactive
     while True:
@@ -63,13 +115,81 @@ def main():
             # Entrée vide : on redemande
             continue
 
+        command = user_text.lower()
+        if command in ("quit", "exit"):
+            print("Shutting down... Goodbye!")
+            sys.exit(0)
+        if command == "undo":
+            if session.undo():
+                remaining = [len(c) for c in session.boards] if multi else len(session)
+                print(f"Last attempt removed. {remaining} candidates remain.\n")
+            else:
+                print("Nothing to undo.\n")
+            continue
+        if command == "reset":
+            session.reset()
+            print("New game." + (f" Suggested first guess: {opener}" if opener else "") + "\n")
+            continue
+
+        if command in ("optimal", "optimal worst"):
+            if multi:
+                print("The exact solver only supports single-board games.\n")
+                continue
+            objective = "worst" if command.endswith("worst") else "expected"
+            print(f"\nSearching the optimal guess ({objective}) over {len(session)} candidates...")
+            try:
+                res = solve_optimal(session, objective=objective)
+                if res is None:
+                    print("No candidates left.\n")
+                    continue
+                if res.cost is None:
+                    # Budget épuisé avant la borne gloutonne : guess du ranker
+                    top = rank_guesses(session, top=1)[0]
+                    print(f"Time budget reached before a bound was found. Entropy ranker's guess: "
+                          f"{top.word} ({top.entropy:.2f} bits, {top.expected_remaining:.1f} candidates left "
+                          f"on average)\n")
+                    continue
+                if res.expected_guesses is not None:
+                    value = f"{res.expected_guesses:.3f} expected guesses"
+                else:
+                    value = f"{res.cost} guesses worst case"
+                if res.timed_out:
+                    status = "time budget reached, best so far"
+                elif res.width is not None:
+                    status = f"best within width {res.width}"
+                else:
+                    status = "exact"
+                label = "Optimal guess" if res.exact else "Best guess"
+                print(f"{label}: {res.word} ({value}; {status}; "
+                      f"{res.nodes} nodes in {res.time_s:.1f}s)\n")
+            except MemoryError:
+                print(f"Too many candidates ({len(session)}) for the exact solver: play a guess first.\n")
+            except Exception as e:
+                # Comme pour l'agent : une erreur ponctuelle ne casse pas la session CLI
+                print(f"Error: {e}\n")
+            continue
+
         print("\nThinking...\n")
 
         try:
-            # L'agent modifie `attempts` (il append la tentative validée).
-            # Il renvoie une string prête à afficher.
-            result = interroger_agent_wordle(user_text, dictionary, attempts)
-            print(result)
+            # L'agent modifie `session` (il ajoute la tentative validée).
+            # Le résultat CSP est affiché tout de suite, le commentaire LLM
+            # ensuite, token par token.
+            if multi:
+                turn = interroger_agent_multi_stream(user_text, session)
+            else:
+                turn = interroger_agent_wordle_stream(user_text, session)
+            print(turn.text)
+            for decision in turn.decision:
+                print(f"\n{decision}")
+            header_printed = False
+            for token in turn.commentary:
+                if not header_printed:
+                    print("\nLLM COMMENTARY:")
+                    header_printed = True
+                print(token, end="", flush=True)
+            if header_printed:
+                print()
         except Exception as e:
             # On catch pour éviter de casser la session CLI sur une erreur ponctuelle
             print(f"Error: {e}")
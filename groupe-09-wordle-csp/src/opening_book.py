@@ -0,0 +1,190 @@
+import argparse
+import struct
+import sys
+import time
+
+import numpy as np
+
+from csp_solver import N_PATTERNS, WordleSession, decode_feedback, feedback_codes
+from pattern_table import dictionary_checksum
+from ranker import SCORER_ID, GuessScore, rank_guesses
+
+
+# ---------------------------------------------------------------------------
+# Livre d'ouvertures (tours 1 et 2)
+# ---------------------------------------------------------------------------
+# Le 1er tour filtre toujours tout le dictionnaire, et le 2e tour ne dépend
+# que du motif obtenu par l'ouverture. On précalcule donc :
+#   - les BOOK_TOP meilleurs premiers guess
+#   - pour chacun des 243 motifs de l'ouverture : les candidats survivants et
+#     les BOOK_TOP meilleurs seconds guess
+#
+# Fichier binaire (petit-boutiste) :
+#   en-tête  : magic, version, nb mots, BOOK_TOP, sha256 du dictionnaire,
+#              identifiant du score (SCORER_ID, 16 octets)
+#   opener   : BOOK_TOP x (index int32, entropie float32, restants float32)
+#   seconds  : 243 x BOOK_TOP x (index int32, entropie float32, restants float32)
+#   offsets  : 244 x uint32 (candidats du motif p = cands[offsets[p]:offsets[p+1]])
+#   cands    : indices uint16 (uint32 si le dictionnaire dépasse 65535 mots)
+OPENING_BOOK_FILE = "wordle.book"
+
+_MAGIC = b"WBOK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIII32s16s")
+BOOK_TOP = 3
+
+_ENTRY = np.dtype([("index", "<i4"), ("entropy", "<f4"), ("expected", "<f4")])
+
+
+class OpeningBook:
+    def __init__(self, words, opener, seconds, offsets, cands):
+        self.words = words
+        self.opener = opener        # BOOK_TOP entrées _ENTRY
+        self.seconds = seconds      # 243 x BOOK_TOP entrées _ENTRY (index -1 = vide)
+        self.offsets = offsets      # 244 uint32
+        self.cands = cands
+
+    @property
+    def first_guess(self) -> str:
+        return self.words[int(self.opener[0]["index"])]
+
+    def _scores(self, entries, candidates=None) -> list:
+        out = []
+        for e in entries:
+            idx = int(e["index"])
+            if idx < 0:
+                continue
+            is_cand = True if candidates is None else bool(np.isin(idx, candidates))
+            out.append(GuessScore(self.words[idx], float(e["entropy"]), float(e["expected"]), is_cand))
+        return out
+
+    def opening_ranking(self) -> list:
+        """Classement des premiers guess (list[GuessScore])."""
+        return self._scores(self.opener)
+
+    def candidates(self, code: int) -> np.ndarray:
+        """Indices des mots compatibles avec le motif `code` de l'ouverture."""
+        return self.cands[self.offsets[code]:self.offsets[code + 1]].astype(np.int32)
+
+    def second_ranking(self, code: int) -> list:
+        """Classement des seconds guess après le motif `code` (list[GuessScore])."""
+        return self._scores(self.seconds[code], candidates=self.candidates(code))
+
+    # -----------------------------------------------------------------------
+    # Construction / persistance
+    # -----------------------------------------------------------------------
+    @classmethod
+    def build(cls, words, workers=None, verbose: bool = False) -> "OpeningBook":
+        words = list(words)
+        session = WordleSession(words)
+        index = {w: i for i, w in enumerate(session.words)}
+
+        t0 = time.perf_counter()
+        opener_scores = rank_guesses(session, top=BOOK_TOP, workers=workers)
+        opener = _entries(index, opener_scores)
+        first = session.words[int(opener[0]["index"])]
+        if verbose:
+            print(f"Opener: {first} ({time.perf_counter() - t0:.1f}s)", file=sys.stderr)
+
+        codes = feedback_codes(first, session.letters)
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=N_PATTERNS)
+        offsets = np.zeros(N_PATTERNS + 1, dtype=np.uint32)
+        offsets[1:] = np.cumsum(counts)
+        cand_dtype = np.uint16 if len(words) <= np.iinfo(np.uint16).max else np.uint32
+        cands = order.astype(cand_dtype)
+
+        seconds = np.zeros((N_PATTERNS, BOOK_TOP), dtype=_ENTRY)
+        seconds["index"] = -1
+        for code in np.flatnonzero(counts):
+            session.reset()
+            session.add_attempt(first, decode_feedback(code),
+                                known_candidates=cands[offsets[code]:offsets[code + 1]])
+            entries = _entries(index, rank_guesses(session, top=BOOK_TOP, workers=workers))
+            seconds[code, :len(entries)] = entries
+            if verbose:
+                print(f"  {decode_feedback(code)}: {counts[code]} words -> "
+                      f"{session.words[int(entries[0]['index'])]}", file=sys.stderr)
+
+        return cls(session.words, opener, seconds, offsets, cands)
+
+    def save(self, path: str = OPENING_BOOK_FILE) -> None:
+        header = _HEADER.pack(
+            _MAGIC, _VERSION, len(self.words), BOOK_TOP,
+            dictionary_checksum(self.words), SCORER_ID.encode("ascii"),
+        )
+        with open(path, "wb") as f:
+            f.write(header)
+            f.write(self.opener.tobytes())
+            f.write(self.seconds.tobytes())
+            f.write(self.offsets.astype("<u4").tobytes())
+            f.write(self.cands.astype(self.cands.dtype.newbyteorder("<")).tobytes())
+
+    @classmethod
+    def load(cls, words, path: str = OPENING_BOOK_FILE) -> "OpeningBook":
+        """
+        Charge un livre existant. Lève ValueError s'il a été construit pour
+        un autre dictionnaire ou une autre fonction de score.
+        """
+        words = words if hasattr(words, "letters") else list(words)
+        with open(path, "rb") as f:
+            raw = f.read()
+
+        if len(raw) < _HEADER.size:
+            raise ValueError(f"{path}: en-tête tronqué")
+        magic, version, n_words, top, checksum, scorer = _HEADER.unpack_from(raw)
+        if magic != _MAGIC or version != _VERSION or top != BOOK_TOP:
+            raise ValueError(f"{path}: format de livre inconnu")
+        if n_words != len(words) or checksum != dictionary_checksum(words):
+            raise ValueError(f"{path}: livre construit pour un autre dictionnaire")
+        if scorer.rstrip(b"\0").decode("ascii") != SCORER_ID:
+            raise ValueError(f"{path}: livre construit avec un autre score")
+
+        pos = _HEADER.size
+        opener = np.frombuffer(raw, dtype=_ENTRY, count=BOOK_TOP, offset=pos)
+        pos += opener.nbytes
+        seconds = np.frombuffer(raw, dtype=_ENTRY, count=N_PATTERNS * BOOK_TOP, offset=pos)
+        seconds = seconds.reshape(N_PATTERNS, BOOK_TOP)
+        pos += seconds.nbytes
+        offsets = np.frombuffer(raw, dtype="<u4", count=N_PATTERNS + 1, offset=pos)
+        pos += offsets.nbytes
+        cand_dtype = "<u2" if n_words <= np.iinfo(np.uint16).max else "<u4"
+        cands = np.frombuffer(raw, dtype=cand_dtype, count=int(offsets[-1]), offset=pos)
+        if pos + cands.nbytes != len(raw):
+            raise ValueError(f"{path}: fichier tronqué")
+
+        return cls(words, opener, seconds, offsets, cands)
+
+
+def _entries(index, scores) -> np.ndarray:
+    out = np.zeros(len(scores), dtype=_ENTRY)
+    for i, s in enumerate(scores):
+        out[i] = (index[s.word], s.entropy, s.expected_remaining)
+    return out
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="(Re)generate the Wordle opening book.")
+    p.add_argument("--dictionary", default="wordle.txt")
+    p.add_argument("--out", default=OPENING_BOOK_FILE)
+    p.add_argument("--workers", type=int, default=None)
+    return p
+
+
+def main() -> None:
+    from llm_agent import load_dictionary
+
+    args = build_parser().parse_args()
+    words = load_dictionary(args.dictionary)
+    if not words:
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    book = OpeningBook.build(words, workers=args.workers, verbose=True)
+    book.save(args.out)
+    print(f"Opening book ({book.first_guess}, scorer {SCORER_ID}) -> {args.out} "
+          f"in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
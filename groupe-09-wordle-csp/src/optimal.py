@@ -0,0 +1,387 @@
+import hashlib
+import itertools
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from csp_solver import N_PATTERNS, WordleConstraints, decode_feedback, encode_feedback, feedback_matrix
+from ranker import CHUNK_SIZE, score_guesses
+
+
+# ---------------------------------------------------------------------------
+# Solveur exact (branch-and-bound sur les partitions de feedback)
+# ---------------------------------------------------------------------------
+# Pour un ensemble S de candidats et un guess g, le feedback découpe S en
+# classes S_p. Deux objectifs :
+#   - "expected" : nombre TOTAL de guesses pour trouver chaque secret de S
+#                  cost(S) = min_g |S| + sum_p cost(S_p)   (espérance = cost / |S|)
+#   - "worst"    : nombre de guesses dans le pire cas
+#                  cost(S) = min_g 1 + max_p cost(S_p)
+# (la classe VVVVV, si g est candidat, est terminée : elle ne coûte rien de plus)
+#
+# Élagage : bornes inférieures sur cost(S) ne dépendant que de |S|, et borne
+# supérieure beta = meilleure solution connue (initialisée par la politique
+# gloutonne du ranker). Mémoïsation sur une empreinte du sous-ensemble.
+#
+# À chaque noeud, seuls les `width` meilleurs guesses selon l'entropie sont
+# explorés (width=None : tous les guesses du pool, solution exacte au sens
+# strict mais beaucoup plus lente). Avec width, le résultat n'est que le
+# meilleur guess de cet arbre restreint : il n'est marqué exact que si
+# width=None (ou si width couvre tout le pool) et que le budget suffit.
+#
+# Mode difficile : les guesses jouables dépendent du chemin. Chaque classe
+# S_p porte son propre pool, celui du parent filtré par les indices du
+# feedback p (WordleConstraints.hard_mask), et la clé de mémo inclut ce pool.
+OBJECTIVES = ("expected", "worst")
+
+# Nombre de guesses explorés par noeud (classés par entropie)
+BRANCH_WIDTH = 25
+
+# Budget de temps par défaut (secondes)
+TIME_BUDGET_S = 10.0
+
+_WIN = encode_feedback("VVVVV")
+
+
+@dataclass(frozen=True)
+class OptimalResult:
+    word: str
+    cost: Optional[int]               # total (expected) ou profondeur (worst) ; None si inconnu
+    objective: str
+    expected_guesses: Optional[float]  # cost / |S| (objectif "expected")
+    exact: bool                       # True : optimum prouvé sur tout le pool
+    timed_out: bool                   # budget épuisé, meilleur résultat trouvé
+    width: Optional[int]              # guesses explorés par noeud (None : tous)
+    nodes: int                        # noeuds explorés
+    time_s: float
+
+
+class _Timeout(Exception):
+    pass
+
+
+def lower_bound(n: int, objective: str) -> int:
+    """
+    Borne inférieure de cost(S) pour |S| = n.
+
+    expected : au plus un secret trouvé en 1 guess, au plus 242 autres isolés
+               (trouvés en 2), le reste en 3 au mieux.
+    worst    : 1 guess si n = 1, 2 si les n - 1 autres peuvent être isolés.
+    """
+    if n <= 0:
+        return 0
+    if objective == "expected":
+        return 2 * n - 1 + max(0, n - N_PATTERNS)
+    if n == 1:
+        return 1
+    return 2 if n <= N_PATTERNS else 3
+
+
+def subset_key(idx: np.ndarray, pool: Optional[np.ndarray] = None) -> bytes:
+    """
+    Empreinte (blake2b, 16 octets) d'un sous-ensemble trié d'indices, et du
+    pool de guesses jouables s'il dépend du chemin (mode difficile).
+    """
+    h = hashlib.blake2b(np.ascontiguousarray(idx, dtype=np.int32).tobytes(), digest_size=16)
+    if pool is not None:
+        h.update(b"|")
+        h.update(np.ascontiguousarray(pool, dtype=np.int32).tobytes())
+    return h.digest()
+
+
+class _Search:
+    """État d'une recherche (un par processus) : mémo + compteurs."""
+
+    def __init__(self, letters, counts, pool, objective: str, width, deadline: float,
+                 hard_mode: bool = False):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Objectif inconnu: {objective} ({'/'.join(OBJECTIVES)})")
+        self.letters = letters
+        self.counts = counts
+        self.pool = pool
+        self.hard_mode = hard_mode
+        self.objective = objective
+        self.width = width
+        self.deadline = deadline
+        self.memo = {}     # clé -> (coût exact, indice du guess)
+        self.lower = {}    # clé -> borne inférieure prouvée (échecs sous beta)
+        self.nodes = 0
+
+    def lb(self, n: int) -> int:
+        return lower_bound(n, self.objective)
+
+    # -----------------------------------------------------------------------
+    # Génération des guesses d'un noeud
+    # -----------------------------------------------------------------------
+    def rank(self, S: np.ndarray, pool: np.ndarray, workers: int = 1, partial: bool = False) -> np.ndarray:
+        """
+        Guesses de `pool` à explorer pour S, triés comme le ranker : entropie
+        décroissante, candidats d'abord à égalité. Les guesses qui ne séparent
+        rien sont écartés. Les codes sont calculés par paquets de CHUNK_SIZE
+        (ranker.score_guesses), jamais en une matrice pool x S complète.
+
+        À l'échéance : _Timeout, ou si `partial`, classement des seuls
+        guesses déjà évalués (au moins un paquet).
+        """
+        step = CHUNK_SIZE * max(1, workers)
+        entropy = np.full(len(pool), -1.0)
+        secrets = self.letters[S]
+        for i in range(0, len(pool), step):
+            if i and time.time() > self.deadline:
+                if not partial:
+                    raise _Timeout()
+                pool, entropy = pool[:i], entropy[:i]
+                break
+            entropy[i:i + step], _ = score_guesses(self.letters[pool[i:i + step]], secrets, workers=workers)
+        is_cand = np.isin(pool, S)
+        order = np.lexsort((pool, ~is_cand, -np.round(entropy, 9)))
+        useful = order[entropy[order] > 0]
+        if self.width is not None:
+            useful = useful[:self.width]
+        return pool[useful]
+
+    def partitions(self, S: np.ndarray, pool: np.ndarray, guesses: np.ndarray):
+        """
+        Générateur de (indice, classes non gagnantes) pour chaque guess de
+        `guesses`, dans l'ordre. Chaque classe est un couple (sous-ensemble,
+        pool de guesses jouables ensuite). Les partitions ne sont construites
+        qu'au fur et à mesure : une coupure n'en calcule pas d'autres.
+        """
+        for start in range(0, len(guesses), CHUNK_SIZE):
+            chunk = guesses[start:start + CHUNK_SIZE]
+            codes = feedback_matrix(self.letters[chunk], self.letters[S], self.counts[S])
+            for guess, row in zip(chunk.tolist(), codes):
+                if time.time() > self.deadline:
+                    raise _Timeout()
+                sort = np.argsort(row, kind="stable")
+                bounds = np.flatnonzero(np.diff(row[sort])) + 1
+                parts = [(S[p], self.next_pool(pool, guess, row[p[0]]))
+                         for p in np.split(sort, bounds) if row[p[0]] != _WIN]
+                parts.sort(key=lambda part: len(part[0]), reverse=True)
+                yield guess, parts
+
+    def branches(self, S: np.ndarray, pool: np.ndarray):
+        """Guesses à explorer pour S et leurs classes (cf. rank / partitions)."""
+        return self.partitions(S, pool, self.rank(S, pool))
+
+    def next_pool(self, pool: np.ndarray, guess: int, code: int) -> np.ndarray:
+        """Guesses encore jouables après le feedback `code` de `guess`."""
+        if not self.hard_mode:
+            return pool
+        cons = WordleConstraints()
+        cons.add("".join(chr(65 + int(c)) for c in self.letters[guess]), decode_feedback(code))
+        return pool[cons.hard_mask(self.letters[pool], self.counts[pool])]
+
+    # -----------------------------------------------------------------------
+    # Branch-and-bound
+    # -----------------------------------------------------------------------
+    def guess_cost(self, n: int, parts: list, beta: float) -> float:
+        """
+        Coût de S sachant le guess (classes `parts`), ou une valeur >= beta
+        dès qu'il est prouvé qu'on ne fera pas mieux que beta.
+        """
+        if self.objective == "expected":
+            total = n + sum(self.lb(len(p)) for p, _ in parts)
+            for p, pool in parts:
+                if total >= beta:
+                    return total
+                lb = self.lb(len(p))
+                c, _ = self.cost(p, pool, beta - (total - lb))
+                total += c - lb
+            return total
+
+        worst = 1 + max((self.lb(len(p)) for p, _ in parts), default=0)
+        for p, pool in parts:
+            if worst >= beta:
+                return worst
+            c, _ = self.cost(p, pool, beta - 1)
+            worst = max(worst, 1 + c)
+        return worst
+
+    def cost(self, S: np.ndarray, pool: np.ndarray, beta: float = float("inf")):
+        """
+        (coût optimal de S avec les guesses de `pool`, indice du guess), ou
+        (valeur >= beta, None) si aucun guess ne fait mieux que beta.
+        Un candidat est toujours jouable, y compris en mode difficile.
+        """
+        n = len(S)
+        if n == 1:
+            return 1, int(S[0])
+        if n == 2:
+            # Jouer l'un des deux : 1 + 2 guesses au total, profondeur 2
+            return (3 if self.objective == "expected" else 2), int(S[0])
+
+        key = subset_key(S, pool if self.hard_mode else None)
+        if key in self.memo:
+            return self.memo[key]
+        lb = max(self.lb(n), self.lower.get(key, 0))
+        if lb >= beta:
+            return lb, None
+        if time.time() > self.deadline:
+            raise _Timeout()
+        self.nodes += 1
+
+        best, best_guess = beta, None
+        for guess, parts in self.branches(S, pool):
+            c = self.guess_cost(n, parts, best)
+            if c < best:
+                best, best_guess = c, guess
+                if best <= lb:
+                    break
+
+        if best_guess is None:
+            self.lower[key] = max(self.lower.get(key, 0), beta)
+            return beta, None
+        self.memo[key] = (best, best_guess)
+        return best, best_guess
+
+    def greedy_cost(self, S: np.ndarray, pool: np.ndarray) -> float:
+        """Coût de la politique gloutonne (meilleur guess par entropie) : borne supérieure."""
+        n = len(S)
+        if n <= 2:
+            return self.cost(S, pool)[0]
+        if time.time() > self.deadline:
+            raise _Timeout()
+        return self.greedy_parts_cost(n, next(self.branches(S, pool))[1])
+
+    def greedy_parts_cost(self, n: int, parts: list) -> float:
+        sub = []
+        for p, p_pool in parts:
+            if time.time() > self.deadline:
+                raise _Timeout()
+            sub.append(self.greedy_cost(p, p_pool))
+        if self.objective == "expected":
+            return n + sum(sub)
+        return 1 + max(sub, default=0)
+
+
+# ---------------------------------------------------------------------------
+# Parallélisation au premier niveau : un guess racine par tâche
+# ---------------------------------------------------------------------------
+_WORKER_SEARCH = None
+
+
+def _init_worker(letters, counts, pool, objective, width, deadline, hard_mode):
+    global _WORKER_SEARCH
+    _WORKER_SEARCH = _Search(letters, counts, pool, objective, width, deadline, hard_mode)
+
+
+def _root_task(args):
+    rank, n, parts, beta = args
+    start = _WORKER_SEARCH.nodes
+    try:
+        c = _WORKER_SEARCH.guess_cost(n, parts, beta)
+    except _Timeout:
+        c = None
+    return rank, c, _WORKER_SEARCH.nodes - start
+
+
+def solve_optimal(session, objective: str = "expected", time_budget_s: float = TIME_BUDGET_S,
+                  workers=None, width=BRANCH_WIDTH, guess_pool=None) -> Optional[OptimalResult]:
+    """
+    Meilleur guess pour les candidats de `session` (WordleSession) selon
+    `objective`. Si le budget de temps est épuisé, renvoie le meilleur guess
+    trouvé jusque-là (timed_out=True) ; au pire, celui de la politique
+    gloutonne. Le résultat n'est exact que si la recherche a fini sans
+    restreindre les guesses explorés (width=None).
+
+    workers : nombre de processus pour les guesses racine (défaut : nb de
+    coeurs ; 1 = dans le processus courant, avec une borne qui se resserre
+    d'un guess à l'autre).
+    """
+    t0 = time.perf_counter()
+    S = np.sort(np.asarray(session.candidates, dtype=np.int32))
+    if len(S) == 0:
+        return None
+    workers = (os.cpu_count() or 1) if workers is None else max(1, int(workers))
+    if guess_pool is None:
+        # Mode difficile : guesses jouables à la racine, restreints ensuite
+        # branche par branche selon le feedback (_Search.next_pool)
+        guess_pool = getattr(session, "guess_pool", None)
+    pool = np.arange(len(session.words), dtype=np.int32) if guess_pool is None \
+        else np.asarray(guess_pool, dtype=np.int32)
+    hard_mode = bool(getattr(session, "hard_mode", False))
+    deadline = time.time() + time_budget_s
+    search = _Search(session.letters, session.counts, pool, objective, width, deadline, hard_mode)
+
+    # width couvrant tout le pool : aucune restriction
+    narrowed = width is not None and width < len(pool)
+
+    def result(guess, cost, complete, nodes, exact=None):
+        expected = cost / len(S) if objective == "expected" and cost is not None else None
+        cost = int(cost) if cost is not None else None
+        exact = complete and not narrowed if exact is None else exact
+        return OptimalResult(session.words[guess], cost, objective, expected, exact,
+                             not complete, width if narrowed else None,
+                             nodes, time.perf_counter() - t0)
+
+    if len(S) <= 2:
+        # Jouer un candidat est optimal quelle que soit la largeur
+        cost, guess = search.cost(S, pool)
+        return result(guess, cost, True, 0, exact=True)
+
+    # Classement des guesses racine (entropie, par paquets, en parallèle) :
+    # son meilleur guess sert de repli si le budget est épuisé trop tôt
+    ranked = search.rank(S, pool, workers, partial=True)
+    best_guess = int(ranked[0])
+    roots = search.partitions(S, pool, ranked)
+    n = len(S)
+    try:
+        # Borne gloutonne : le premier guess racine est celui du ranker
+        first = next(roots)
+        best = search.greedy_parts_cost(n, first[1])
+    except _Timeout:
+        # Budget épuisé avant la fin de la politique gloutonne : guess du ranker
+        return result(best_guess, None, False, search.nodes)
+
+    lb = lower_bound(n, objective)
+    complete = True
+    nodes = search.nodes
+    if workers == 1 or len(ranked) == 1:
+        try:
+            for guess, parts in itertools.chain([first], roots):
+                if best <= lb:
+                    break
+                c = search.guess_cost(n, parts, best)
+                if c < best:
+                    best, best_guess = c, guess
+        except _Timeout:
+            complete = False
+        return result(best_guess, best, complete, search.nodes)
+
+    # Chaque processus a son propre mémo ; la borne transmise est celle de la
+    # politique gloutonne (pas de borne partagée entre processus).
+    executor = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker,
+        initargs=(session.letters, session.counts, pool, objective, width, deadline, hard_mode),
+    )
+    # À coût égal, on garde le guess le mieux classé par le ranker (rang racine)
+    best_rank = 0
+    try:
+        pending = set()
+        try:
+            for rank, (_, parts) in enumerate(itertools.chain([first], roots)):
+                pending.add(executor.submit(_root_task, (rank, n, parts, best)))
+        except _Timeout:
+            # Partitions racine non construites : guesses non évalués
+            complete = False
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.time()) + 1.0,
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                complete = False
+                break
+            for f in done:
+                rank, c, worker_nodes = f.result()
+                nodes += worker_nodes
+                if c is None:
+                    complete = False
+                elif (c, rank) < (best, best_rank):
+                    best, best_rank = c, rank
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return result(int(ranked[best_rank]), best, complete, nodes)
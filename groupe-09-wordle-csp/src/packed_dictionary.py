@@ -0,0 +1,195 @@
+import hashlib
+import os
+import struct
+import sys
+from typing import Optional
+
+import numpy as np
+
+from csp_solver import encode_words
+
+
+# ---------------------------------------------------------------------------
+# Dictionnaire compact (lettres pré-encodées, mappé en mémoire)
+# ---------------------------------------------------------------------------
+# Fichier binaire :
+#   - en-tête (128 octets) : magic, version, nb mots,
+#                            sha256 du fichier texte source (wordle.txt),
+#                            sha256 du dictionnaire (cf. dictionary_checksum)
+#   - puis N lignes de 5 octets : lettres codées 0..25 (comme encode_words)
+#
+# Les lignes sont ouvertes en np.memmap (lecture seule) : plusieurs processus
+# (workers Streamlit, simulation) partagent la même copie physique, et le
+# solver lit directement le tableau N x 5 sans créer de str Python.
+PACKED_DICTIONARY_FILE = "wordle.dict"
+
+_MAGIC = b"WDIC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sII32s32s")
+_HEADER_SIZE = 128
+_WORD_LEN = 5
+
+
+def _letters_checksum(letters: np.ndarray) -> bytes:
+    """
+    sha256 de "\\n".join(mots) calculé sur le tableau de lettres (sans str) :
+    même valeur que pattern_table.dictionary_checksum(liste de mots).
+    """
+    rows = np.empty((len(letters), _WORD_LEN + 1), dtype=np.uint8)
+    rows[:, :_WORD_LEN] = letters + ord("A")
+    rows[:, _WORD_LEN] = ord("\n")
+    return hashlib.sha256(rows.ravel()[:-1].tobytes()).digest()
+
+
+def _source_checksum(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def _parse_source(path: str) -> list:
+    # Mêmes règles que llm_agent.load_dictionary : strip, 5 caractères, upper
+    with open(path, "r", encoding="utf-8") as f:
+        words = [line.strip().upper() for line in f if len(line.strip()) == _WORD_LEN]
+    # Le format ne stocke que A-Z (une lettre = un code 0..25)
+    return [w for w in words if w.isascii() and w.isalpha()]
+
+
+class PackedDictionary:
+    """
+    Dictionnaire en lecture seule, vu comme une séquence de mots.
+
+      - letters : np.memmap N x 5 (uint8, lettres 0..25), donné tel quel au
+                  solver (WordleSession, PatternTable)
+      - d[i]    : le mot i, décodé à la demande
+      - get(w)  : indice d'un mot (recherche dichotomique sur les codes
+                  base 26, sans dict de str)
+      - checksum : sha256 du dictionnaire, vérifié au chargement
+    """
+
+    def __init__(self, letters: np.ndarray, checksum: bytes, path: Optional[str] = None):
+        self.letters = letters
+        self.checksum = checksum
+        self.path = path
+        self._codes = None
+        self._order = None
+
+    def __len__(self) -> int:
+        return len(self.letters)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return (self.letters[int(i)] + ord("A")).tobytes().decode("ascii")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __reduce__(self):
+        # Envoi à un autre processus : on ré-ouvre le fichier (pas de copie)
+        if self.path is None:
+            return (PackedDictionary, (np.array(self.letters), self.checksum))
+        return (PackedDictionary.load, (self.path,))
+
+    # -----------------------------------------------------------------------
+    # Recherche d'un mot
+    # -----------------------------------------------------------------------
+    def _sorted_codes(self):
+        if self._codes is None:
+            weights = 26 ** np.arange(_WORD_LEN - 1, -1, -1, dtype=np.int32)
+            codes = self.letters.astype(np.int32) @ weights
+            self._order = np.argsort(codes, kind="stable").astype(np.int32)
+            self._codes = codes[self._order]
+        return self._codes, self._order
+
+    def get(self, word: str, default=None):
+        """Indice de `word` dans le dictionnaire, `default` s'il est absent."""
+        word = word.strip().upper() if isinstance(word, str) else ""
+        if len(word) != _WORD_LEN or not (word.isascii() and word.isalpha()):
+            return default
+        code = 0
+        for ch in word:
+            code = code * 26 + (ord(ch) - ord("A"))
+        codes, order = self._sorted_codes()
+        pos = int(np.searchsorted(codes, code))
+        if pos < len(codes) and codes[pos] == code:
+            return int(order[pos])
+        return default
+
+    def __contains__(self, word) -> bool:
+        return self.get(word) is not None
+
+    # -----------------------------------------------------------------------
+    # Construction / persistance
+    # -----------------------------------------------------------------------
+    @classmethod
+    def build(cls, source: str, path: str = PACKED_DICTIONARY_FILE) -> "PackedDictionary":
+        """
+        Lit `source` (un mot par ligne) et écrit le fichier compact dans `path`
+        (fichier temporaire puis os.replace, comme la table de motifs).
+        """
+        letters = encode_words(_parse_source(source))
+        header = _HEADER.pack(_MAGIC, _VERSION, len(letters),
+                              _source_checksum(source), _letters_checksum(letters))
+
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(header.ljust(_HEADER_SIZE, b"\0"))
+            f.write(letters.tobytes())
+        os.replace(tmp, path)
+        return cls.load(path)
+
+    @classmethod
+    def _read_header(cls, path: str):
+        with open(path, "rb") as f:
+            raw = f.read(_HEADER.size)
+        if len(raw) != _HEADER.size:
+            raise ValueError(f"{path}: en-tête tronqué")
+        magic, version, n_words, source_sum, checksum = _HEADER.unpack(raw)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path}: format de dictionnaire inconnu")
+        if os.path.getsize(path) != _HEADER_SIZE + n_words * _WORD_LEN:
+            raise ValueError(f"{path}: fichier tronqué")
+        return n_words, source_sum, checksum
+
+    @classmethod
+    def load(cls, path: str = PACKED_DICTIONARY_FILE) -> "PackedDictionary":
+        """
+        Ouvre un dictionnaire compact en np.memmap (lecture seule).
+        Lève ValueError si le fichier est tronqué ou corrompu (checksum).
+        """
+        n_words, _, checksum = cls._read_header(path)
+        if n_words == 0:
+            letters = np.zeros((0, _WORD_LEN), dtype=np.uint8)
+        else:
+            letters = np.memmap(path, dtype=np.uint8, mode="r", offset=_HEADER_SIZE,
+                                shape=(n_words, _WORD_LEN))
+        if _letters_checksum(letters) != checksum:
+            raise ValueError(f"{path}: checksum invalide")
+        return cls(letters, checksum, path)
+
+    @classmethod
+    def open(cls, source: str, path: str = PACKED_DICTIONARY_FILE,
+             verbose: bool = False) -> "PackedDictionary":
+        """
+        Charge `path` s'il a été construit à partir du `source` actuel, sinon
+        le (re)construit. Si `source` n'existe pas, le fichier compact seul
+        suffit.
+        """
+        try:
+            _, source_sum, _ = cls._read_header(path)
+            if not os.path.exists(source) or _source_checksum(source) == source_sum:
+                return cls.load(path)
+            reason = f"{source} modifié"
+        except (OSError, ValueError) as e:
+            reason = str(e)
+        if verbose:
+            print(f"Packed dictionary rebuild ({reason})", file=sys.stderr)
+        return cls.build(source, path)
+
+
+if __name__ == "__main__":
+    # Construction / vérification manuelle : python packed_dictionary.py [wordle.txt]
+    src = sys.argv[1] if len(sys.argv) > 1 else "wordle.txt"
+    d = PackedDictionary.open(src, verbose=True)
+    print(f"Packed dictionary OK: {len(d)} words -> {PACKED_DICTIONARY_FILE}")
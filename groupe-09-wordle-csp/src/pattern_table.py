@@ -0,0 +1,208 @@
+import hashlib
+import os
+import struct
+import sys
+from collections import OrderedDict
+
+import numpy as np
+
+from csp_solver import encode_words, feedback_codes, feedback_matrix, letter_counts
+
+
+# ---------------------------------------------------------------------------
+# Table de motifs guess x secret
+# ---------------------------------------------------------------------------
+# Fichier binaire :
+#   - en-tête (64 octets) : magic, version, nb guesses, nb secrets, sha256 du dictionnaire
+#   - puis la matrice uint8 (n_guesses x n_secrets), ligne par ligne
+#
+# La matrice est ouverte en np.memmap (lecture seule) : l'OS ne charge que
+# les pages réellement lues, et plusieurs processus partagent la même copie.
+PATTERN_TABLE_FILE = "wordle_patterns.bin"
+
+_MAGIC = b"WPAT"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIII32s")
+_HEADER_SIZE = 64
+
+# Nombre max de lignes "à la demande" gardées en mémoire (mode sparse)
+MAX_CACHED_ROWS = 2048
+
+# Lignes calculées par appel au noyau feedback_matrix lors de la construction
+BUILD_ROWS = 256
+
+
+def dictionary_checksum(words) -> bytes:
+    """
+    Empreinte sha256 du dictionnaire (ordre compris) : sert à détecter
+    qu'une table sur disque ne correspond plus à wordle.txt.
+    """
+    checksum = getattr(words, "checksum", None)
+    if checksum is not None:
+        # PackedDictionary : empreinte lue dans l'en-tête (même définition)
+        return checksum
+    return hashlib.sha256("\n".join(words).encode("ascii")).digest()
+
+
+def _as_words(words):
+    # Un PackedDictionary est déjà une séquence indexable : on le garde tel
+    # quel (lettres mappées en mémoire) au lieu d'en faire une liste de str
+    return words if hasattr(words, "letters") else list(words)
+
+
+class PatternTable:
+    """
+    Codes de feedback (cf. csp_solver.encode_feedback) pour chaque couple
+    (guess, secret), guess et secret parcourant le dictionnaire.
+
+    Deux modes :
+      - dense  : matrice complète, construite une fois puis mappée en mémoire
+      - sparse : aucune matrice, chaque ligne est calculée à la demande
+                 (vectorisé) puis gardée dans un cache LRU
+
+    Dans les deux cas, un guess absent du dictionnaire est calculé à la
+    demande et mis en cache.
+    """
+
+    def __init__(self, words, matrix=None):
+        self.words = _as_words(words)
+        if hasattr(self.words, "letters"):
+            # PackedDictionary : get() / in par recherche dichotomique
+            self.index = self.words
+            self.letters = self.words.letters
+        else:
+            self.index = {w: i for i, w in enumerate(self.words)}
+            self.letters = encode_words(self.words)
+        self.matrix = matrix
+        self._rows = OrderedDict()
+
+    @property
+    def n_secrets(self) -> int:
+        return len(self.words)
+
+    @property
+    def dense(self) -> bool:
+        return self.matrix is not None
+
+    def row(self, guess: str) -> np.ndarray:
+        """
+        Codes de feedback de `guess` contre tous les secrets (uint8, taille N).
+        """
+        guess = guess.strip().upper()
+        idx = self.index.get(guess)
+        if self.matrix is not None and idx is not None:
+            return self.matrix[idx]
+
+        cached = self._rows.get(guess)
+        if cached is not None:
+            self._rows.move_to_end(guess)
+            return cached
+
+        codes = feedback_codes(guess, self.letters)
+        self._rows[guess] = codes
+        if len(self._rows) > MAX_CACHED_ROWS:
+            self._rows.popitem(last=False)
+        return codes
+
+    # -----------------------------------------------------------------------
+    # Construction / persistance
+    # -----------------------------------------------------------------------
+    @classmethod
+    def sparse(cls, words) -> "PatternTable":
+        return cls(words)
+
+    @classmethod
+    def build(cls, words, path: str = PATTERN_TABLE_FILE, verbose: bool = False) -> "PatternTable":
+        """
+        Calcule la matrice complète et l'écrit dans `path`.
+        L'écriture passe par un fichier temporaire puis un os.replace, pour ne
+        jamais laisser une table à moitié écrite sur disque.
+        """
+        words = _as_words(words)
+        letters = words.letters if hasattr(words, "letters") else encode_words(words)
+        n = len(words)
+
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            header = _HEADER.pack(_MAGIC, _VERSION, n, n, dictionary_checksum(words))
+            f.write(header.ljust(_HEADER_SIZE, b"\0"))
+
+        matrix = np.memmap(tmp, dtype=np.uint8, mode="r+", offset=_HEADER_SIZE, shape=(n, n))
+        counts = letter_counts(letters)
+        for i in range(0, n, BUILD_ROWS):
+            matrix[i:i + BUILD_ROWS] = feedback_matrix(letters[i:i + BUILD_ROWS], letters, counts)
+            if verbose and i % (4 * BUILD_ROWS) == 0:
+                print(f"  {i}/{n} rows", file=sys.stderr)
+        matrix.flush()
+        del matrix
+
+        os.replace(tmp, path)
+        return cls.load(words, path)
+
+    @classmethod
+    def load(cls, words, path: str = PATTERN_TABLE_FILE) -> "PatternTable":
+        """
+        Ouvre une table existante en np.memmap (lecture seule).
+        Lève ValueError si le fichier ne correspond pas au dictionnaire.
+        """
+        words = _as_words(words)
+        with open(path, "rb") as f:
+            raw = f.read(_HEADER.size)
+        if len(raw) != _HEADER.size:
+            raise ValueError(f"{path}: en-tête tronqué")
+
+        magic, version, n_guesses, n_secrets, checksum = _HEADER.unpack(raw)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path}: format de table inconnu")
+        if n_guesses != len(words) or n_secrets != len(words):
+            raise ValueError(f"{path}: dimensions différentes du dictionnaire")
+        if checksum != dictionary_checksum(words):
+            raise ValueError(f"{path}: table construite pour un autre dictionnaire")
+        if os.path.getsize(path) != _HEADER_SIZE + n_guesses * n_secrets:
+            raise ValueError(f"{path}: fichier tronqué")
+
+        matrix = np.memmap(path, dtype=np.uint8, mode="r", offset=_HEADER_SIZE,
+                           shape=(n_guesses, n_secrets))
+        return cls(words, matrix)
+
+    @classmethod
+    def open(cls, words, path: str = PATTERN_TABLE_FILE, verbose: bool = False) -> "PatternTable":
+        """
+        Charge la table si elle est à jour, sinon la (re)construit.
+        C'est le point d'entrée utilisé au démarrage (CLI / Streamlit).
+        """
+        words = _as_words(words)
+        try:
+            return cls.load(words, path)
+        except (OSError, ValueError) as e:
+            if verbose:
+                print(f"Pattern table rebuild ({e})", file=sys.stderr)
+            return cls.build(words, path, verbose=verbose)
+
+
+def load_pattern_table(words, mode: str = "sparse", path: str = PATTERN_TABLE_FILE):
+    """
+    Fabrique selon le mode demandé :
+      - "dense"  : PatternTable.open (construction au premier lancement)
+      - "sparse" : lignes calculées à la demande
+      - "off"    : None (filtrage classique mot par mot)
+    """
+    mode = (mode or "off").strip().lower()
+    if mode == "dense":
+        return PatternTable.open(words, path, verbose=True)
+    if mode == "sparse":
+        return PatternTable.sparse(words)
+    if mode == "off":
+        return None
+    raise ValueError(f"Mode de table inconnu: {mode} (dense/sparse/off)")
+
+
+if __name__ == "__main__":
+    # Construction / vérification manuelle : python pattern_table.py [wordle.txt]
+    from llm_agent import load_dictionary
+
+    dictionary = load_dictionary(sys.argv[1] if len(sys.argv) > 1 else "wordle.txt")
+    if not dictionary:
+        sys.exit(1)
+    t = PatternTable.open(dictionary, verbose=True)
+    print(f"Pattern table OK: {t.n_secrets} x {t.n_secrets} -> {PATTERN_TABLE_FILE}")
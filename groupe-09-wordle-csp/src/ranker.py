@@ -0,0 +1,268 @@
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from csp_solver import N_PATTERNS, feedback_matrix, letter_counts
+
+
+# ---------------------------------------------------------------------------
+# Classement des prochains guess par gain d'information
+# ---------------------------------------------------------------------------
+# Pour un guess g et l'ensemble C des candidats, le feedback partitionne C en
+# (au plus) 243 classes. On mesure :
+#   - l'entropie de cette partition (bits d'information attendus)
+#   - le nombre attendu de candidats restants : sum(|classe|^2) / |C|
+# Le meilleur guess maximise l'entropie ; à égalité, on préfère un candidat
+# (il peut être le mot secret).
+
+# Identifiant de la fonction de score : stocké dans les artefacts précalculés
+# (livre d'ouvertures) pour détecter qu'ils doivent être régénérés.
+SCORER_ID = "entropy-v1"
+
+# Nombre de processus (1 = tout dans le processus courant)
+RANKER_WORKERS = int(os.environ.get("WORDLE_RANKER_WORKERS", os.cpu_count() or 1))
+
+# En dessous de ce volume (guesses x candidats), le coût de la distribution
+# vers le pool dépasse le gain : on reste dans le processus courant.
+PARALLEL_MIN_WORK = 2_000_000
+
+# En dessous de ce nombre de candidats, partition_stats trie les codes de
+# chaque guess au lieu de remplir 243 compteurs
+SMALL_PARTITION = 96
+
+# Nombre de guesses traités par tâche (une matrice CHUNK_SIZE x candidats
+# par appel au noyau)
+CHUNK_SIZE = 512
+
+
+@dataclass(frozen=True)
+class GuessScore:
+    word: str
+    entropy: float              # bits d'information attendus
+    expected_remaining: float   # nombre moyen de candidats après ce guess
+    is_candidate: bool          # le guess peut-il être le mot secret ?
+
+
+def partition_stats(codes: np.ndarray):
+    """
+    À partir d'une matrice de codes (guesses x candidats, uint8), calcule
+    pour chaque guess l'entropie de la partition et le nombre attendu de
+    candidats restants.
+    """
+    n_guesses, n_secrets = codes.shape
+    if n_secrets == 0:
+        return np.zeros(n_guesses), np.zeros(n_guesses)
+
+    c = np.arange(1, n_secrets + 1, dtype=np.float64)
+    c_log_c = np.zeros(n_secrets + 1)
+    c_log_c[1:] = c * np.log2(c)
+    if n_secrets < SMALL_PARTITION:
+        return _small_partition_stats(codes, c_log_c)
+
+    # Un seul bincount pour toutes les lignes : code + 243 * numéro de ligne
+    offsets = np.arange(n_guesses, dtype=np.int64)[:, None] * N_PATTERNS
+    counts = np.bincount((codes + offsets).ravel(), minlength=n_guesses * N_PATTERNS)
+    counts = counts.reshape(n_guesses, N_PATTERNS)
+
+    # H = log2(n) - sum(c * log2(c)) / n : c * log2(c) est lu dans une table
+    # (c <= n), au lieu d'un log sur toute la matrice guesses x 243
+    entropy = np.log2(n_secrets) - c_log_c[counts].sum(axis=1) / n_secrets
+    expected = np.einsum("ij,ij->i", counts, counts) / n_secrets
+    return entropy, expected
+
+
+def _small_partition_stats(codes: np.ndarray, c_log_c: np.ndarray):
+    # Peu de candidats : trier chaque ligne et mesurer les plages de codes
+    # égaux coûte moins cher que 243 compteurs par guess
+    n_guesses, n_secrets = codes.shape
+    srt = np.sort(codes, axis=1)
+    start = np.ones(srt.shape, dtype=bool)
+    start[:, 1:] = srt[:, 1:] != srt[:, :-1]
+    first = np.flatnonzero(start.ravel())
+    sizes = np.diff(np.append(first, n_guesses * n_secrets))
+    rows = first // n_secrets
+    entropy = np.log2(n_secrets) - np.bincount(rows, weights=c_log_c[sizes], minlength=n_guesses) / n_secrets
+    expected = np.bincount(rows, weights=sizes.astype(np.float64) ** 2, minlength=n_guesses) / n_secrets
+    return entropy, expected
+
+
+def _score_chunk(args):
+    # Un paquet de guesses : matrice de codes en une passe (feedback_matrix)
+    guess_letters, secret_letters, secret_counts = args
+    return partition_stats(feedback_matrix(guess_letters, secret_letters, secret_counts))
+
+
+# ---------------------------------------------------------------------------
+# Pool de processus (créé à la demande, réutilisé d'un tour à l'autre)
+# ---------------------------------------------------------------------------
+_POOL = None
+_POOL_WORKERS = 0
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL, _POOL_WORKERS
+    if _POOL is None or _POOL_WORKERS != workers:
+        if _POOL is not None:
+            _POOL.shutdown(cancel_futures=True)
+        _POOL = ProcessPoolExecutor(max_workers=workers)
+        _POOL_WORKERS = workers
+    return _POOL
+
+
+@atexit.register
+def _shutdown_pool():
+    if _POOL is not None:
+        _POOL.shutdown(cancel_futures=True)
+
+
+def score_guesses(guess_letters: np.ndarray, secret_letters: np.ndarray, workers=None):
+    """
+    Entropie et nombre attendu de restants pour chaque guess (lignes de
+    guess_letters) contre les secrets (lignes de secret_letters).
+
+    Les guesses sont découpés en paquets de CHUNK_SIZE, répartis sur un pool
+    de processus si le volume le justifie.
+    """
+    workers = RANKER_WORKERS if workers is None else max(1, int(workers))
+    secret_counts = letter_counts(secret_letters)
+    chunks = [
+        (guess_letters[i:i + CHUNK_SIZE], secret_letters, secret_counts)
+        for i in range(0, len(guess_letters), CHUNK_SIZE)
+    ]
+    if not chunks:
+        return np.zeros(0), np.zeros(0)
+
+    work = len(guess_letters) * len(secret_letters)
+    if workers > 1 and len(chunks) > 1 and work >= PARALLEL_MIN_WORK:
+        results = list(_get_pool(workers).map(_score_chunk, chunks))
+    else:
+        results = [_score_chunk(c) for c in chunks]
+
+    entropy = np.concatenate([r[0] for r in results])
+    expected = np.concatenate([r[1] for r in results])
+    return entropy, expected
+
+
+def _score_with_table(table, guess_idx: np.ndarray, candidates: np.ndarray):
+    # Table dense : les codes sont déjà calculés, il suffit de les lire
+    entropy, expected = [], []
+    for i in range(0, len(guess_idx), CHUNK_SIZE):
+        rows = table.matrix[guess_idx[i:i + CHUNK_SIZE]]
+        e, x = partition_stats(rows[:, candidates])
+        entropy.append(e)
+        expected.append(x)
+    if not entropy:
+        return np.zeros(0), np.zeros(0)
+    return np.concatenate(entropy), np.concatenate(expected)
+
+
+def _score_pool(session, guess_pool: np.ndarray, candidates: np.ndarray, workers=None):
+    # Table dense si disponible, sinon noyau vectorisé (éventuellement en pool)
+    table = session.table
+    if table is not None and table.dense:
+        return _score_with_table(table, guess_pool, candidates)
+    return score_guesses(session.letters[guess_pool], session.letters[candidates], workers=workers)
+
+
+def _guess_pool(session, guess_pool) -> np.ndarray:
+    if guess_pool is None:
+        # Guesses jouables de la session (mode difficile), sinon tout le dictionnaire
+        pool = getattr(session, "guess_pool", None)
+        return pool if pool is not None else np.arange(len(session.words), dtype=np.int32)
+    return np.asarray(guess_pool, dtype=np.int32)
+
+
+def rank_guesses(session, top: int = 10, guess_pool=None, workers=None) -> list:
+    """
+    Classe les guesses autorisés pour la session courante.
+
+    Paramètres
+    ----------
+    session : WordleSession
+        fournit le dictionnaire (words / letters), les candidats survivants
+        et, éventuellement, une table de motifs dense
+    top : int
+        nombre de guesses retournés
+    guess_pool : array d'indices, optionnel
+        guesses autorisés (indices dans session.words) ; par défaut
+        session.guess_pool (restreint en mode difficile)
+    workers : int, optionnel
+        nombre de processus (défaut RANKER_WORKERS)
+
+    Retour
+    ------
+    list[GuessScore] triée du meilleur au moins bon.
+    """
+    candidates = session.candidates
+    if len(candidates) == 0:
+        return []
+    if len(candidates) == 1:
+        w = session.words[candidates[0]]
+        return [GuessScore(w, 0.0, 1.0, True)]
+
+    guess_pool = _guess_pool(session, guess_pool)
+    entropy, expected = _score_pool(session, guess_pool, candidates, workers)
+
+    is_cand = np.isin(guess_pool, candidates)
+    # Tri : entropie décroissante, puis candidats d'abord, puis ordre du dictionnaire
+    order = np.lexsort((guess_pool, ~is_cand, -np.round(entropy, 9)))[:top]
+    return [
+        GuessScore(
+            word=session.words[guess_pool[i]],
+            entropy=float(entropy[i]),
+            expected_remaining=float(expected[i]),
+            is_candidate=bool(is_cand[i]),
+        )
+        for i in order
+    ]
+
+
+def rank_guesses_multi(session, top: int = 10, guess_pool=None, workers=None) -> list:
+    """
+    Classement pour une MultiBoardSession (csp_solver).
+
+    Les secrets des plateaux sont indépendants : l'information apportée par
+    un guess est la somme de ses entropies sur les plateaux non résolus
+    (expected_remaining : somme des restants attendus, un plateau que le
+    guess résout comptant 0, quel que soit son nombre de candidats).
+
+    Priorité absolue aux mots qui sont le dernier candidat d'un plateau (le
+    jouer résout ce plateau, coup qu'il faudra jouer de toute façon), puis
+    même tri que rank_guesses.
+    """
+    active = [session.boards[b] for b in session.unsolved]
+    active = [c for c in active if len(c)]
+    if not active:
+        return []
+
+    guess_pool = _guess_pool(session, guess_pool)
+    entropy = np.zeros(len(guess_pool))
+    expected = np.zeros(len(guess_pool))
+    is_cand = np.zeros(len(guess_pool), dtype=bool)
+    forced = np.zeros(len(guess_pool), dtype=bool)
+    for candidates in active:
+        board_cand = np.isin(guess_pool, candidates)
+        if len(candidates) == 1:
+            forced |= board_cand
+            expected += ~board_cand
+        else:
+            e, x = _score_pool(session, guess_pool, candidates, workers)
+            entropy += e
+            # partition_stats compte la classe VVVVV (taille 1) comme un
+            # restant : le guess qui résout ce plateau n'y laisse aucun candidat
+            expected += x - board_cand / len(candidates)
+        is_cand |= board_cand
+
+    order = np.lexsort((guess_pool, ~is_cand, -np.round(entropy, 9), ~forced))[:top]
+    return [
+        GuessScore(
+            word=session.words[guess_pool[i]],
+            entropy=float(entropy[i]),
+            expected_remaining=float(expected[i]),
+            is_candidate=bool(is_cand[i]),
+        )
+        for i in order
+    ]
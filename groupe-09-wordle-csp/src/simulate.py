@@ -0,0 +1,279 @@
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from csp_solver import WordleSession, encode_feedback, wordle_feedback_vjg
+from opening_book import OPENING_BOOK_FILE, OpeningBook
+from pattern_table import dictionary_checksum
+from ranker import rank_guesses
+
+
+# ---------------------------------------------------------------------------
+# Simulation hors ligne du solver (sans LLM)
+# ---------------------------------------------------------------------------
+# Chaque partie : un mot secret, le solver joue l'ouverture puis, à chaque
+# tour, le premier mot du ranker ; le feedback est calculé par
+# wordle_feedback_vjg. Aucun appel Ollama : seuls le CSP et le ranker sont
+# mesurés. Les parties sont réparties sur les coeurs (ProcessPoolExecutor).
+MAX_TURNS = 6
+
+
+@dataclass
+class GameResult:
+    secret: str
+    solved: bool
+    guesses: list = field(default_factory=list)
+    turn_ms: list = field(default_factory=list)   # latence solver par tour (filtrage + ranking)
+
+    @property
+    def n_guesses(self) -> int:
+        return len(self.guesses)
+
+
+def play_game(session: WordleSession, secret: str, opener: str,
+              book=None, max_turns: int = MAX_TURNS) -> GameResult:
+    """
+    Joue une partie complète avec le solver. La session est remise à zéro.
+    Si `book` (OpeningBook) est fourni et que l'ouverture est la sienne, le
+    1er tour est une simple lecture du livre.
+    """
+    session.reset()
+    result = GameResult(secret=secret, solved=False)
+    guess = opener
+
+    for _ in range(max_turns):
+        result.guesses.append(guess)
+        if guess == secret:
+            result.solved = True
+            break
+
+        t0 = time.perf_counter()
+        fb = wordle_feedback_vjg(secret, guess)
+        if book is not None and not session.attempts and guess == book.first_guess:
+            code = encode_feedback(fb)
+            session.add_attempt(guess, fb, known_candidates=book.candidates(code))
+            # En mode difficile, le second guess du livre n'est pas forcément jouable
+            ranking = book.second_ranking(code) if not session.hard_mode \
+                else rank_guesses(session, top=1, workers=1)
+        else:
+            session.add_attempt(guess, fb)
+            ranking = rank_guesses(session, top=1, workers=1)
+        result.turn_ms.append((time.perf_counter() - t0) * 1000.0)
+
+        if not ranking:
+            # Le secret n'est pas dans le dictionnaire du solver
+            break
+        guess = ranking[0].word
+
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Exécution parallèle : une session par processus, initialisée une seule fois
+# ---------------------------------------------------------------------------
+_WORKER_SESSION = None
+_WORKER_OPENER = None
+_WORKER_BOOK = None
+
+
+def _init_worker(words, opener, book_path, guess_words=None, hard_mode=False):
+    global _WORKER_SESSION, _WORKER_OPENER, _WORKER_BOOK
+    _WORKER_SESSION = WordleSession(words, guess_words=guess_words, hard_mode=hard_mode)
+    _WORKER_OPENER = opener
+    _WORKER_BOOK = load_book(words, book_path)
+
+
+def _play_secret(secret: str) -> GameResult:
+    return play_game(_WORKER_SESSION, secret, _WORKER_OPENER, book=_WORKER_BOOK)
+
+
+def load_book(words, path):
+    """Livre d'ouvertures s'il existe et correspond au dictionnaire, sinon None."""
+    if not path:
+        return None
+    try:
+        return OpeningBook.load(words, path)
+    except (OSError, ValueError):
+        return None
+
+
+def best_opener(words, workers=None, guess_words=None) -> str:
+    """Premier guess : meilleur mot du ranker sur le dictionnaire complet."""
+    session = WordleSession(words, guess_words=guess_words)
+    return rank_guesses(session, top=1, workers=workers)[0].word
+
+
+def run_simulation(words, secrets, opener: str, workers: int = 1, book_path=None,
+                   guess_words=None, hard_mode: bool = False) -> list:
+    if workers <= 1:
+        _init_worker(words, opener, book_path, guess_words, hard_mode)
+        return [_play_secret(s) for s in secrets]
+
+    chunksize = max(1, len(secrets) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(words, opener, book_path, guess_words, hard_mode)) as pool:
+        return list(pool.map(_play_secret, secrets, chunksize=chunksize))
+
+
+# ---------------------------------------------------------------------------
+# Rapport
+# ---------------------------------------------------------------------------
+def summarize(results, config: dict) -> dict:
+    n = len(results)
+    solved = [r for r in results if r.solved]
+    distribution = {str(k): 0 for k in range(1, MAX_TURNS + 1)}
+    distribution["X"] = n - len(solved)
+    for r in solved:
+        distribution[str(r.n_guesses)] += 1
+
+    turn_ms = np.array([t for r in results for t in r.turn_ms], dtype=np.float64)
+    if len(turn_ms):
+        latency = {
+            "p50": float(np.percentile(turn_ms, 50)),
+            "p90": float(np.percentile(turn_ms, 90)),
+            "p99": float(np.percentile(turn_ms, 99)),
+            "max": float(turn_ms.max()),
+            "mean": float(turn_ms.mean()),
+        }
+    else:
+        latency = {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0, "mean": 0.0}
+
+    return {
+        "config": config,
+        "games": n,
+        "solved": len(solved),
+        "failure_rate": (n - len(solved)) / n if n else 0.0,
+        "mean_guesses_solved": float(np.mean([r.n_guesses for r in solved])) if solved else None,
+        "guess_distribution": distribution,
+        "turn_latency_ms": latency,
+    }
+
+
+def write_csv(path: str, results) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["secret", "solved", "n_guesses", "guesses", "turn_ms"])
+        for r in results:
+            w.writerow([
+                r.secret, int(r.solved), r.n_guesses, " ".join(r.guesses),
+                " ".join(f"{t:.3f}" for t in r.turn_ms),
+            ])
+
+
+def compare_to_baseline(report: dict, baseline: dict) -> str:
+    """Lignes 'métrique: baseline -> actuel' pour les indicateurs principaux."""
+    def fmt(v):
+        return "n/a" if v is None else f"{v:.4f}" if isinstance(v, float) else str(v)
+
+    lines = []
+    for key in ("failure_rate", "mean_guesses_solved"):
+        lines.append(f"{key}: {fmt(baseline.get(key))} -> {fmt(report.get(key))}")
+    for key in ("p50", "p90", "p99"):
+        old = baseline.get("turn_latency_ms", {}).get(key)
+        new = report["turn_latency_ms"][key]
+        lines.append(f"turn_latency_ms.{key}: {fmt(old)} -> {fmt(new)}")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Headless Wordle solver simulation (no LLM).")
+    p.add_argument("--dictionary", default="wordle.txt")
+    p.add_argument("--sample", type=int, default=None,
+                   help="play a seeded sample of N secrets instead of the whole dictionary")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--opener", type=str, default=None,
+                   help="first guess (default: opening book, else best ranker word)")
+    p.add_argument("--book", type=str, default=OPENING_BOOK_FILE,
+                   help="opening book used for turns 1-2 ('' to disable)")
+    p.add_argument("--guesses", type=str, default=None,
+                   help="allowed-guess list, larger than the answer list (default: answers only)")
+    p.add_argument("--hard", action="store_true",
+                   help="hard mode: every guess reuses the revealed hints")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--out-csv", default="outputs/simulation.csv")
+    p.add_argument("--out-json", default="outputs/simulation.json")
+    p.add_argument("--baseline", type=str, default=None,
+                   help="previous JSON report to compare against")
+    return p
+
+
+def main() -> None:
+    from llm_agent import load_packed_dictionary
+
+    args = build_parser().parse_args()
+    # Dictionnaire compact : les workers ré-ouvrent le même fichier mappé
+    words = load_packed_dictionary(args.dictionary)
+    if not words:
+        sys.exit(1)
+
+    secrets = list(words)
+    if args.sample is not None and args.sample < len(secrets):
+        secrets = random.Random(args.seed).sample(secrets, args.sample)
+
+    guess_words = load_packed_dictionary(args.guesses) if args.guesses else None
+    if args.guesses and not guess_words:
+        sys.exit(1)
+
+    # Le livre d'ouvertures est indexé sur la liste des réponses seule
+    book = load_book(words, args.book) if guess_words is None else None
+    if args.opener:
+        opener = args.opener.strip().upper()
+    elif book is not None:
+        opener = book.first_guess
+    else:
+        opener = best_opener(words, workers=args.workers, guess_words=guess_words)
+
+    t0 = time.perf_counter()
+    results = run_simulation(words, secrets, opener, workers=args.workers,
+                             book_path=args.book if book is not None else None,
+                             guess_words=guess_words, hard_mode=args.hard)
+    wall_s = time.perf_counter() - t0
+
+    config = {
+        "dictionary": args.dictionary,
+        "dictionary_sha256": dictionary_checksum(words).hex(),
+        "sample": args.sample,
+        "seed": args.seed,
+        "opener": opener,
+        "opening_book": book is not None,
+        "guesses": args.guesses,
+        "hard_mode": args.hard,
+        "workers": args.workers,
+        "wall_time_s": wall_s,
+    }
+    report = summarize(results, config)
+
+    for path in (args.out_csv, args.out_json):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+    write_csv(args.out_csv, results)
+    with open(args.out_json, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"Games: {report['games']} | solved: {report['solved']} "
+          f"| failure rate: {report['failure_rate']:.2%} | wall: {wall_s:.1f}s")
+    print(f"Guess distribution: {report['guess_distribution']}")
+    print(f"Turn latency (ms): {report['turn_latency_ms']}")
+    print(f"CSV -> {args.out_csv} | JSON -> {args.out_json}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\nComparison with baseline:")
+        print(compare_to_baseline(report, baseline))
+
+
+if __name__ == "__main__":
+    main()
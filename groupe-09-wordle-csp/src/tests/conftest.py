@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Les modules de src/ s'importent entre eux à plat (from csp_solver import ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
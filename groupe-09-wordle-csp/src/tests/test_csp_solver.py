@@ -0,0 +1,61 @@
+import os
+import random
+
+from csp_solver import (
+    WordleConstraints, decode_feedback, encode_words, feedback_matrix,
+    letter_counts, solve_wordle_csp, wordle_feedback_vjg,
+)
+
+WORDS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "wordle.txt")
+
+# Mots à lettres répétées, pour exercer les bornes min/max des doublons
+REPEATED = ["EERIE", "LLAMA", "ALLOT", "SASSY", "GEESE", "MAMMA", "ARRAY", "ABBEY", "EMCEE", "SPEED"]
+
+
+def _words(n=400, seed=0):
+    with open(WORDS_PATH, encoding="utf-8") as f:
+        words = sorted({w.strip().upper() for w in f if len(w.strip()) == 5 and w.strip().isalpha()})
+    return random.Random(seed).sample(words, n) + REPEATED
+
+
+def _reference(words, attempts):
+    return [w for w in words if all(wordle_feedback_vjg(w, g) == fb for g, fb in attempts)]
+
+
+def test_solve_matches_per_word_feedback():
+    words = _words()
+    rng = random.Random(1)
+    for _ in range(300):
+        attempts = []
+        for _ in range(rng.randint(1, 3)):
+            guess = rng.choice(REPEATED) if rng.random() < 0.4 else rng.choice(words)
+            fb = wordle_feedback_vjg(rng.choice(words), guess)
+            if rng.random() < 0.3:
+                # Feedback perturbé : souvent impossible (aucun secret ne le produit)
+                i = rng.randrange(5)
+                fb = fb[:i] + rng.choice("VJG") + fb[i + 1:]
+            attempts.append((guess, fb))
+        assert solve_wordle_csp(words, attempts) == _reference(words, attempts), attempts
+
+
+def test_gray_before_yellow_is_unsatisfiable():
+    words = _words()
+    # L grise en position 1 puis jaune en position 2 : aucun secret ne donne ce feedback
+    attempts = [("ALLOT", "GGJGG")]
+    assert not WordleConstraints.from_attempts(attempts).satisfiable
+    assert solve_wordle_csp(words, attempts) == []
+    assert _reference(words, attempts) == []
+    # L jaune puis grise : possible (une seule L dans le secret, hors position 1)
+    attempts = [("ALLOT", "GJGGG")]
+    assert WordleConstraints.from_attempts(attempts).satisfiable
+    assert solve_wordle_csp(words, attempts) == _reference(words, attempts)
+
+
+def test_feedback_matrix_matches_per_word_feedback():
+    words = _words(200)
+    guesses = words[:60] + REPEATED
+    letters = encode_words(words)
+    codes = feedback_matrix(encode_words(guesses), letters, letter_counts(letters))
+    for i, g in enumerate(guesses):
+        for j, s in enumerate(words):
+            assert decode_feedback(codes[i, j]) == wordle_feedback_vjg(s, g), (s, g)
@@ -0,0 +1,127 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+from csp_solver import WordleSession, hard_mode_guesses, solve_wordle_csp, wordle_feedback_vjg
+
+WORDS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "wordle.txt")
+
+
+def _words(n=600, seed=0):
+    with open(WORDS_PATH, encoding="utf-8") as f:
+        words = sorted({w.strip().upper() for w in f if len(w.strip()) == 5 and w.strip().isalpha()})
+    return random.Random(seed).sample(words, n)
+
+
+def _play(session, rng, words, n_turns):
+    secret = rng.choice(words)
+    for _ in range(n_turns):
+        guess = rng.choice(words)
+        session.add_attempt(guess, wordle_feedback_vjg(secret, guess))
+
+
+def test_candidates_follow_attempts():
+    words = _words()
+    rng = random.Random(1)
+    for _ in range(30):
+        session = WordleSession(words)
+        _play(session, rng, words, rng.randint(1, 4))
+        assert session.candidate_words() == solve_wordle_csp(words, session.attempts)
+
+
+def test_undo_restores_exact_candidates():
+    words = _words()
+    rng = random.Random(2)
+    for _ in range(20):
+        session = WordleSession(words)
+        snapshots = [session.candidates.copy()]
+        secret = rng.choice(words)
+        for _ in range(4):
+            guess = rng.choice(words)
+            session.add_attempt(guess, wordle_feedback_vjg(secret, guess))
+            snapshots.append(session.candidates.copy())
+        for expected in reversed(snapshots[:-1]):
+            assert session.undo()
+            assert np.array_equal(session.candidates, expected)
+        assert not session.undo()
+        assert session.attempts == []
+
+
+def test_reset_restores_full_dictionary():
+    words = _words()
+    session = WordleSession(words)
+    full = session.candidates.copy()
+    _play(session, random.Random(3), words, 3)
+    session.reset()
+    assert session.attempts == []
+    assert np.array_equal(session.candidates, full)
+    # La session reste utilisable après reset
+    session.add_attempt(words[0], wordle_feedback_vjg(words[1], words[0]))
+    assert session.candidate_words() == solve_wordle_csp(words, session.attempts)
+
+
+# ---------------------------------------------------------------------------
+# Mode difficile et guesses autorisés distincts des réponses
+# ---------------------------------------------------------------------------
+def test_hard_mode_pool_matches_hard_mode_guesses():
+    words = _words()
+    rng = random.Random(4)
+    for _ in range(30):
+        session = WordleSession(words, hard_mode=True)
+        secret = rng.choice(words)
+        for _ in range(3):
+            # Guess jouable choisi dans le pool courant
+            guess = session.words[int(rng.choice(session.guess_pool))]
+            session.add_attempt(guess, wordle_feedback_vjg(secret, guess))
+            pool = [session.words[i] for i in session.guess_pool]
+            assert pool == hard_mode_guesses(session.words, session.attempts)
+            assert all(session.allows(w) for w in pool)
+            assert not any(session.allows(w) for w in set(session.words) - set(pool))
+
+
+def test_hard_mode_rejects_and_undo_restores_pool():
+    words = _words()
+    session = WordleSession(words, hard_mode=True)
+    secret = next(w for w in words if w[0] != "S" and "S" not in w[1:])
+    guess = next(w for w in words if w[0] == secret[0] and w != secret)
+    session.add_attempt(guess, wordle_feedback_vjg(secret, guess))
+    before = session.guess_pool.copy()
+
+    # Un guess qui n'a pas la lettre verte en position 0 est refusé, sans effet
+    bad = next(w for w in words if w[0] != secret[0])
+    assert not session.allows(bad)
+    with pytest.raises(ValueError):
+        session.add_attempt(bad, wordle_feedback_vjg(secret, bad))
+    assert len(session.attempts) == 1
+    assert np.array_equal(session.guess_pool, before)
+
+    nxt = session.words[int(session.guess_pool[-1])]
+    session.add_attempt(nxt, wordle_feedback_vjg(secret, nxt))
+    session.undo()
+    assert np.array_equal(session.guess_pool, before)
+    session.reset()
+    assert len(session.guess_pool) == len(session.words)
+
+
+def test_guess_words_never_become_candidates():
+    words = _words()
+    answers, extra = words[:300], words[300:]
+    rng = random.Random(5)
+    for hard in (False, True):
+        session = WordleSession(answers, guess_words=extra + answers[:50], hard_mode=hard)
+        assert session.n_answers == len(answers)
+        assert session.words[:len(answers)] == answers
+        assert len(session.words) == len(answers) + len(extra)
+        secret = rng.choice(answers)
+        for _ in range(3):
+            # Guesses pris hors des réponses : jouables, jamais candidats
+            pool = [session.words[i] for i in session.guess_pool if i >= session.n_answers]
+            if not pool:
+                break
+            guess = rng.choice(pool)
+            session.add_attempt(guess, wordle_feedback_vjg(secret, guess))
+            assert np.all(session.candidates < session.n_answers)
+            assert secret in session.candidate_words()
+            assert session.candidate_words() == solve_wordle_csp(answers, session.attempts)
@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Iterator, Optional
+
+
+# ---------------------------------------------------------------------------
+# Mesure par étape d'un tour de l'agent
+# ---------------------------------------------------------------------------
+# Chaque étape (parsing, extraction LLM, filtrage CSP, ranking, commentaire
+# LLM...) enregistre son temps mur et, si pertinent, le nombre de candidats
+# avant / après. Le type ("cpu" ou "llm") permet de voir d'un coup d'oeil
+# si un tour lent est limité par le calcul ou par le LLM.
+#
+# WORDLE_TRACE_LOG : fichier JSONL où ajouter une ligne par tour ("" = aucun)
+TRACE_LOG_FILE = os.environ.get("WORDLE_TRACE_LOG", "")
+
+_LOG_LOCK = threading.Lock()
+
+
+@dataclass
+class StageTiming:
+    name: str
+    kind: str                                  # "cpu" ou "llm"
+    wall_ms: float = 0.0
+    candidates_before: Optional[int] = None
+    candidates_after: Optional[int] = None
+    info: dict = field(default_factory=dict)   # détails propres à l'étape
+
+
+class TurnTrace:
+    """
+    Trace d'un tour : liste ordonnée de StageTiming.
+
+        trace = TurnTrace(prompt)
+        with trace.stage("filter", candidates_before=len(session)) as st:
+            session.add_attempt(guess, fb)
+            st.candidates_after = len(session)
+        trace.finish()     # ajoute la ligne JSONL si WORDLE_TRACE_LOG est défini
+    """
+
+    def __init__(self, prompt: str = "", log_path: Optional[str] = None):
+        self.prompt = prompt
+        self.started_at = time.time()
+        self.stages = []
+        self.log_path = TRACE_LOG_FILE if log_path is None else log_path
+        self._finished = False
+
+    @contextmanager
+    def stage(self, name: str, kind: str = "cpu", candidates_before: Optional[int] = None):
+        record = StageTiming(name, kind, candidates_before=candidates_before)
+        t0 = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall_ms = (time.perf_counter() - t0) * 1000.0
+            self.stages.append(record)
+
+    def traced(self, name: str, tokens: Iterator[str], kind: str = "llm") -> Iterator[str]:
+        """
+        Enveloppe un générateur (ex. commentaire LLM en streaming) : mesure le
+        délai du premier token et la durée totale, puis termine la trace.
+        """
+        record = StageTiming(name, kind)
+        t0 = time.perf_counter()
+        n_tokens = 0
+        try:
+            for token in tokens:
+                if n_tokens == 0:
+                    record.info["first_token_ms"] = (time.perf_counter() - t0) * 1000.0
+                n_tokens += 1
+                yield token
+        finally:
+            record.wall_ms = (time.perf_counter() - t0) * 1000.0
+            record.info["tokens"] = n_tokens
+            self.stages.append(record)
+            self.finish()
+
+    # -----------------------------------------------------------------------
+    # Synthèse / export
+    # -----------------------------------------------------------------------
+    def total_ms(self, kind: Optional[str] = None) -> float:
+        return sum(s.wall_ms for s in self.stages if kind is None or s.kind == kind)
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "prompt": self.prompt,
+            "total_ms": self.total_ms(),
+            "cpu_ms": self.total_ms("cpu"),
+            "llm_ms": self.total_ms("llm"),
+            "stages": [asdict(s) for s in self.stages],
+        }
+
+    def rows(self) -> list:
+        """Une ligne par étape, prête pour un tableau (Streamlit / pandas)."""
+        return [
+            {
+                "stage": s.name,
+                "kind": s.kind,
+                "wall_ms": round(s.wall_ms, 2),
+                "before": s.candidates_before,
+                "after": s.candidates_after,
+            }
+            for s in self.stages
+        ]
+
+    def finish(self) -> None:
+        """Clôt la trace (une seule fois) et l'ajoute au log JSONL s'il est configuré."""
+        if self._finished:
+            return
+        self._finished = True
+        if not self.log_path:
+            return
+        line = json.dumps(self.to_dict(), ensure_ascii=False)
+        with _LOG_LOCK, open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
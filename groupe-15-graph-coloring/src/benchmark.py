@@ -1,16 +1,23 @@
 from __future__ import annotations
 
 import csv
+import multiprocessing as mp
+import multiprocessing.connection as mp_connection
 import os
 import time
+from collections import deque
 from dataclasses import dataclass
 from typing import Dict, Hashable, List, Optional, Tuple
 
 import networkx as nx
+import numpy as np
 
-from instances import load_instance
-from heuristics import greedy_coloring, dsatur_coloring
-from solve_coloring import solve_min_coloring
+from clique import max_clique
+from graph_core import CSRGraph
+from instances import DEFAULT_CACHE_DIR, load_instance
+from heuristics import greedy_coloring, dsatur_coloring, dsatur_colors, dsatur_coloring_reference
+from local_search import local_search_coloring
+from solve_coloring import ENCODINGS, SYMMETRY_MODES, solve_min_coloring, solve_min_coloring_opt
 
 Node = Hashable
 
@@ -30,6 +37,7 @@ class BenchRow:
     time_s: float
     status: str
     k_found: Optional[int]
+    chromatic: Optional[int] = None   # nombre chromatique connu de l’instance
 
 # --------------------------------------------------------------------
 # Vérifie qu’une coloration est valide :
@@ -55,174 +63,521 @@ def ensure_parent_dir(path: str) -> None:
     if folder:
         os.makedirs(folder, exist_ok=True)
 
+BENCH_METHODS = ("greedy", "dsatur", "tabu", "hybrid", "cp_min", "cp_opt")
+
+# --------------------------------------------------------------------
+# Variantes des méthodes CP : (encodage, bris de symétrie), voir
+# solve_coloring._ColorModel. Dans le CSV, la variante par défaut garde
+# le nom de la méthode ("cp_min"), les autres sont notées
+# "cp_min[bool,precedence]" : les campagnes existantes restent reprenables.
+# --------------------------------------------------------------------
+CP_METHODS = ("cp_min", "cp_opt")
+DEFAULT_CP_VARIANT = ("int", "clique")
+
+
+def cp_method_name(method: str, encoding: str, symmetry: str) -> str:
+    if method not in CP_METHODS or (encoding, symmetry) == DEFAULT_CP_VARIANT:
+        return method
+    return f"{method}[{encoding},{symmetry}]"
+
+
+def parse_method(name: str) -> Tuple[str, str, str]:
+    # "cp_opt[bool,precedence]" -> ("cp_opt", "bool", "precedence")
+    if not name.endswith("]") or "[" not in name:
+        return (name,) + DEFAULT_CP_VARIANT
+    method, variant = name[:-1].split("[", 1)
+    encoding, symmetry = variant.split(",")
+    if encoding not in ENCODINGS or symmetry not in SYMMETRY_MODES:
+        raise ValueError(f"Variante CP inconnue: {name}")
+    return method, encoding, symmetry
+
+CSV_HEADER = [
+    "instance", "family", "params", "seed", "method",
+    "colors_used", "valid", "time_s", "status", "k_found", "chromatic",
+]
+
+# --------------------------------------------------------------------
+# Paramètres des solveurs, communs à toutes les tâches d’une campagne
+# -cp_workers : threads CP-SAT par tâche (les cœurs sont partagés entre
+#               les tâches exécutées en parallèle)
+# -timeout_local / local_seed : budget et graine de tabu / hybrid
+# -cache_dir : cache disque des instances (None = régénérées à chaque tâche)
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class BenchConfig:
+    timeout_cp_min: float = 2.0
+    timeout_cp_opt: float = 10.0
+    kmax: Optional[int] = None
+    strategy: str = "ascending"
+    cp_workers: int = 8
+    timeout_local: float = 10.0
+    local_seed: int = 0
+    cache_dir: Optional[str] = None
+
+# --------------------------------------------------------------------
+# Une tâche = une instance (famille + paramètres) x une méthode.
+# (family, params, seed, method) identifie la ligne dans le CSV : c’est
+# la clé utilisée pour reprendre une campagne interrompue.
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class BenchTask:
+    family: str
+    params: str
+    seed: int
+    method: str
+    kwargs: Tuple[Tuple[str, object], ...] = ()   # arguments de load_instance
+
+    @property
+    def key(self) -> Tuple[str, str, str, str]:
+        return (self.family, self.params, str(self.seed), self.method)
+
+# --------------------------------------------------------------------
+# Exécute une méthode sur un graphe : (coloration, statut, k trouvé)
+# -cp_min : recherche de k (stratégie ascending/descending/bisection),
+#           timeout par valeur de k
+# -cp_opt : un seul modèle (minimise le nombre de couleurs, hint DSATUR),
+#           budget total timeout_cp_opt
+# -tabu / hybrid : recherche locale depuis DSATUR, budget timeout_local
+# cp_min / cp_opt partent de la plus grande clique trouvée (k_min et bris
+# de symétrie), tabu / hybrid s’arrêtent dès sa taille atteinte.
+# `method` peut porter une variante CP : "cp_opt[bool,precedence]".
+# Les heuristiques travaillent sur le graphe compact `csr` s’il est fourni
+# (instances DIMACS / plantées), sans reconversion depuis networkx.
+# --------------------------------------------------------------------
+def solve_with(
+    G: nx.Graph,
+    method: str,
+    cfg: BenchConfig,
+    csr: Optional[CSRGraph] = None,
+) -> Tuple[Optional[Dict[Node, int]], str, Optional[int]]:
+    method, encoding, symmetry = parse_method(method)
+    if method == "greedy":
+        return greedy_coloring(G if csr is None else csr), "OK", None
+    if method == "dsatur":
+        return dsatur_coloring(G if csr is None else csr), "OK", None
+    cq = max_clique(G if csr is None else csr)
+    if method in ("tabu", "hybrid"):
+        best_k, coloring, info = local_search_coloring(
+            G if csr is None else csr,
+            method,
+            time_budget_s=cfg.timeout_local,
+            seed=cfg.local_seed,
+            k_min=max(1, cq.size),
+        )
+        return coloring, info.status, best_k
+    if method == "cp_min":
+        best_k, coloring, log = solve_min_coloring(
+            nodes=list(G.nodes()),
+            edges=list(G.edges()),
+            k_min=max(1, cq.size),
+            k_max=cfg.kmax,
+            timeout_per_k_s=cfg.timeout_cp_min,
+            num_workers=cfg.cp_workers,
+            strategy=cfg.strategy,
+            clique=cq.clique,
+            encoding=encoding,
+            symmetry=symmetry,
+        )
+        return coloring, "FOUND" if coloring is not None else "NOT_FOUND", best_k
+    if method == "cp_opt":
+        best_k, coloring, info = solve_min_coloring_opt(
+            nodes=list(G.nodes()),
+            edges=list(G.edges()),
+            k_min=max(1, cq.size),
+            k_max=cfg.kmax,
+            timeout_s=cfg.timeout_cp_opt,
+            num_workers=cfg.cp_workers,
+            clique=cq.clique,
+            encoding=encoding,
+            symmetry=symmetry,
+        )
+        return coloring, info.status, best_k
+    raise ValueError(f"Méthode inconnue: {method}")
+
+# --------------------------------------------------------------------
+# Grille des tâches : instances x méthodes (x seeds pour Erdos et les
+# colorations plantées). Familles de référence, à nombre chromatique
+# connu : queen (w, h), mycielski (k), planted (n, k, p) ; fichiers
+# DIMACS (.col) en plus si fournis. cp_min / cp_opt donnent une tâche
+# par variante de `cp_variants`.
+# --------------------------------------------------------------------
+def build_tasks(
+    methods: List[str],
+    seeds: List[int],
+    erdos_sizes: List[int],
+    erdos_ps: List[float],
+    grids: List[Tuple[int, int]],
+    include_map_like: bool = True,
+    queens: List[Tuple[int, int]] = [],
+    mycielskis: List[int] = [],
+    planted: List[Tuple[int, int, float]] = [],
+    dimacs_files: List[str] = [],
+    cp_variants: List[Tuple[str, str]] = [DEFAULT_CP_VARIANT],
+) -> List[BenchTask]:
+    instances: List[Tuple[str, str, int, Tuple[Tuple[str, object], ...]]] = []
+    # 1) Instance map_like
+    if include_map_like:
+        instances.append(("map_like", "", 0, ()))
+    # 2) Grilles (grid)
+    for (w, h) in grids:
+        instances.append(("grid", f"w={w};h={h}", 0, (("w", w), ("h", h))))
+    # 3) Graphes d'Erdos
+    for n in erdos_sizes:
+        for p in erdos_ps:
+            for seed in seeds:
+                instances.append(("erdos", f"n={n};p={p}", seed, (("n", n), ("p", p), ("seed", seed))))
+    # 4) Graphes des dames
+    for (w, h) in queens:
+        instances.append(("queen", f"w={w};h={h}", 0, (("w", w), ("h", h))))
+    # 5) Graphes de Mycielski
+    for k in mycielskis:
+        instances.append(("mycielski", f"k={k}", 0, (("k", k),)))
+    # 6) Colorations plantées
+    for (n, k, p) in planted:
+        for seed in seeds:
+            instances.append(("planted", f"n={n};k={k};p={p}", seed,
+                              (("n", n), ("k", k), ("p", p), ("seed", seed))))
+    # 7) Fichiers DIMACS
+    for path in dimacs_files:
+        instances.append(("dimacs", f"path={path}", 0, (("path", path),)))
+
+    names: List[str] = []
+    for method in methods:
+        if method in CP_METHODS:
+            names.extend(cp_method_name(method, e, s) for e, s in cp_variants)
+        elif method in BENCH_METHODS:
+            names.append(method)
+    return [
+        BenchTask(family, params, seed, name, kwargs)
+        for family, params, seed, kwargs in instances
+        for name in names
+    ]
+
+# --------------------------------------------------------------------
+# Exécution d’une tâche (dans un processus dédié)
+# Le nom de l’instance (et son nombre chromatique connu) est envoyé dès
+# qu’elle est générée, pour que la ligne TIMEOUT éventuelle soit tout de
+# même identifiable.
+# --------------------------------------------------------------------
+def run_task(task: BenchTask, cfg: BenchConfig, conn=None) -> BenchRow:
+    inst = load_instance(task.family, **dict(task.kwargs), cache_dir=cfg.cache_dir)
+    if conn is not None:
+        conn.send(("start", (inst.name, inst.chromatic)))
+    G = inst.graph
+
+    t0 = time.perf_counter()
+    coloring, status, k_found = solve_with(G, task.method, cfg, csr=inst.csr)
+    dt = time.perf_counter() - t0
+
+    valid = coloring is not None and is_valid_coloring(G, coloring)
+    used = colors_used(coloring) if coloring is not None else 0
+    return BenchRow(
+        instance=inst.name,
+        family=task.family,
+        params=task.params,
+        seed=task.seed,
+        method=task.method,
+        colors_used=used,
+        valid=valid,
+        time_s=dt,
+        status=status,
+        k_found=k_found,
+        chromatic=inst.chromatic,
+    )
+
+
+def _task_process(task: BenchTask, cfg: BenchConfig, conn) -> None:
+    try:
+        conn.send(("done", run_task(task, cfg, conn)))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+# --------------------------------------------------------------------
+# CSV : lecture (reprise) et ajout ligne par ligne
+# --------------------------------------------------------------------
+def read_rows(path: str) -> List[BenchRow]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        return [
+            BenchRow(
+                instance=r["instance"],
+                family=r["family"],
+                params=r["params"],
+                seed=int(r["seed"]),
+                method=r["method"],
+                colors_used=int(r["colors_used"]),
+                valid=r["valid"] == "1",
+                time_s=float(r["time_s"]),
+                status=r["status"],
+                k_found=int(r["k_found"]) if r["k_found"] else None,
+                chromatic=int(r["chromatic"]) if r.get("chromatic") else None,
+            )
+            for r in csv.DictReader(f)
+        ]
+
+
+def append_row(path: str, row: BenchRow) -> None:
+    # En-tête écrit seulement si le fichier est nouveau (ou vide)
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        if new_file:
+            w.writerow(CSV_HEADER)
+        w.writerow([
+            row.instance, row.family, row.params, row.seed, row.method,
+            row.colors_used, int(row.valid), f"{row.time_s:.6f}", row.status,
+            "" if row.k_found is None else row.k_found,
+            "" if row.chromatic is None else row.chromatic,
+        ])
+        f.flush()
+
+
+def _upgrade_csv(path: str) -> None:
+    # CSV d’une version précédente (colonnes différentes) : réécrit avec
+    # l’en-tête courant avant d’y ajouter de nouvelles lignes
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), [])
+    if header == CSV_HEADER:
+        return
+    rows = read_rows(path)
+    os.remove(path)
+    for row in rows:
+        append_row(path, row)
+
+# --------------------------------------------------------------------
+# Exécution parallèle : au plus `jobs` processus, un par tâche.
+# Une tâche qui dépasse task_timeout_s est tuée (ligne TIMEOUT) ; un
+# processus qui meurt sans réponse donne une ligne CRASHED.
+# --------------------------------------------------------------------
+def _failed_row(task: BenchTask, started: Tuple[str, Optional[int]], status: str, dt: float) -> BenchRow:
+    name, chromatic = started
+    return BenchRow(name, task.family, task.params, task.seed, task.method, 0, False, dt, status, None, chromatic)
+
+
+def run_tasks(
+    tasks: List[BenchTask],
+    cfg: BenchConfig,
+    out_csv: str,
+    jobs: int = 1,
+    task_timeout_s: float = 120.0,
+    verbose: bool = True,
+) -> List[BenchRow]:
+    ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+    pending = deque(tasks)
+    running: Dict[object, list] = {}   # conn -> [task, process, t0, (nom d’instance, nb chromatique)]
+    rows: List[BenchRow] = []
+
+    def finish(conn, row: BenchRow) -> None:
+        task, proc, _, _ = running.pop(conn)
+        proc.join(timeout=1.0)
+        if proc.is_alive():
+            proc.kill()
+        conn.close()
+        append_row(out_csv, row)
+        rows.append(row)
+        if verbose:
+            print(f"[{len(rows)}/{len(tasks)}] {row.instance or task.family} | {row.method} "
+                  f"| {row.status} | colors={row.colors_used}"
+                  f"{'' if row.chromatic is None else f' (chi={row.chromatic})'} | {row.time_s:.2f}s")
+
+    while pending or running:
+        while pending and len(running) < jobs:
+            task = pending.popleft()
+            recv, send = ctx.Pipe(duplex=False)
+            proc = ctx.Process(target=_task_process, args=(task, cfg, send), daemon=True)
+            proc.start()
+            send.close()
+            running[recv] = [task, proc, time.perf_counter(), ("", None)]
+
+        for conn in mp_connection.wait(list(running), timeout=0.2):
+            task, proc, t0, _ = running[conn]
+            try:
+                kind, payload = conn.recv()
+            except (EOFError, OSError):
+                finish(conn, _failed_row(task, running[conn][3], "CRASHED", time.perf_counter() - t0))
+                continue
+            if kind == "start":
+                running[conn][3] = payload
+            elif kind == "done":
+                finish(conn, payload)
+            else:
+                if verbose:
+                    print(f"Erreur ({task.family} {task.params} {task.method}) : {payload}")
+                finish(conn, _failed_row(task, running[conn][3], "ERROR", time.perf_counter() - t0))
+
+        # Timeout dur : le processus est tué
+        now = time.perf_counter()
+        for conn, (task, proc, t0, started) in list(running.items()):
+            if now - t0 > task_timeout_s:
+                proc.kill()
+                finish(conn, _failed_row(task, started, "TIMEOUT", now - t0))
+
+    return rows
+
 # --------------------------------------------------------------------
 # Lance une campagne complète de benchmarks sur différentes instances
-# et différentes méthodes, puis écrit les résultats dans un CSV
+# et différentes méthodes. Chaque ligne est ajoutée au CSV dès que sa
+# tâche se termine ; relancée avec le même CSV, la campagne saute les
+# tâches déjà présentes (reprise après interruption).
 # --------------------------------------------------------------------
 def run_benchmark(
     out_csv: str = "outputs/benchmark.csv",
     seeds: List[int] = [1, 2, 3],
-    methods: List[str] = ["greedy", "dsatur", "cp_min"],
+    methods: List[str] = ["greedy", "dsatur", "tabu", "hybrid", "cp_min", "cp_opt"],
 
     # Paramètres des graphes testés
     erdos_sizes: List[int] = [30, 50, 80],
     erdos_ps: List[float] = [0.10, 0.20, 0.30],
     grids: List[Tuple[int, int]] = [(8, 8), (12, 12)],
     
+    # Familles de référence (nombre chromatique connu) et fichiers DIMACS
+    queens: List[Tuple[int, int]] = [(5, 5), (6, 6), (7, 7), (8, 8)],
+    mycielskis: List[int] = [4, 5, 6],
+    planted: List[Tuple[int, int, float]] = [(100, 4, 0.2), (150, 6, 0.3)],
+    dimacs_files: List[str] = [],
+
     include_map_like: bool = True,
     timeout_cp_min: float = 2.0,
     kmax: Optional[int] = None,
+    timeout_cp_opt: Optional[float] = None,   # défaut : 5 x timeout_cp_min
+    timeout_local: Optional[float] = None,    # tabu / hybrid, défaut : timeout_cp_opt
+    local_seed: int = 0,                      # graine de tabu / hybrid
+    strategy: str = "ascending",              # recherche de k pour cp_min
+    cp_variants: List[Tuple[str, str]] = [(e, s) for e in ENCODINGS for s in ("clique", "precedence")],
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,  # instances générées une fois pour toute la campagne
+
+    # Exécution
+    jobs: Optional[int] = None,               # tâches en parallèle (défaut : nb de cœurs)
+    task_timeout_s: float = 120.0,            # timeout dur par tâche
+    resume: bool = True,                      # saute les tâches déjà dans le CSV
+    verbose: bool = True,
 ) -> List[BenchRow]:
-    # Liste qui contiendra toutes les lignes du benchmark
-    rows: List[BenchRow] = []
+    if timeout_cp_opt is None:
+        timeout_cp_opt = 5 * timeout_cp_min
+    if timeout_local is None:
+        timeout_local = timeout_cp_opt
 
-    # 1) Instance map_like
-    if include_map_like:
-        inst = load_instance("map_like")
-        G = inst.graph
-        for method in methods:
+    # Répartition des cœurs : chaque tâche CP-SAT reçoit sa part
+    cpus = os.cpu_count() or 1
+    jobs = max(1, int(jobs if jobs is not None else cpus))
+    cfg = BenchConfig(
+        timeout_cp_min=timeout_cp_min,
+        timeout_cp_opt=timeout_cp_opt,
+        kmax=kmax,
+        strategy=strategy,
+        cp_workers=max(1, cpus // jobs),
+        timeout_local=timeout_local,
+        local_seed=local_seed,
+        cache_dir=cache_dir,
+    )
+
+    tasks = build_tasks(methods, seeds, erdos_sizes, erdos_ps, grids, include_map_like,
+                        queens, mycielskis, planted, dimacs_files, cp_variants)
+    ensure_parent_dir(out_csv)
+    if not resume and os.path.exists(out_csv):
+        os.remove(out_csv)
+    _upgrade_csv(out_csv)
+    done = {(r.family, r.params, str(r.seed), r.method) for r in read_rows(out_csv)}
+    todo = [t for t in tasks if t.key not in done]
+    if verbose:
+        print(f"{len(tasks)} tâches, {len(tasks) - len(todo)} déjà dans {out_csv}, "
+              f"{jobs} en parallèle x {cfg.cp_workers} worker(s) CP-SAT")
+
+    run_tasks(todo, cfg, out_csv, jobs=jobs, task_timeout_s=task_timeout_s, verbose=verbose)
+    return read_rows(out_csv)
+
+# --------------------------------------------------------------------
+# Meilleure variante CP par famille d’instances et par méthode :
+# moins de couleurs en moyenne (une coloration invalide ou absente,
+# TIMEOUT compris, compte comme +infini), puis temps moyen.
+# Retourne {(famille, méthode): (variante, couleurs moy., temps moy.)}.
+# --------------------------------------------------------------------
+def best_cp_variants(rows: List[BenchRow]) -> Dict[Tuple[str, str], Tuple[str, float, float]]:
+    groups: Dict[Tuple[str, str, str], List[BenchRow]] = {}
+    for r in rows:
+        method, encoding, symmetry = parse_method(r.method)
+        if method in CP_METHODS:
+            groups.setdefault((r.family, method, f"{encoding},{symmetry}"), []).append(r)
+
+    best: Dict[Tuple[str, str], Tuple[str, float, float]] = {}
+    for (family, method, variant), rs in groups.items():
+        colors = float(np.mean([r.colors_used if r.valid else np.inf for r in rs]))
+        t = float(np.mean([r.time_s for r in rs]))
+        cur = best.get((family, method))
+        if cur is None or (colors, t) < (cur[1], cur[2]):
+            best[(family, method)] = (variant, colors, t)
+    return best
+
+
+# --------------------------------------------------------------------
+# Courbe de passage à l’échelle de DSATUR sur des graphes aléatoires de
+# degré moyen fixé, n croissant :
+# -heap : dsatur_colors sur le CSR (file de priorité), pour tout n
+# -nx   : dsatur_coloring(G), même code appelé depuis nx.Graph (conversion
+#         CSR comprise), comparé à l’implémentation d’origine
+#         dsatur_coloring_reference (max() sur les non coloriés, O(n²)),
+#         seulement jusqu’à ref_max_n (trop lente au-delà)
+# --------------------------------------------------------------------
+def run_dsatur_scaling(
+    out_csv: str = "outputs/dsatur_scaling.csv",
+    sizes: List[int] = [1_000, 2_000, 5_000, 10_000, 20_000, 50_000, 100_000, 200_000],
+    avg_degree: float = 10.0,
+    seed: int = 0,
+    ref_max_n: int = 10_000,
+) -> List[dict]:
+    rows: List[dict] = []
+    rng = np.random.default_rng(seed)
+    for n in sizes:
+        m = int(n * avg_degree / 2)
+        g = CSRGraph.from_edges(n, rng.integers(0, n, m), rng.integers(0, n, m))
+
+        t0 = time.perf_counter()
+        heap_colors = dsatur_colors(g)
+        t_heap = time.perf_counter() - t0
+
+        t_nx, t_ref, colors_ref, same = None, None, None, None
+        if n <= ref_max_n:
+            G = g.to_networkx()
             t0 = time.perf_counter()
-            status = "OK"
-            k_found = None
-
-            # Sélection de la méthode
-            if method == "greedy":
-                coloring = greedy_coloring(G)
-            elif method == "dsatur":
-                coloring = dsatur_coloring(G)
-            elif method == "cp_min":
-                best_k, coloring, log = solve_min_coloring(
-                    nodes=list(G.nodes()),
-                    edges=list(G.edges()),
-                    k_max=kmax,
-                    timeout_per_k_s=timeout_cp_min,
-                )
-                k_found = best_k
-                status = "FOUND" if coloring is not None else "NOT_FOUND"
-            else:
-                continue
+            nx_coloring = dsatur_coloring(G)
+            t_nx = time.perf_counter() - t0
 
-            dt = time.perf_counter() - t0
-            valid = coloring is not None and is_valid_coloring(G, coloring)
-            used = colors_used(coloring) if coloring is not None else 0
-
-            # Ajout d’une ligne de benchmark
-            rows.append(BenchRow(
-                instance=inst.name,
-                family="map_like",
-                params="",
-                seed=0,
-                method=method,
-                colors_used=used,
-                valid=valid,
-                time_s=dt,
-                status=status,
-                k_found=k_found,
-            ))
-
-     # 2) Grilles (grid)
-    for (w, h) in grids:
-        inst = load_instance("grid", w=w, h=h)
-        G = inst.graph
-        for method in methods:
             t0 = time.perf_counter()
-            status = "OK"
-            k_found = None
-
-            if method == "greedy":
-                coloring = greedy_coloring(G)
-            elif method == "dsatur":
-                coloring = dsatur_coloring(G)
-            elif method == "cp_min":
-                best_k, coloring, log = solve_min_coloring(
-                    nodes=list(G.nodes()),
-                    edges=list(G.edges()),
-                    k_max=kmax,
-                    timeout_per_k_s=timeout_cp_min,
-                )
-                k_found = best_k
-                status = "FOUND" if coloring is not None else "NOT_FOUND"
-            else:
-                continue
+            ref = dsatur_coloring_reference(G)
+            t_ref = time.perf_counter() - t0
+            colors_ref = max(ref.values()) + 1 if ref else 0
+            # Sommets 0..n-1 dans l’ordre : mêmes départages, même coloration
+            same = ref == nx_coloring
 
-            dt = time.perf_counter() - t0
-            valid = coloring is not None and is_valid_coloring(G, coloring)
-            used = colors_used(coloring) if coloring is not None else 0
-
-            rows.append(BenchRow(
-                instance=inst.name,
-                family="grid",
-                params=f"w={w};h={h}",
-                seed=0,
-                method=method,
-                colors_used=used,
-                valid=valid,
-                time_s=dt,
-                status=status,
-                k_found=k_found,
-            ))
+        rows.append({
+            "n": n,
+            "m": g.m,
+            "colors_used": int(heap_colors.max()) + 1 if n else 0,
+            "colors_ref": colors_ref,
+            "same_coloring": same,
+            "time_heap_s": t_heap,
+            "time_nx_s": t_nx,
+            "time_ref_s": t_ref,
+            "speedup": (t_ref / t_nx) if t_ref and t_nx > 0 else None,
+        })
 
-    # 3) Graphes d'Erdos
-    for n in erdos_sizes:
-        for p in erdos_ps:
-            for seed in seeds:
-                inst = load_instance("erdos", n=n, p=p, seed=seed)
-                G = inst.graph
-
-                for method in methods:
-                    t0 = time.perf_counter()
-                    status = "OK"
-                    k_found = None
-
-                    if method == "greedy":
-                        coloring = greedy_coloring(G)
-                    elif method == "dsatur":
-                        coloring = dsatur_coloring(G)
-                    elif method == "cp_min":
-                        best_k, coloring, log = solve_min_coloring(
-                            nodes=list(G.nodes()),
-                            edges=list(G.edges()),
-                            k_max=kmax,
-                            timeout_per_k_s=timeout_cp_min,
-                        )
-                        k_found = best_k
-                        status = "FOUND" if coloring is not None else "NOT_FOUND"
-                    else:
-                        continue
-
-                    dt = time.perf_counter() - t0
-                    valid = coloring is not None and is_valid_coloring(G, coloring)
-                    used = colors_used(coloring) if coloring is not None else 0
-
-                    rows.append(BenchRow(
-                        instance=inst.name,
-                        family="erdos",
-                        params=f"n={n};p={p}",
-                        seed=seed,
-                        method=method,
-                        colors_used=used,
-                        valid=valid,
-                        time_s=dt,
-                        status=status,
-                        k_found=k_found,
-                    ))
-
-    # 4) Écriture du CSV
     ensure_parent_dir(out_csv)
     with open(out_csv, "w", newline="", encoding="utf-8") as f:
         w = csv.writer(f)
-
-        # En-tête
-        w.writerow([
-            "instance", "family", "params", "seed", "method",
-            "colors_used", "valid", "time_s", "status", "k_found"
-        ])
-        # Lignes de résultats
+        w.writerow(["n", "m", "colors_used", "colors_ref", "same_coloring", "time_heap_s", "time_nx_s", "time_ref_s", "speedup"])
         for r in rows:
             w.writerow([
-                r.instance, r.family, r.params, r.seed, r.method,
-                r.colors_used, int(r.valid), f"{r.time_s:.6f}", r.status,
-                "" if r.k_found is None else r.k_found
+                r["n"], r["m"], r["colors_used"],
+                "" if r["colors_ref"] is None else r["colors_ref"],
+                "" if r["same_coloring"] is None else r["same_coloring"],
+                f"{r['time_heap_s']:.6f}",
+                "" if r["time_nx_s"] is None else f"{r['time_nx_s']:.6f}",
+                "" if r["time_ref_s"] is None else f"{r['time_ref_s']:.6f}",
+                "" if r["speedup"] is None else f"{r['speedup']:.2f}",
             ])
-
     return rows
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from graph_core import CSRGraph, as_csr
+
+Node = Hashable
+
+# Budget par défaut de la recherche exacte (secondes)
+CLIQUE_TIME_BUDGET_S = 1.0
+
+# Nombre de sommets de départ essayés par l’heuristique gloutonne
+GREEDY_TRIES = 64
+
+# --------------------------------------------------------------------
+# Ordre de dégénérescence (Batagelj & Zaversnik, O(n + m)) :
+# on retire à chaque étape un sommet de degré minimum. core[v] est le
+# degré de v au moment de son retrait (nombre de cœur) ; les voisins de
+# v retirés après lui, N+(v), sont au plus core[v]. Toute clique est
+# contenue dans {v} ∪ N+(v) pour son premier sommet v dans cet ordre.
+# --------------------------------------------------------------------
+def degeneracy_order(g: CSRGraph) -> Tuple[np.ndarray, np.ndarray]:
+    n = g.n
+    indptr = g.indptr.tolist()
+    indices = g.indices.tolist()
+    deg = g.degrees().tolist()
+    md = max(deg, default=0)
+
+    # Sommets triés par degré, bin[d] = début des sommets de degré d
+    counts = [0] * (md + 1)
+    for d in deg:
+        counts[d] += 1
+    bin_start = [0] * (md + 1)
+    s = 0
+    for d in range(md + 1):
+        bin_start[d] = s
+        s += counts[d]
+    pos = [0] * n
+    vert = [0] * n
+    nxt = bin_start[:]
+    for v in range(n):
+        pos[v] = nxt[deg[v]]
+        vert[pos[v]] = v
+        nxt[deg[v]] += 1
+
+    for i in range(n):
+        v = vert[i]
+        dv = deg[v]
+        for u in indices[indptr[v]:indptr[v + 1]]:
+            du = deg[u]
+            if du > dv:
+                # u passe en tête de son groupe puis descend d’un degré
+                pu, pw = pos[u], bin_start[du]
+                w = vert[pw]
+                if u != w:
+                    vert[pu], vert[pw] = w, u
+                    pos[u], pos[w] = pw, pu
+                bin_start[du] += 1
+                deg[u] = du - 1
+    return np.array(vert, dtype=np.int64), np.array(deg, dtype=np.int64)
+
+# --------------------------------------------------------------------
+# Sous-graphe local en bitsets (entiers Python) : sommets S, bit j de
+# adj[i] = arête entre S[i] et S[j]. Sert à la fois à l’heuristique
+# gloutonne et au branch-and-bound. Listes Python plutôt que tableaux
+# NumPy : un appel par sommet, sur de petits voisinages.
+# --------------------------------------------------------------------
+def _forward_neighbors(g: CSRGraph, order: np.ndarray) -> List[List[int]]:
+    # N+(v) : voisins de v retirés après lui dans l’ordre de dégénérescence
+    rank = np.empty(g.n, dtype=np.int64)
+    rank[order] = np.arange(g.n)
+    indptr = g.indptr.tolist()
+    indices = g.indices.tolist()
+    rank_l = rank.tolist()
+    return [[u for u in indices[indptr[v]:indptr[v + 1]] if rank_l[u] > rank_l[v]] for v in range(g.n)]
+
+
+def _local_bitsets(fwd: List[List[int]], S: List[int]) -> List[int]:
+    # Les arêtes de S se lisent dans fwd (chacune y figure dans un sens)
+    local = {v: i for i, v in enumerate(S)}
+    adj = [0] * len(S)
+    for i, v in enumerate(S):
+        for u in fwd[v]:
+            j = local.get(u)
+            if j is not None:
+                adj[i] |= 1 << j
+                adj[j] |= 1 << i
+    return adj
+
+
+def _bits(x: int) -> List[int]:
+    out = []
+    while x:
+        low = x & -x
+        out.append(low.bit_length() - 1)
+        x ^= low
+    return out
+
+
+def _greedy_local(adj: List[int], P: int) -> List[int]:
+    # Ajoute à chaque étape le candidat qui garde le plus de candidats
+    clique = []
+    while P:
+        v = max(_bits(P), key=lambda u: (adj[u] & P).bit_count())
+        clique.append(v)
+        P &= adj[v]
+    return clique
+
+
+class _Timeout(Exception):
+    pass
+
+# --------------------------------------------------------------------
+# Branch-and-bound MCQ (Tomita) en bitsets : les candidats P sont
+# coloriés gloutonnement ; un sommet de couleur c ne peut compléter la
+# clique courante que de c sommets au plus, d’où l’élagage
+# |R| + c <= meilleure taille connue.
+# --------------------------------------------------------------------
+class _MaxClique:
+    def __init__(self, best: int, deadline: float):
+        self.best = best
+        self.best_clique: Optional[List[int]] = None
+        self.deadline = deadline
+        self.nodes = 0
+
+    def _color_sort(self, adj: List[int], P: int):
+        order, bounds = [], []
+        color = 0
+        while P:
+            color += 1
+            Q = P
+            while Q:
+                low = Q & -Q
+                v = low.bit_length() - 1
+                Q &= ~adj[v] & ~low
+                P ^= low
+                order.append(v)
+                bounds.append(color)
+        return order, bounds
+
+    def expand(self, adj: List[int], R: List[int], P: int) -> None:
+        self.nodes += 1
+        if self.nodes % 1024 == 0 and time.perf_counter() > self.deadline:
+            raise _Timeout()
+        order, bounds = self._color_sort(adj, P)
+        for i in range(len(order) - 1, -1, -1):
+            if len(R) + bounds[i] <= self.best:
+                return
+            v = order[i]
+            R.append(v)
+            newP = P & adj[v]
+            if newP:
+                self.expand(adj, R, newP)
+            elif len(R) > self.best:
+                self.best = len(R)
+                self.best_clique = R[:]
+            R.pop()
+            P &= ~(1 << v)
+
+# --------------------------------------------------------------------
+# Résultat et cache : la clique trouvée pour un graphe est mémorisée
+# sous l’empreinte de sa représentation CSR (blake2b) et réutilisée
+# tant que le budget demandé ne dépasse pas celui déjà dépensé
+# (ou que la clique est prouvée maximum).
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class CliqueResult:
+    clique: List[Node]
+    exact: bool                 # True : clique maximum prouvée
+    time_s: float
+    nodes: int                  # noeuds explorés par le branch-and-bound
+    budget_s: float
+
+    @property
+    def size(self) -> int:
+        return len(self.clique)
+
+
+_CACHE: Dict[bytes, CliqueResult] = {}
+
+
+def graph_key(g: CSRGraph) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.ascontiguousarray(g.indptr, dtype=np.int64).tobytes())
+    h.update(np.ascontiguousarray(g.indices, dtype=np.int32).tobytes())
+    h.update(repr(g.nodes).encode("utf-8", "replace"))
+    return h.digest()
+
+
+def greedy_clique(g: CSRGraph, tries: int = GREEDY_TRIES) -> np.ndarray:
+    """
+    Clique gloutonne : depuis les `tries` derniers sommets de l’ordre de
+    dégénérescence (cœurs les plus denses), extension dans N+(v).
+    """
+    if g.n == 0:
+        return np.zeros(0, dtype=np.int64)
+    order, _ = degeneracy_order(g)
+    return np.array(_greedy_from_order(_forward_neighbors(g, order), order, tries), dtype=np.int64)
+
+
+def _greedy_from_order(fwd: List[List[int]], order: np.ndarray, tries: int) -> List[int]:
+    best = [int(order[-1])]
+    for v in order[::-1][:tries].tolist():
+        S = fwd[v]
+        if len(S) + 1 <= len(best):
+            continue
+        local = _greedy_local(_local_bitsets(fwd, S), (1 << len(S)) - 1)
+        if len(local) + 1 > len(best):
+            best = [v] + [S[i] for i in local]
+    return best
+
+
+def max_clique_indices(g: CSRGraph, time_budget_s: float = CLIQUE_TIME_BUDGET_S) -> Tuple[np.ndarray, bool, int]:
+    """
+    Plus grande clique (indices CSR), bornée en temps : clique gloutonne,
+    puis branch-and-bound dans chaque {v} ∪ N+(v), en commençant par les
+    cœurs les plus denses ; un sommet est sauté si |N+(v)| + 1 ne dépasse
+    pas la meilleure taille, et la recherche s’arrête dès que celle-ci
+    atteint dégénérescence + 1. Retourne (clique, prouvée maximum, noeuds).
+    """
+    if g.n == 0:
+        return np.zeros(0, dtype=np.int64), True, 0
+    deadline = time.perf_counter() + time_budget_s
+    order, core = degeneracy_order(g)
+    fwd = _forward_neighbors(g, order)
+    best = _greedy_from_order(fwd, order, GREEDY_TRIES)
+    bound = int(core.max()) + 1
+
+    search = _MaxClique(len(best), deadline)
+    try:
+        for v in order[::-1].tolist():
+            if search.best >= bound:
+                break
+            S = fwd[v]
+            if len(S) + 1 <= search.best:
+                continue
+            search.best -= 1          # taille cherchée dans N+(v), sans v
+            search.best_clique = None
+            search.expand(_local_bitsets(fwd, S), [], (1 << len(S)) - 1)
+            search.best += 1
+            if search.best_clique is not None:
+                best = [v] + [S[i] for i in search.best_clique]
+    except _Timeout:
+        # Clique améliorée dans le voisinage en cours avant l’interruption
+        if search.best_clique is not None:
+            best = [v] + [S[i] for i in search.best_clique]
+        return np.array(best, dtype=np.int64), False, search.nodes
+    return np.array(best, dtype=np.int64), True, search.nodes
+
+
+def max_clique(G, time_budget_s: float = CLIQUE_TIME_BUDGET_S, use_cache: bool = True) -> CliqueResult:
+    """
+    Clique la plus grande trouvée dans le budget (nx.Graph ou CSRGraph),
+    avec ses étiquettes de sommets. Borne inférieure du nombre chromatique.
+    """
+    g = as_csr(G)
+    key = graph_key(g) if use_cache else b""
+    cached = _CACHE.get(key) if use_cache else None
+    if cached is not None and (cached.exact or cached.budget_s >= time_budget_s):
+        return cached
+
+    t0 = time.perf_counter()
+    idx, exact, nodes = max_clique_indices(g, time_budget_s)
+    result = CliqueResult([g.nodes[i] for i in idx.tolist()], exact, time.perf_counter() - t0, nodes, time_budget_s)
+    if use_cache:
+        _CACHE[key] = result
+    return result
+
+# --------------------------------------------------------------------
+# Couverture des arêtes par des cliques maximales (glouton) : pour
+# chaque arête pas encore couverte, on étend {u, v} avec le voisin
+# commun qui garde le plus de candidats, jusqu’à une clique maximale.
+# Une contrainte AllDifferent par clique remplace ses q(q-1)/2
+# contraintes != (modèles CP "alldiff" et "bool" de solve_coloring).
+# --------------------------------------------------------------------
+def clique_cover(g: CSRGraph) -> List[List[int]]:
+    indptr = g.indptr.tolist()
+    indices = g.indices.tolist()
+    adj = [set(indices[indptr[v]:indptr[v + 1]]) for v in range(g.n)]
+    covered = [set() for _ in range(g.n)]
+    cliques: List[List[int]] = []
+    for u in range(g.n):
+        for v in indices[indptr[u]:indptr[u + 1]]:
+            if v <= u or v in covered[u]:
+                continue
+            C = [u, v]
+            cand = adj[u] & adj[v]
+            while cand:
+                w = max(cand, key=lambda x: len(adj[x] & cand))
+                C.append(w)
+                cand &= adj[w]
+            for a in C:
+                covered[a].update(C)
+            cliques.append(C)
+    return cliques
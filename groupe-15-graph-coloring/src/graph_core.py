@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence
+
+import networkx as nx
+import numpy as np
+
+Node = Hashable
+
+# --------------------------------------------------------------------
+# Représentation compacte d’un graphe non orienté (format CSR) :
+# -nodes  : étiquettes des sommets (le sommet i correspond à nodes[i])
+# -indptr : int32, taille n+1 ; les voisins de i sont indices[indptr[i]:indptr[i+1]]
+# -indices: int32, taille 2m (chaque arête apparaît dans les deux sens)
+# Les listes de voisins sont triées, sans boucle ni arête multiple.
+# Une coloration est alors un simple tableau int32 de taille n.
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class CSRGraph:
+    nodes: List[Node]
+    indptr: np.ndarray
+    indices: np.ndarray
+
+    @property
+    def n(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def m(self) -> int:
+        return len(self.indices) // 2
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.indptr).astype(np.int32)
+
+    def neighbors(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    # ----------------------------------------------------------------
+    # Construction depuis deux tableaux d’extrémités (indices 0..n-1)
+    # Les boucles sont ignorées, les arêtes en double fusionnées.
+    # ----------------------------------------------------------------
+    @classmethod
+    def from_edges(
+        cls,
+        n: int,
+        src: np.ndarray,
+        dst: np.ndarray,
+        nodes: Optional[Sequence[Node]] = None,
+    ) -> "CSRGraph":
+        n = int(n)
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        keep = src != dst
+        src, dst = src[keep], dst[keep]
+
+        # Chaque arête dans les deux sens, puis tri par (ligne, colonne)
+        rows = np.concatenate([src, dst])
+        cols = np.concatenate([dst, src])
+        # Tri puis suppression des doublons adjacents (np.unique passe par
+        # une table de hachage, nettement plus lente sur des millions d’arêtes)
+        key = np.sort(rows * n + cols)
+        if len(key):
+            key = key[np.concatenate([[True], key[1:] != key[:-1]])]
+        rows = (key // n).astype(np.int32)
+        cols = (key % n).astype(np.int32)
+
+        indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        labels = list(range(n)) if nodes is None else list(nodes)
+        if len(labels) != n:
+            raise ValueError(f"{len(labels)} étiquettes pour {n} sommets")
+        return cls(labels, indptr, cols)
+
+    # ----------------------------------------------------------------
+    # Conversions NetworkX <-> CSR
+    # ----------------------------------------------------------------
+    @classmethod
+    def from_networkx(cls, G: nx.Graph) -> "CSRGraph":
+        nodes = list(G.nodes())
+        index = {v: i for i, v in enumerate(nodes)}
+        m = G.number_of_edges()
+        src = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int64, count=m)
+        dst = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int64, count=m)
+        return cls.from_edges(len(nodes), src, dst, nodes)
+
+    def to_networkx(self) -> nx.Graph:
+        G = nx.Graph()
+        G.add_nodes_from(self.nodes)
+        src, dst = self.edge_arrays()
+        nodes = self.nodes
+        G.add_edges_from((nodes[u], nodes[v]) for u, v in zip(src.tolist(), dst.tolist()))
+        return G
+
+    def edge_arrays(self):
+        # Chaque arête une seule fois (u < v)
+        rows = np.repeat(np.arange(self.n, dtype=np.int32), self.degrees())
+        upper = rows < self.indices
+        return rows[upper], self.indices[upper]
+
+    def subgraph(self, idx: np.ndarray) -> "CSRGraph":
+        # Sous-graphe induit par les sommets idx (renumérotés 0..len(idx)-1)
+        idx = np.asarray(idx, dtype=np.int64)
+        new = np.full(self.n, -1, dtype=np.int64)
+        new[idx] = np.arange(len(idx))
+        src, dst = self.edge_arrays()
+        keep = (new[src] >= 0) & (new[dst] >= 0)
+        return CSRGraph.from_edges(len(idx), new[src[keep]], new[dst[keep]], [self.nodes[i] for i in idx.tolist()])
+
+    # ----------------------------------------------------------------
+    # Colorations : tableau de couleurs <-> dictionnaire {sommet: couleur}
+    # ----------------------------------------------------------------
+    def coloring_dict(self, colors: np.ndarray) -> Dict[Node, int]:
+        return dict(zip(self.nodes, np.asarray(colors).tolist()))
+
+    def colors_array(self, coloring: Dict[Node, int]) -> np.ndarray:
+        # Sommets absents de la coloration : -1
+        return np.fromiter((coloring.get(v, -1) for v in self.nodes), dtype=np.int32, count=self.n)
+
+    def is_valid(self, colors: np.ndarray) -> bool:
+        colors = np.asarray(colors)
+        if len(colors) != self.n or (colors < 0).any():
+            return False
+        src, dst = self.edge_arrays()
+        return bool((colors[src] != colors[dst]).all())
+
+
+def as_csr(G) -> CSRGraph:
+    # Accepte indifféremment un nx.Graph ou un CSRGraph déjà construit
+    return G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
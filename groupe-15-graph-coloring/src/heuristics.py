@@ -1,32 +1,137 @@
 from __future__ import annotations
 
+import heapq
 from typing import Dict, Hashable, Optional, List
 import networkx as nx
+import numpy as np
+
+from graph_core import CSRGraph, as_csr
 
 Node = Hashable
 
 
-def greedy_coloring(G: nx.Graph, order: Optional[List[Node]] = None) -> Dict[Node, int]:
+# --------------------------------------------------------------------
+# Heuristiques sur le graphe compact (CSRGraph) :
+# les sommets sont des indices 0..n-1, la coloration un tableau int32.
+# Les fonctions sur nx.Graph plus bas convertissent puis délèguent.
+# --------------------------------------------------------------------
+def greedy_colors(
+    g: CSRGraph,
+    order: Optional[List[int]] = None,
+    colors: Optional[np.ndarray] = None,
+) -> np.ndarray:
     """
-    Coloriage glouton: assigne au sommet la plus petite couleur disponible.
+    Glouton sur CSR : plus petite couleur absente du voisinage déjà colorié.
+    Couleurs interdites marquées par "tampon" : stamp[c] == v signifie que c
+    est prise par un voisin de v (aucune remise à zéro entre deux sommets).
+    `colors` : coloration partielle de départ (-1 = non colorié), complétée
+    dans l’ordre `order`.
     """
-    if order is None:
-        order = list(G.nodes())
+    n = g.n
+    indptr = g.indptr.tolist()
+    indices = g.indices.tolist()
+    colors = [-1] * n if colors is None else np.asarray(colors).tolist()
+    top = max(colors, default=-1)
+    stamp = [-1] * (max(int(g.degrees().max(initial=0)), top) + 2)
 
-    coloring: Dict[Node, int] = {}
-    for v in order:
-        used = {coloring[u] for u in G.neighbors(v) if u in coloring}
+    for v in (range(n) if order is None else order):
+        for u in indices[indptr[v]:indptr[v + 1]]:
+            cu = colors[u]
+            if cu >= 0:
+                stamp[cu] = v
         c = 0
-        while c in used:
+        while stamp[c] == v:
             c += 1
-        coloring[v] = c
-    return coloring
+        colors[v] = c
+    return np.array(colors, dtype=np.int32)
+
+
+def dsatur_colors(g: CSRGraph) -> np.ndarray:
+    """
+    DSATUR sur CSR en O((n+m) log n). Couleurs vues par chaque sommet :
+    bitmap (entier Python), saturation = nombre de bits à 1. Sommet suivant :
+    plus grande (saturation, degré), puis plus petit indice à égalité.
+
+    File de priorité (heapq) avec invalidation paresseuse : chaque hausse de
+    saturation empile une nouvelle entrée, les entrées périmées sont ignorées
+    au dépilement (au plus n + 2m entrées au total). La clé est un entier
+    unique, -(saturation * (degré max + 1) + degré) * n + indice : le plus
+    petit correspond à la plus grande (saturation, degré), puis au plus petit
+    indice.
+    """
+    n = g.n
+    if n == 0:
+        return np.zeros(0, dtype=np.int32)
+    indptr = g.indptr.tolist()
+    indices = g.indices.tolist()
+    deg = g.degrees().tolist()
+    colors = [-1] * n
+    seen = [0] * n
+
+    # Poids d’un point de saturation, en unités de clé
+    step = (max(deg) + 1) * n
+    key = [-d * n + v for v, d in enumerate(deg)]
+    heap = key[:]
+    heapq.heapify(heap)
+    pop, push = heapq.heappop, heapq.heappush
+
+    for _ in range(n):
+        k = pop(heap)
+        v = k % n
+        while colors[v] >= 0 or key[v] != k:
+            k = pop(heap)
+            v = k % n
+        b = seen[v]
+        c = (~b & (b + 1)).bit_length() - 1  # plus petit bit à 0
+        colors[v] = c
+        bit = 1 << c
+        for u in indices[indptr[v]:indptr[v + 1]]:
+            if colors[u] < 0 and not seen[u] & bit:
+                seen[u] |= bit
+                ku = key[u] - step
+                key[u] = ku
+                push(heap, ku)
+    return np.array(colors, dtype=np.int32)
+
+
+# --------------------------------------------------------------------
+# Interface NetworkX (inchangée) : {sommet: couleur}
+# --------------------------------------------------------------------
+def greedy_coloring(G: nx.Graph, order: Optional[List[Node]] = None) -> Dict[Node, int]:
+    """
+    Coloriage glouton: assigne au sommet la plus petite couleur disponible.
+    """
+    g = as_csr(G)
+    if order is not None:
+        index = {v: i for i, v in enumerate(g.nodes)}
+        order = [index[v] for v in order]
+        colors = greedy_colors(g, order)
+        # Seuls les sommets de `order` sont coloriés
+        return {v: c for v, c in g.coloring_dict(colors).items() if c >= 0}
+    return g.coloring_dict(greedy_colors(g))
 
 
 def dsatur_coloring(G: nx.Graph) -> Dict[Node, int]:
     """
     DSATUR: à chaque étape choisit le sommet au plus grand degré de saturation,
-    puis tie-break avec le degré.
+    puis tie-break avec le degré, puis le premier dans l’ordre de G.nodes().
+    Ce dernier départage est déterministe (indice CSR) ; la version d’origine
+    (dsatur_coloring_reference) dépendait de l’ordre d’itération d’un set.
+    """
+    g = as_csr(G)
+    return g.coloring_dict(dsatur_colors(g))
+
+
+def dsatur_coloring_reference(G: nx.Graph) -> Dict[Node, int]:
+    """
+    DSATUR d’origine sur nx.Graph, en O(n²) : le sommet suivant est cherché
+    par max() sur tous les sommets non coloriés. Conservé comme référence
+    pour la courbe de passage à l’échelle (benchmark.run_dsatur_scaling).
+
+    À égalité de (saturation, degré), max() garde le premier sommet rencontré
+    dans le set des non coloriés, donc dans l’ordre des hash : pour des
+    entiers 0..n-1 ajoutés dans l’ordre, c’est le plus petit, comme
+    dsatur_coloring ; pour d’autres étiquettes, les colorations diffèrent.
     """
     nodes = list(G.nodes())
     if not nodes:
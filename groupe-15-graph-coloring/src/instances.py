@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import dataclasses
+import hashlib
+import itertools
+import json
+import os
+import zipfile
 from dataclasses import dataclass
-from typing import Dict, Hashable, Optional, Tuple
+from functools import cached_property
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 
 import networkx as nx
+import numpy as np
+
+from graph_core import CSRGraph
 
 Node = Hashable
 
@@ -11,13 +21,48 @@ Node = Hashable
 # Structure représentant une instance de problème de coloration
 # -name: nom de l’instance (utilisé pour l’affichage et les exports)
 # -graph: graphe NetworkX
-# -pos: positions des nœuds (optionnelles, pour la visualisation)
+# -fixed_pos: positions des nœuds données à la construction (optionnelles)
+# -chromatic: nombre chromatique s’il est connu par construction
+#             (queen, Mycielski, coloration plantée), sinon None
+# -csr: graphe compact, quand l’instance a été construite sans networkx
+#       (fichiers DIMACS, colorations plantées) ou relue depuis le cache
+# -layout: disposition calculée seulement au premier accès à `pos`,
+#          ("spring", graine) ou ("circular", 0) : spring_layout coûte
+#          O(n²) par itération, inutile quand rien n’est dessiné (benchmark)
+# -pos_file: fichier du cache où ranger / relire ces positions calculées
 # --------------------------------------------------------------------
 @dataclass(frozen=True)
 class Instance:
     name: str
     graph: nx.Graph
-    pos: Optional[Dict[Node, Tuple[float, float]]] = None
+    fixed_pos: Optional[Dict[Node, Tuple[float, float]]] = None
+    chromatic: Optional[int] = None
+    csr: Optional[CSRGraph] = None
+    layout: Optional[Tuple[str, int]] = None
+    pos_file: Optional[str] = None
+
+    @cached_property
+    def pos(self) -> Optional[Dict[Node, Tuple[float, float]]]:
+        # Positions pour la visualisation, calculées une seule fois
+        if self.fixed_pos is not None or self.layout is None:
+            return self.fixed_pos
+        nodes = list(self.graph.nodes())
+        if self.pos_file and os.path.exists(self.pos_file):
+            xy = np.load(self.pos_file, allow_pickle=False)
+            if len(xy) == len(nodes):
+                return {v: tuple(p) for v, p in zip(nodes, xy.tolist())}
+        pos = compute_layout(self.graph, *self.layout)
+        if self.pos_file:
+            _atomic_write(self.pos_file, lambda f: np.save(f, np.array([pos[v] for v in nodes], dtype=np.float64)))
+        return pos
+
+
+def compute_layout(G: nx.Graph, kind: str, seed: int = 0) -> Dict[Node, Tuple[float, float]]:
+    if kind == "spring":
+        return nx.spring_layout(G, seed=seed)
+    if kind == "circular":
+        return nx.circular_layout(G)
+    raise ValueError(f"Disposition inconnue: {kind}")
 
 # --------------------------------------------------------------------
 # Normalise le nom d’une instance pour le rendre robuste aux erreurs
@@ -51,8 +96,8 @@ def triangle() -> Instance:
 def cycle(n: int = 8) -> Instance:
     n = max(3, int(n)) # Un cycle doit avoir au moins 3 sommets
     G = nx.cycle_graph(n)
-    pos = nx.circular_layout(G) # Disposition circulaire pour la visualisation
-    return Instance(f"cycle_{n}", G, pos)
+    # Disposition circulaire pour la visualisation (calculée à la demande)
+    return Instance(f"cycle_{n}", G, layout=("circular", 0))
 
 # --------------------------------------------------------------------
 # Grille w×h (graphe planaire):
@@ -78,8 +123,7 @@ def random_erdos(n: int = 25, p: float = 0.2, seed: int = 1) -> Instance:
     p = 0.0 if p < 0.0 else 1.0 if p > 1.0 else p # On force p à rester dans [0, 1]
     seed = int(seed)
     G = nx.erdos_renyi_graph(n=n, p=p, seed=seed)
-    pos = nx.spring_layout(G, seed=seed)
-    return Instance(f"erdos_n{n}_p{p}_s{seed}", G, pos)
+    return Instance(f"erdos_n{n}_p{p}_s{seed}", G, layout=("spring", seed))
 
 # --------------------------------------------------------------------
 # Carte fictive (régions A à J):
@@ -116,6 +160,279 @@ def map_like() -> Instance:
     }
     return Instance("map_like", G, pos)
 
+# --------------------------------------------------------------------
+# Graphe des dames w×h (famille "queen" de DIMACS, ex. queen8_8):
+# -une case par sommet, deux cases reliées si une dame passe de l’une à
+#  l’autre (même ligne, même colonne ou même diagonale)
+# -sommets numérotés ligne par ligne comme dans les fichiers DIMACS
+# -nombre chromatique connu pour les tailles classiques (table ci-dessous)
+#  et égal à n pour un échiquier n×n avec n premier avec 6
+# --------------------------------------------------------------------
+_QUEEN_CHROMATIC = {
+    (1, 1): 1, (2, 2): 4, (3, 3): 5, (4, 4): 5, (5, 5): 5, (6, 6): 7,
+    (7, 7): 7, (8, 8): 9, (9, 9): 10, (10, 10): 11, (11, 11): 11,
+    (12, 12): 12, (8, 12): 12,
+}
+
+
+def queen_chromatic(w: int, h: int) -> Optional[int]:
+    w, h = sorted((int(w), int(h)))
+    if (w, h) in _QUEEN_CHROMATIC:
+        return _QUEEN_CHROMATIC[(w, h)]
+    if w == h and w % 6 in (1, 5):
+        return w
+    return None
+
+
+def queen(w: int = 8, h: int = 8) -> Instance:
+    w = max(1, int(w))
+    h = max(1, int(h))
+    G = nx.Graph()
+    G.add_nodes_from(range(w * h))
+    cells = [(r, c) for r in range(h) for c in range(w)]
+    for (i, (r1, c1)), (j, (r2, c2)) in itertools.combinations(enumerate(cells), 2):
+        if r1 == r2 or c1 == c2 or abs(r1 - r2) == abs(c1 - c2):
+            G.add_edge(i, j)
+    pos = {i: (float(c), float(-r)) for i, (r, c) in enumerate(cells)}
+    return Instance(f"queen{w}_{h}", G, pos, chromatic=queen_chromatic(w, h))
+
+# --------------------------------------------------------------------
+# Graphe de Mycielski M_k (famille "myciel" de DIMACS : mycielK = M_{K+1}):
+# -sans triangle (plus grande clique = 2) mais nombre chromatique k
+# -M_2 = une arête, M_3 = C5, M_4 = graphe de Grötzsch (11 sommets)
+# -construction : à partir de G (sommets 0..n-1), on ajoute une copie
+#  n+i de chaque sommet i, reliée aux voisins de i, et un sommet 2n relié
+#  à toutes les copies ; le nombre chromatique augmente de 1
+# --------------------------------------------------------------------
+def mycielski(k: int = 4) -> Instance:
+    k = max(2, int(k))
+    G = nx.Graph([(0, 1)])
+    for _ in range(k - 2):
+        n = G.number_of_nodes()
+        edges = list(G.edges())
+        G.add_edges_from((n + u, v) for u, v in edges)
+        G.add_edges_from((u, n + v) for u, v in edges)
+        G.add_edges_from((n + i, 2 * n) for i in range(n))
+    return Instance(f"mycielski_{k}", G, chromatic=k, layout=("circular", 0))
+
+# --------------------------------------------------------------------
+# Coloration plantée (style "flat" de Culberson / "leighton" de DIMACS):
+# -les n sommets sont répartis au hasard en k classes de même taille
+#  (à 1 près) ; chaque paire de sommets de classes différentes est reliée
+#  avec probabilité p, jamais deux sommets d’une même classe
+# -une k-clique est plantée (un sommet par classe) : le nombre chromatique
+#  vaut donc exactement k, quel que soit p
+# -construit directement en tableaux NumPy (pas de networkx pour les
+#  arêtes), par blocs de lignes pour borner la mémoire
+# --------------------------------------------------------------------
+def planted(n: int = 100, k: int = 5, p: float = 0.3, seed: int = 1) -> Instance:
+    n = max(1, int(n))
+    k = max(1, min(int(k), n))
+    p = float(p)
+    p = 0.0 if p < 0.0 else 1.0 if p > 1.0 else p
+    seed = int(seed)
+    rng = np.random.default_rng(seed)
+
+    # Classe cachée de chaque sommet (tailles équilibrées)
+    cls = rng.permutation(n) % k
+    src: List[np.ndarray] = []
+    dst: List[np.ndarray] = []
+    block = max(1, 2_000_000 // n)
+    for a in range(0, n, block):
+        b = min(n, a + block)
+        rows = np.arange(a, b)[:, None]
+        keep = rng.random((b - a, n)) < p
+        keep &= np.arange(n)[None, :] > rows
+        keep &= cls[None, :] != cls[a:b, None]
+        u, v = np.nonzero(keep)
+        src.append(u + a)
+        dst.append(v)
+
+    # Clique plantée : le premier sommet de chaque classe
+    witness = np.array([np.flatnonzero(cls == c)[0] for c in range(k)])
+    cu, cv = np.triu_indices(k, 1)
+    src.append(witness[cu])
+    dst.append(witness[cv])
+
+    g = CSRGraph.from_edges(n, np.concatenate(src), np.concatenate(dst))
+    return Instance(f"planted_n{n}_k{k}_p{p}_s{seed}", g.to_networkx(), None, chromatic=k, csr=g)
+
+# --------------------------------------------------------------------
+# Format DIMACS (.col) :
+#   c commentaire
+#   p edge <n> <m>
+#   e <u> <v>        (sommets numérotés de 1 à n)
+# Lecture en flux, par blocs de lignes : les extrémités de chaque bloc
+# sont converties d’un coup en tableau NumPy, puis le graphe compact est
+# construit directement (sans networkx). Les arêtes en double (certains
+# fichiers listent les deux sens), les boucles et les lignes "n" (poids
+# des sommets) sont ignorées.
+# --------------------------------------------------------------------
+def read_dimacs(path: str, chunk_bytes: int = 1 << 22) -> CSRGraph:
+    n: Optional[int] = None
+    parts: List[np.ndarray] = []
+    with open(path, "r", encoding="ascii", errors="replace") as f:
+        while True:
+            lines = f.readlines(chunk_bytes)
+            if not lines:
+                break
+            ends = []
+            for line in lines:
+                tag = line[:1]
+                if tag == "e":
+                    ends.append(line[1:])
+                elif tag == "p":
+                    fields = line.split()
+                    if len(fields) < 3:
+                        raise ValueError(f"Ligne 'p' invalide dans {path}: {line.strip()}")
+                    n = int(fields[2])
+                elif tag not in ("c", "n") and line.strip():
+                    raise ValueError(f"Ligne DIMACS inconnue dans {path}: {line.strip()}")
+            if ends:
+                try:
+                    pairs = np.fromstring(" ".join(ends), dtype=np.int64, sep=" ")
+                except ValueError:
+                    pairs = None
+                if pairs is None or len(pairs) != 2 * len(ends):
+                    raise ValueError(f"Ligne 'e' invalide dans {path}")
+                parts.append(pairs)
+
+    if n is None:
+        raise ValueError(f"Ligne 'p edge <n> <m>' absente de {path}")
+    ends = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+    if len(ends) and (ends.min() < 1 or ends.max() > n):
+        raise ValueError(f"Sommet hors de 1..{n} dans {path}")
+    # Étiquettes DIMACS (1..n) conservées pour les colorations exportées
+    return CSRGraph.from_edges(n, ends[0::2] - 1, ends[1::2] - 1, nodes=range(1, n + 1))
+
+
+def write_dimacs(G, path: str, comment: str = "") -> None:
+    # Écrit un graphe (nx.Graph ou CSRGraph) au format DIMACS, sommets 1..n
+    g = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    src, dst = g.edge_arrays()
+    with open(path, "w", encoding="ascii") as f:
+        if comment:
+            f.write(f"c {comment}\n")
+        f.write(f"p edge {g.n} {len(src)}\n")
+        pairs = np.column_stack([src + 1, dst + 1])
+        np.savetxt(f, pairs, fmt="e %d %d")
+
+
+def dimacs(path: str) -> Instance:
+    g = read_dimacs(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    return Instance(name, g.to_networkx(), None, csr=g)
+
+# --------------------------------------------------------------------
+# Cache disque des instances générées : un fichier .npz par instance
+# (format binaire NumPy, relu sans pickle) dans cache_dir, nommé d’après
+# la famille et une empreinte de ses paramètres :
+# -src, dst : extrémités des arêtes (u < v), int32, 8 octets par arête
+# -labels   : étiquettes des sommets (entiers, couples d’entiers ou chaînes)
+# -pos      : positions n×2, si elles sont données à la construction
+# -meta     : nom, nombre chromatique, disposition (JSON)
+# Les positions calculées à la demande sont rangées à côté, dans
+# <fichier>.pos.npy, au premier accès à Instance.pos.
+# Pour un fichier DIMACS, la clé comprend sa taille et sa date de
+# modification : un fichier modifié est relu.
+# --------------------------------------------------------------------
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join("outputs", "cache")
+
+
+def _atomic_write(path: str, write: Callable) -> None:
+    # Fichier temporaire puis os.replace : plusieurs tâches du benchmark
+    # peuvent écrire la même instance en même temps
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _labels_array(nodes: List[Node]) -> Optional[Tuple[np.ndarray, str]]:
+    # Étiquettes en tableau NumPy (None si leur type n’est pas géré)
+    if all(type(v) is int for v in nodes):
+        return np.array(nodes, dtype=np.int64), "int"
+    if nodes and all(type(v) is tuple and len(v) == len(nodes[0]) and all(type(x) is int for x in v) for v in nodes):
+        return np.array(nodes, dtype=np.int64), "tuple"
+    if all(type(v) is str for v in nodes):
+        return np.array(nodes, dtype=str), "str"
+    return None
+
+
+def _labels_list(arr: np.ndarray, kind: str) -> List[Node]:
+    if kind == "tuple":
+        return [tuple(v) for v in arr.tolist()]
+    return arr.tolist()
+
+
+def cache_path(cache_dir: str, family: str, params: Dict[str, object]) -> str:
+    items = dict(params)
+    if family == "dimacs":
+        st = os.stat(str(params["path"]))
+        items = {"path": os.path.abspath(str(params["path"])), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    key = json.dumps([CACHE_VERSION, family, items], sort_keys=True)
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(cache_dir, f"{family}_{digest}.npz")
+
+
+def save_instance(inst: Instance, path: str) -> bool:
+    # False si les étiquettes ne se rangent pas dans un tableau
+    g = inst.csr if inst.csr is not None else CSRGraph.from_networkx(inst.graph)
+    labels = _labels_array(g.nodes)
+    if labels is None:
+        return False
+    src, dst = g.edge_arrays()
+    arrays = {
+        "src": src.astype(np.int32),
+        "dst": dst.astype(np.int32),
+        "labels": labels[0],
+        "meta": np.array(json.dumps({
+            "version": CACHE_VERSION,
+            "name": inst.name,
+            "chromatic": inst.chromatic,
+            "layout": inst.layout,
+            "labels": labels[1],
+        })),
+    }
+    if inst.fixed_pos is not None:
+        arrays["pos"] = np.array([inst.fixed_pos[v] for v in g.nodes], dtype=np.float64)
+    _atomic_write(path, lambda f: np.savez(f, **arrays))
+    return True
+
+
+def read_instance(path: str) -> Instance:
+    with np.load(path, allow_pickle=False) as z:
+        meta = json.loads(str(z["meta"]))
+        if meta.get("version") != CACHE_VERSION:
+            raise ValueError(f"Version de cache différente dans {path}")
+        labels = _labels_list(z["labels"], meta["labels"])
+        g = CSRGraph.from_edges(len(labels), z["src"], z["dst"], labels)
+        pos = None
+        if "pos" in z.files:
+            pos = {v: tuple(p) for v, p in zip(labels, z["pos"].tolist())}
+    layout = tuple(meta["layout"]) if meta["layout"] else None
+    return Instance(meta["name"], g.to_networkx(), pos, meta["chromatic"], csr=g, layout=layout,
+                    pos_file=path[:-len(".npz")] + ".pos.npy")
+
+
+def cached_instance(cache_dir: str, family: str, params: Dict[str, object],
+                    build: Callable[..., Instance]) -> Instance:
+    # Relit l’instance si elle est déjà dans le cache, sinon la génère et l’y range
+    path = cache_path(cache_dir, family, params)
+    if os.path.exists(path):
+        try:
+            return read_instance(path)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            pass  # fichier illisible ou d’une autre version : régénéré
+    inst = build(**params)
+    if save_instance(inst, path):
+        return dataclasses.replace(inst, pos_file=path[:-len(".npz")] + ".pos.npy")
+    return inst
+
 # --------------------------------------------------------------------
 # Fonction centrale de chargement des instances
 # Sélectionne la bonne instance en fonction du nom fourni
@@ -127,18 +444,46 @@ def load_instance(
     seed: int = 1,
     w: int = 4,
     h: int = 4,
+    k: int = 5,
+    path: Optional[str] = None,
+    cache_dir: Optional[str] = None,
 ) -> Instance:
+    # cache_dir : dossier du cache disque (None = toujours régénérer)
+    # Un chemin vers un fichier .col est accepté directement comme nom
+    if name.strip().lower().endswith(".col"):
+        name, path = "dimacs", name.strip()
+
     key = _norm_name(name)  # Normalisation du nom pour éviter les erreurs utilisateur
 
+    # Famille, générateur et paramètres qui la définissent (clé du cache)
     if key == "triangle":
-        return triangle()
-    if key == "cycle":
-        return cycle(n=n)
-    if key == "grid":
-        return grid(w=w, h=h)
-    if key in ("random", "erdos", "erdos_renyi"):
-        return random_erdos(n=n, p=p, seed=seed)
-    if key in ("map", "map_like"):
-        return map_like()
-    # Erreur claire si l’instance n’est pas reconnue
-    raise ValueError(f"Instance inconnue: {name} (triangle/cycle/grid/erdos/map_like)")
+        family, build, params = "triangle", triangle, {}
+    elif key == "cycle":
+        family, build, params = "cycle", cycle, {"n": n}
+    elif key == "grid":
+        family, build, params = "grid", grid, {"w": w, "h": h}
+    elif key in ("random", "erdos", "erdos_renyi"):
+        family, build, params = "erdos", random_erdos, {"n": n, "p": p, "seed": seed}
+    elif key in ("map", "map_like"):
+        family, build, params = "map_like", map_like, {}
+    elif key == "queen":
+        family, build, params = "queen", queen, {"w": w, "h": h}
+    elif key in ("mycielski", "myciel"):
+        family, build, params = "mycielski", mycielski, {"k": k}
+    elif key in ("planted", "flat", "leighton"):
+        family, build, params = "planted", planted, {"n": n, "k": k, "p": p, "seed": seed}
+    elif key == "dimacs":
+        if not path:
+            raise ValueError("Instance dimacs: chemin du fichier .col requis")
+        family, build, params = "dimacs", dimacs, {"path": path}
+    else:
+        # Erreur claire si l’instance n’est pas reconnue
+        raise ValueError(
+            f"Instance inconnue: {name} "
+            "(triangle/cycle/grid/erdos/map_like/queen/mycielski/planted/dimacs ou fichier .col)"
+        )
+
+    # Les petites instances fixes ne passent pas par le cache
+    if cache_dir is None or family in ("triangle", "map_like"):
+        return build(**params)
+    return cached_instance(cache_dir, family, params, build)
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from graph_core import CSRGraph, as_csr
+from heuristics import dsatur_colors
+
+Node = Hashable
+
+LOCAL_SEARCH_METHODS = ("tabu", "hybrid")
+
+# Valeur "infinie" pour les mouvements interdits dans la matrice des deltas
+_BIG = np.iinfo(np.int32).max // 2
+
+# --------------------------------------------------------------------
+# Matrice des conflits (Tabucol) :
+# gamma[v, c] = nombre de voisins de v ayant la couleur c.
+# -v est en conflit si gamma[v, couleur(v)] > 0
+# -déplacer v vers c change le nombre d’arêtes en conflit de
+#  gamma[v, c] - gamma[v, couleur(v)]
+# Un déplacement ne met à jour que les lignes des voisins de v
+# (deux colonnes chacune) : O(degré) au lieu d’un recalcul complet.
+# --------------------------------------------------------------------
+def conflict_matrix(g: CSRGraph, colors: np.ndarray, k: int) -> np.ndarray:
+    rows = np.repeat(np.arange(g.n, dtype=np.int64), g.degrees())
+    flat = rows * k + colors[g.indices]
+    return np.bincount(flat, minlength=g.n * k).astype(np.int32).reshape(g.n, k)
+
+
+def count_conflicts(g: CSRGraph, colors: np.ndarray) -> int:
+    src, dst = g.edge_arrays()
+    return int((colors[src] == colors[dst]).sum())
+
+
+def tabucol(
+    g: CSRGraph,
+    k: int,
+    colors: np.ndarray,
+    rng: np.random.Generator,
+    max_iters: Optional[int] = None,
+    deadline: Optional[float] = None,
+    tenure: int = 10,
+    alpha: float = 0.6,
+) -> Tuple[np.ndarray, int, int]:
+    """
+    Tabucol (Hertz & de Werra, réglages de Galinier & Hao) : cherche une
+    k-coloration sans conflit à partir de `colors` (valeurs dans 0..k-1).
+
+    À chaque itération : meilleur déplacement (v, c) parmi les sommets en
+    conflit, hors déplacements tabous sauf s’il bat la meilleure solution
+    (aspiration) ; égalités départagées au hasard. Après le déplacement de
+    v depuis l’ancienne couleur, (v, ancienne) est tabou pendant
+    U(0, tenure) + alpha * (nb de sommets en conflit) itérations.
+
+    Retourne (meilleure coloration, nb de conflits, itérations effectuées).
+    Arrêt sur 0 conflit, max_iters ou deadline (time.perf_counter()).
+    """
+    n = g.n
+    colors = np.array(colors, dtype=np.int32)
+    if n == 0:
+        return colors, 0, 0
+    indptr = g.indptr.tolist()
+    indices = g.indices
+    gamma = conflict_matrix(g, colors, k)
+    tabu = np.zeros((n, k), dtype=np.int64)   # itération jusqu’à laquelle (v, c) est tabou
+    every = np.arange(n)
+
+    f = int(gamma[every, colors].sum()) // 2
+    best, best_f = colors.copy(), f
+    it = 0
+    while f > 0 and (max_iters is None or it < max_iters):
+        # L’horloge n’est lue que toutes les 64 itérations
+        if deadline is not None and it % 64 == 0 and time.perf_counter() > deadline:
+            break
+        own = gamma[every, colors]
+        C = np.flatnonzero(own > 0)
+        delta = gamma[C] - own[C, None]
+        delta[np.arange(len(C)), colors[C]] = _BIG
+        allowed = (tabu[C] <= it) | (f + delta < best_f)
+        delta = np.where(allowed, delta, _BIG)
+
+        d = int(delta.min())
+        it += 1
+        if d >= _BIG:
+            continue  # tous les déplacements sont tabous : on laisse expirer
+        ties = np.flatnonzero(delta.ravel() == d)
+        i, c = divmod(int(ties[rng.integers(len(ties))]), k)
+        v = int(C[i])
+        old = int(colors[v])
+
+        nb = indices[indptr[v]:indptr[v + 1]]
+        gamma[nb, old] -= 1
+        gamma[nb, c] += 1
+        colors[v] = c
+        f += d
+        tabu[v, old] = it + int(rng.integers(tenure)) + int(alpha * len(C))
+        if f < best_f:
+            best, best_f = colors.copy(), f
+    return best, best_f, it
+
+# --------------------------------------------------------------------
+# Croisement GPX (Greedy Partition Crossover, Galinier & Hao 1999) :
+# l’enfant hérite tour à tour, de chaque parent, de sa plus grande classe
+# de couleur (parmi les sommets pas encore placés) ; les sommets restants
+# reçoivent une couleur au hasard.
+# --------------------------------------------------------------------
+def gpx_crossover(a: np.ndarray, b: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    parents = [np.array(a, dtype=np.int32), np.array(b, dtype=np.int32)]
+    child = np.full(len(a), -1, dtype=np.int32)
+    for c in range(k):
+        p = parents[c % 2]
+        sizes = np.bincount(p[p >= 0], minlength=k)
+        if sizes.max(initial=0) == 0:
+            break
+        take = p == int(np.argmax(sizes))
+        child[take] = c
+        parents[0][take] = -1
+        parents[1][take] = -1
+    rest = child < 0
+    child[rest] = rng.integers(k, size=int(rest.sum()))
+    return child
+
+
+def hybrid_coloring(
+    g: CSRGraph,
+    k: int,
+    rng: np.random.Generator,
+    deadline: float,
+    init: Optional[np.ndarray] = None,
+    pop_size: int = 10,
+    ls_iters: Optional[int] = None,
+) -> Tuple[np.ndarray, int, int]:
+    """
+    Algorithme évolutionnaire hybride (HEA) à k fixé : population de
+    colorations améliorées par Tabucol, enfants produits par GPX puis
+    améliorés par Tabucol (ls_iters itérations, défaut 10 n) ; l’enfant
+    remplace le plus mauvais de ses deux parents.
+
+    `init` (optionnel) est le premier individu, les autres sont aléatoires.
+    Retourne (meilleure coloration, nb de conflits, itérations Tabucol).
+    """
+    n = g.n
+    ls_iters = max(1000, 10 * n) if ls_iters is None else int(ls_iters)
+    total = 0
+
+    population: List[np.ndarray] = []
+    scores: List[int] = []
+    for i in range(max(2, pop_size)):
+        start = init if i == 0 and init is not None else rng.integers(k, size=n).astype(np.int32)
+        colors, f, its = tabucol(g, k, start, rng, max_iters=ls_iters, deadline=deadline)
+        total += its
+        if f == 0:
+            return colors, 0, total
+        population.append(colors)
+        scores.append(f)
+        if time.perf_counter() > deadline:
+            break
+
+    while time.perf_counter() <= deadline and len(population) >= 2:
+        i, j = rng.choice(len(population), size=2, replace=False)
+        child = gpx_crossover(population[i], population[j], k, rng)
+        child, f, its = tabucol(g, k, child, rng, max_iters=ls_iters, deadline=deadline)
+        total += its
+        if f == 0:
+            return child, 0, total
+        worst = i if scores[i] >= scores[j] else j
+        population[worst], scores[worst] = child, f
+
+    b = int(np.argmin(scores))
+    return population[b], scores[b], total
+
+# --------------------------------------------------------------------
+# Minimisation du nombre de couleurs par recherche locale :
+# on part de DSATUR (k couleurs), puis on cherche une (k-1)-coloration
+# en recoloriant au hasard les sommets de la dernière classe, et ainsi
+# de suite tant que le budget de temps le permet.
+# Aucune preuve d’optimalité : le statut K_MIN_REACHED indique seulement
+# que k_min (par ex. une borne inférieure) a été atteint.
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class LocalSearchInfo:
+    status: str                 # FEASIBLE (budget épuisé) ou K_MIN_REACHED
+    time_s: float
+    iterations: int             # itérations Tabucol (toutes valeurs de k)
+    k_start: int                # couleurs de la coloration DSATUR de départ
+    trace: List[Tuple[float, int]] = field(default_factory=list)  # (instant, k trouvé)
+
+
+def local_search_colors(
+    g: CSRGraph,
+    method: str = "tabu",
+    time_budget_s: float = 10.0,
+    seed: int = 0,
+    k_min: int = 1,
+) -> Tuple[np.ndarray, LocalSearchInfo]:
+    if method not in LOCAL_SEARCH_METHODS:
+        raise ValueError(f"Recherche locale inconnue: {method} ({'/'.join(LOCAL_SEARCH_METHODS)})")
+    t0 = time.perf_counter()
+    deadline = t0 + time_budget_s
+    rng = np.random.default_rng(seed)
+
+    colors = dsatur_colors(g)
+    k = int(colors.max()) + 1 if g.n else 0
+    k_start = k
+    trace = [(time.perf_counter() - t0, k)]
+    iterations = 0
+
+    while k - 1 >= max(1, k_min) and time.perf_counter() < deadline:
+        target = k - 1
+        start = colors.copy()
+        top = start >= target
+        start[top] = rng.integers(target, size=int(top.sum()))
+        if method == "tabu":
+            found, f, its = tabucol(g, target, start, rng, deadline=deadline)
+        else:
+            found, f, its = hybrid_coloring(g, target, rng, deadline, init=start)
+        iterations += its
+        if f > 0:
+            break
+        # Couleurs renumérotées 0..k-1 (une classe a pu disparaître)
+        _, colors = np.unique(found, return_inverse=True)
+        colors = colors.astype(np.int32)
+        k = int(colors.max()) + 1
+        trace.append((time.perf_counter() - t0, k))
+
+    status = "K_MIN_REACHED" if k <= max(1, k_min) else "FEASIBLE"
+    return colors, LocalSearchInfo(status, time.perf_counter() - t0, iterations, k_start, trace)
+
+# --------------------------------------------------------------------
+# Interface NetworkX : (nombre de couleurs, {sommet: couleur}, infos)
+# --------------------------------------------------------------------
+def local_search_coloring(
+    G,
+    method: str = "tabu",
+    time_budget_s: float = 10.0,
+    seed: int = 0,
+    k_min: int = 1,
+) -> Tuple[int, Dict[Node, int], LocalSearchInfo]:
+    g = as_csr(G)
+    colors, info = local_search_colors(g, method, time_budget_s, seed, k_min)
+    k = int(colors.max()) + 1 if g.n else 0
+    return k, g.coloring_dict(colors), info
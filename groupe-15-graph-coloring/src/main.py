@@ -1,21 +1,29 @@
 from __future__ import annotations
 import argparse
+import functools
 import json
 import os
 import time
+from dataclasses import asdict
 from pathlib import Path
 from typing import Dict, Hashable, Optional, Callable, Tuple, Any
 import networkx as nx
-from instances import load_instance
+from clique import max_clique
+from instances import DEFAULT_CACHE_DIR, load_instance
 from heuristics import greedy_coloring, dsatur_coloring
-from solve_coloring import solve_k_coloring, solve_min_coloring
+from local_search import local_search_coloring
+from preprocess import ReductionReport, solve_decomposed
+from solve_coloring import (ENCODINGS, SEARCH_STRATEGIES, SYMMETRY_MODES, solve_k_coloring, solve_min_coloring,
+                            solve_min_coloring_opt)
 from viz import draw_plain, draw_coloring
 
 
 try:
-    from benchmark import run_benchmark
+    from benchmark import best_cp_variants, run_benchmark, run_dsatur_scaling
 except Exception:
+    best_cp_variants = None  # type: ignore
     run_benchmark = None  # type: ignore
+    run_dsatur_scaling = None  # type: ignore
 
 Node = Hashable
 
@@ -66,11 +74,9 @@ def colors_used(coloring: Dict[Node, int]) -> int:
 # Bornes pour l’optimisation (cp_min)
 # ==========================================================
 def lower_bound_clique(G: nx.Graph) -> int:
-    # Borne inférieure basée sur la taille de la plus grande clique
-    try:
-        return max(1, int(nx.graph_clique_number(G)))
-    except Exception:
-        return 1
+    # Borne inférieure : taille de la plus grande clique trouvée dans le
+    # budget de clique.max_clique (résultat mis en cache par graphe)
+    return max(1, max_clique(G).size)
 
 def upper_bound_dsatur(G: nx.Graph) -> int:
     # Borne supérieure obtenue via une heuristique DSATUR
@@ -108,27 +114,40 @@ def ask_optional_path(prompt: str) -> Optional[str]:
 # ==========================================================
 def interactive_config() -> dict:
     print("\n=== Coloration de graphe / carte (mode interactif) ===")
-    print("Instances possibles : triangle, cycle, grid, erdos, map_like")
+    print("Instances possibles : triangle, cycle, grid, erdos, map_like, queen, mycielski, planted, fichier .col")
     instance = ask_str("Choisis une instance", "map_like")
 
-    n = ask_int("n (cycle/erdos)", 25)
-    p = ask_float("p (erdos)", 0.2)
+    n = ask_int("n (cycle/erdos/planted)", 25)
+    p = ask_float("p (erdos/planted)", 0.2)
     seed = ask_int("seed", 1)
-    w = ask_int("w (grid)", 6)
-    h = ask_int("h (grid)", 6)
+    w = ask_int("w (grid/queen)", 6)
+    h = ask_int("h (grid/queen)", 6)
+    chi = ask_int("nombre chromatique (mycielski/planted)", 5)
 
     print("\nMéthodes :")
     print("  - cp_k      : OR-Tools CP-SAT avec k fixé")
     print("  - cp_min    : OR-Tools CP-SAT (cherche le minimum k) + bornes (LB/UB)")
+    print("  - cp_opt    : OR-Tools CP-SAT, un seul modèle qui minimise le nombre de couleurs (hint DSATUR)")
     print("  - greedy    : heuristique gloutonne")
     print("  - dsatur    : heuristique DSATUR")
-    print("  - compare   : compare greedy/dsatur/cp_min")
+    print("  - tabu      : recherche tabou (Tabucol) à partir de DSATUR, k décroissant")
+    print("  - hybrid    : algorithme évolutionnaire hybride (croisement GPX + Tabucol)")
+    print("  - compare   : compare greedy/dsatur/cp_min/cp_opt")
     print("  - benchmark : benchmark auto -> CSV")
+    print("  - dsatur_scaling : temps DSATUR (file de priorité vs version d’origine) selon n -> CSV")
     method = ask_str("Choisis une méthode", "cp_min").lower()
 
-    timeout = ask_float("timeout (secondes) [cp_* ou benchmark]", 3.0)
+    timeout = ask_float("timeout (secondes) [cp_*, tabu/hybrid ou benchmark]", 3.0)
 
     k = ask_int("k (nb max de couleurs)", 4) if method == "cp_k" else None
+    strategy = ask_str("Stratégie cp_min (ascending/descending/bisection)", "ascending") if method == "cp_min" else "ascending"
+    encoding, symmetry = "int", "clique"
+    if method in ("cp_k", "cp_min", "cp_opt"):
+        encoding = ask_str("Encodage CP (int/alldiff/bool)", "int")
+        symmetry = ask_str("Bris de symétrie (first/clique/precedence)", "clique")
+
+    decompose = ask_bool("Prétraitement (réduction degré < k + composantes) ?", False)
+    blocks = ask_bool("Découper aussi en blocs 2-connexes ?", False) if decompose else False
 
     show = ask_bool("Afficher les graphes (avant puis après) ?", False)
     save_fig = ask_optional_path("Chemin image (ex: outputs/map.png)")
@@ -136,8 +155,10 @@ def interactive_config() -> dict:
 
 
     return {
-        "instance": instance, "n": n, "p": p, "seed": seed, "w": w, "h": h,
-        "method": method, "k": k, "timeout": timeout,
+        "instance": instance, "n": n, "p": p, "seed": seed, "w": w, "h": h, "chi": chi,
+        "method": method, "k": k, "timeout": timeout, "strategy": strategy,
+        "encoding": encoding, "symmetry": symmetry,
+        "decompose": decompose, "blocks": blocks,
         "show": show, "save_fig": save_fig, "save_json": save_js
     }
 
@@ -150,22 +171,50 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--instance", type=str, default=None)
     p.add_argument("--n", type=int, default=25)
     p.add_argument("--p", type=float, default=0.2)
-    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--seed", type=int, default=1,
+                   help="instances aléatoires ; tabu/hybrid (benchmark : graine de tabu/hybrid)")
     p.add_argument("--w", type=int, default=6)
     p.add_argument("--h", type=int, default=6)
+    p.add_argument("--chi", type=int, default=5,
+                   help="nombre chromatique des instances mycielski/planted")
 
     p.add_argument("--method", type=str, default=None,
-                   help="cp_k/cp_min/greedy/dsatur/compare/benchmark")
-    p.add_argument("--k", type=int, default=None)
-    p.add_argument("--timeout", type=float, default=3.0)
+                   help="cp_k/cp_min/cp_opt/greedy/dsatur/tabu/hybrid/compare/benchmark/dsatur_scaling")
+    p.add_argument("--k", type=int, default=None,
+                   help="cp_k: nombre de couleurs ; tabu/hybrid: k visé (arrêt dès qu’il est atteint)")
+    p.add_argument("--timeout", type=float, default=3.0,
+                   help="cp_k/cp_min: par valeur de k ; cp_opt/tabu/hybrid: budget total")
+    p.add_argument("--strategy", type=str, default="ascending", choices=SEARCH_STRATEGIES,
+                   help="recherche de k pour cp_min")
+    p.add_argument("--encoding", type=str, default=None, choices=ENCODINGS,
+                   help="cp_*: modèle CP-SAT (défaut int) ; benchmark: un seul encodage au lieu de tous")
+    p.add_argument("--symmetry", type=str, default=None, choices=SYMMETRY_MODES,
+                   help="cp_*: bris de symétrie (défaut clique) ; benchmark: un seul mode au lieu de clique et precedence")
     p.add_argument("--show", action="store_true")
+    p.add_argument("--jobs", type=int, default=None,
+                   help="benchmark / --decompose: tâches en parallèle (défaut : nb de cœurs)")
+    p.add_argument("--decompose", action="store_true",
+                   help="réduction (degré < k) et composantes connexes résolues séparément")
+    p.add_argument("--blocks", action="store_true",
+                   help="avec --decompose : découpe aussi en blocs 2-connexes")
+    p.add_argument("--task-timeout", type=float, default=120.0,
+                   help="benchmark: timeout dur par tâche (secondes)")
+    p.add_argument("--fresh", action="store_true",
+                   help="benchmark: repart de zéro au lieu de reprendre le CSV existant")
+    p.add_argument("--cache-dir", type=str, default=DEFAULT_CACHE_DIR,
+                   help="cache disque des instances générées (graphe + positions)")
+    p.add_argument("--no-cache", action="store_true",
+                   help="régénère les instances sans lire ni écrire le cache")
     p.add_argument("--save-fig", type=str, default=None)
     p.add_argument("--save-json", type=str, default=None)
     return p
 
 def draw_before_after(G, pos, inst_name, title_after, coloring, show, save_fig):
+    # pos : positions, ou fonction qui les calcule (seulement si on dessine)
     if not (show or save_fig):
         return
+    if callable(pos):
+        pos = pos()
 
     before_path = make_before_path(save_fig)
     if before_path:
@@ -185,26 +234,50 @@ def timed(fn: Callable[[], Any]) -> Tuple[Any, float]:
     return out, time.perf_counter() - t0
 
 
-def print_result(G: nx.Graph, inst_name: str, method: str, used: int, valid: bool, info: dict, k: Optional[int]):
+def print_result(G: nx.Graph, inst_name: str, method: str, used: int, valid: bool, info: dict, k: Optional[int],
+                 chromatic: Optional[int] = None):
     print("\n--- Résultat ---")
-    print(f"Instance: {inst_name} | nodes={G.number_of_nodes()} edges={G.number_of_edges()}")
+    known = "" if chromatic is None else f" | chi={chromatic} (connu)"
+    print(f"Instance: {inst_name} | nodes={G.number_of_nodes()} edges={G.number_of_edges()}{known}")
     print(f"Method: {method}")
+    # Clique non prouvée maximum : LB reste valide mais peut-être pas serrée
+    lb = f"LB={info.get('lb_clique')}" + ("" if info.get("clique_exact", True) else " (clique heuristique)")
+    if "encoding" in info:
+        print(f"encoding={info['encoding']} | symmetry={info.get('symmetry')}")
     if method == "cp_k":
         print(f"k={k} | status={info.get('status')} | colors_used={used} | valid={valid}")
     elif method == "cp_min":
-        print(f"LB={info.get('lb_clique')} UB={info.get('ub_dsatur')} | k*={info.get('k_found')} | colors_used={used} | valid={valid}")
+        print(f"{lb} UB={info.get('ub_dsatur')} | k*={info.get('k_found')} | colors_used={used} | valid={valid}")
+        print(f"strategy={info.get('strategy')} | " + " ".join(f"k={e['k']}:{e['status']}({e['time_s']:.2f}s)" for e in info.get("log", [])))
+    elif method == "cp_opt":
+        print(f"{lb} UB={info.get('ub_dsatur')} | status={info.get('status')} "
+              f"| bornes finales [{info.get('lower')}, {info.get('upper')}] gap={info.get('gap')} "
+              f"| colors_used={used} | valid={valid}")
+        for pt in info.get("trace", []):
+            print(f"  t={pt['time_s']:.3f}s  LB={pt['lower']}  UB={pt['upper']}")
+    elif method in ("tabu", "hybrid"):
+        print(f"k_min={info.get('k_min')} | DSATUR={info.get('k_start')} -> k={info.get('k_found')} "
+              f"| status={info.get('status')} | iterations={info.get('iterations')} "
+              f"| colors_used={used} | valid={valid}")
+        print(" ".join(f"k={kk}@{t:.2f}s" for t, kk in info.get("trace", [])))
     else:
         print(f"colors_used={used} | valid={valid}")
+    if "reduction" in info:
+        print(f"Réduction (k={info.get('k_peel')}): {ReductionReport(**info['reduction']).summary()} "
+              f"| temps total {info.get('wall_time_s', 0.0):.2f}s")
 
 # ==========================================================
 # Fonctions principales d’exécution
 # ==========================================================
-def run_method(G, pos, inst_name, method, timeout, k, show, save_fig, save_json_path):
-    # Exécute une méthode de coloration donnée
+def solve_graph(G, method, timeout, k=None, strategy="ascending", seed=1, num_workers=8, peel=False,
+                encoding="int", symmetry="clique"):
+    # Exécute une méthode de coloration donnée : (coloration ou None, infos)
+    # peel : cp_k / cp_min ne résolvent que le noyau de degré >= k
+    # encoding / symmetry : modèle CP-SAT des méthodes cp_*
     coloring = None
     info: dict = {}
     # Préparation des données pour les méthodes CP
-    if method in ("cp_k", "cp_min"):
+    if method in ("cp_k", "cp_min", "cp_opt"):
         nodes, edges = list(G.nodes()), list(G.edges())
 
     if method == "greedy":
@@ -218,28 +291,147 @@ def run_method(G, pos, inst_name, method, timeout, k, show, save_fig, save_json_
     elif method == "cp_k":
         if k is None:
             raise ValueError("cp_k nécessite k.")
-        coloring, si = solve_k_coloring(nodes, edges, k=k, timeout_s=timeout)
-        info = {"status": si.status, "time_s": si.time_s, "conflicts": si.conflicts, "branches": si.branches}
+        cq = max_clique(G)
+        coloring, si = solve_k_coloring(nodes, edges, k=k, timeout_s=timeout, num_workers=num_workers, peel=peel,
+                                        clique=cq.clique, encoding=encoding, symmetry=symmetry)
+        info = {"encoding": encoding, "symmetry": symmetry, "status": si.status, "time_s": si.time_s, "conflicts": si.conflicts, "branches": si.branches}
 
     elif method == "cp_min":
-        lb = lower_bound_clique(G)
+        # La clique donne k_min et fixe ses sommets aux couleurs 0..q-1
+        cq = max_clique(G)
+        lb = max(1, cq.size)
         ub = max(lb, upper_bound_dsatur(G))
 
-        best_k, coloring, log = solve_min_coloring(nodes, edges, k_min=lb, k_max=ub, timeout_per_k_s=timeout)
+        best_k, coloring, log = solve_min_coloring(nodes, edges, k_min=lb, k_max=ub, timeout_per_k_s=timeout,
+                                                   num_workers=num_workers, strategy=strategy, peel=peel,
+                                                   clique=cq.clique, encoding=encoding, symmetry=symmetry)
+        info = {
+            "encoding": encoding,
+            "symmetry": symmetry,
+            "lb_clique": lb,
+            "clique_exact": cq.exact,
+            "clique_time_s": cq.time_s,
+            "ub_dsatur": ub,
+            "k_found": best_k,
+            "strategy": strategy,
+            "log": [{"k": kk, "status": s.status, "time_s": s.time_s,
+                     "conflicts": s.conflicts, "branches": s.branches} for kk, s in log],
+        }
+
+    elif method == "cp_opt":
+        # Un seul modèle ; timeout = budget total (et non par valeur de k)
+        cq = max_clique(G)
+        lb = max(1, cq.size)
+        hint = dsatur_coloring(G)
+        ub = max(lb, colors_used(hint))
+
+        best_k, coloring, oi = solve_min_coloring_opt(nodes, edges, k_min=lb, k_max=ub, timeout_s=timeout,
+                                                      num_workers=num_workers, hint=hint, clique=cq.clique,
+                                                      encoding=encoding, symmetry=symmetry)
         info = {
+            "encoding": encoding,
+            "symmetry": symmetry,
             "lb_clique": lb,
+            "clique_exact": cq.exact,
+            "clique_time_s": cq.time_s,
             "ub_dsatur": ub,
             "k_found": best_k,
-            "log": [{"k": kk, "status": s.status, "time_s": s.time_s} for kk, s in log],
+            "status": oi.status,
+            "time_s": oi.time_s,
+            "lower": oi.lower,
+            "upper": oi.upper,
+            "gap": oi.gap,
+            "trace": [{"time_s": b.time_s, "lower": b.lower, "upper": b.upper} for b in oi.trace],
+        }
+
+    elif method in ("tabu", "hybrid"):
+        # Recherche locale : timeout = budget total ; arrêt dès k_min atteint
+        k_min = k if k is not None else lower_bound_clique(G)
+        best_k, coloring, li = local_search_coloring(G, method, time_budget_s=timeout, seed=seed, k_min=k_min)
+        info = {
+            "k_min": k_min,
+            "k_start": li.k_start,
+            "k_found": best_k,
+            "status": li.status,
+            "time_s": li.time_s,
+            "iterations": li.iterations,
+            "trace": [list(pt) for pt in li.trace],
         }
 
     else:
         raise ValueError(f"Méthode inconnue: {method}")
 
+    return coloring, info
+
+# ==========================================================
+# Prétraitement : réduction (degré < k) et décomposition
+# ==========================================================
+_STATUS_ORDER = ("MODEL_INVALID", "INFEASIBLE", "UNKNOWN", "NOT_FOUND", "FEASIBLE", "K_MIN_REACHED", "OPTIMAL", "OK")
+
+def merge_piece_infos(infos, pieces) -> dict:
+    # Infos d’une résolution par morceaux : pire statut, max des bornes,
+    # somme des temps et compteurs ; log / trace du plus gros morceau
+    solved = [(P, i) for P, i in zip(pieces, infos) if i is not None]
+    if not solved:
+        return {"status": "OK", "time_s": 0.0, "pieces": 0}
+    merged: dict = {}
+    statuses = [i["status"] for _, i in solved if i.get("status")]
+    if statuses:
+        merged["status"] = min(statuses, key=lambda st: _STATUS_ORDER.index(st) if st in _STATUS_ORDER else 0)
+    for key in ("time_s", "iterations", "conflicts", "branches"):
+        vals = [i[key] for _, i in solved if key in i]
+        if vals:
+            merged[key] = sum(vals)
+    for key in ("lb_clique", "ub_dsatur", "k_found", "lower", "upper", "k_min", "k_start"):
+        vals = [i[key] for _, i in solved if key in i]
+        if vals:
+            merged[key] = None if any(v is None for v in vals) else max(vals)
+    exact = [i["clique_exact"] for _, i in solved if "clique_exact" in i]
+    if exact:
+        merged["clique_exact"] = all(exact)
+    if merged.get("upper") is not None and merged.get("lower") is not None:
+        merged["gap"] = merged["upper"] - merged["lower"]
+    _, biggest = max(solved, key=lambda t: t[0].number_of_edges())
+    for key in ("encoding", "symmetry", "strategy", "log", "trace"):
+        if key in biggest:
+            merged[key] = biggest[key]
+    merged["pieces"] = len(solved)
+    return merged
+
+def solve_graph_decomposed(G, method, timeout, k=None, strategy="ascending", seed=1, blocks=False, jobs=None,
+                           encoding="int", symmetry="clique"):
+    # Réduction avec le k visé (cp_k, tabu/hybrid avec --k) ou la borne
+    # inférieure (valable pour tout k >= LB), puis composantes (et blocs)
+    # résolus en parallèle
+    k_peel = k if k is not None and method in ("cp_k", "tabu", "hybrid") else lower_bound_clique(G)
+    cpus = os.cpu_count() or 1
+    jobs = max(1, int(jobs if jobs is not None else cpus))
+    solve = functools.partial(solve_graph, method=method, timeout=timeout, k=k, strategy=strategy, seed=seed,
+                              num_workers=max(1, cpus // jobs), peel=True, encoding=encoding, symmetry=symmetry)
+    t0 = time.perf_counter()
+    coloring, infos, dec = solve_decomposed(G, solve, k=k_peel, blocks=blocks, jobs=jobs)
+    info = merge_piece_infos(infos, dec.pieces)
+    if info["pieces"] == 0:
+        # Tout a été retiré : la coloration gloutonne utilise au plus k_peel couleurs
+        used = colors_used(coloring)
+        info.update(status="OPTIMAL" if method.startswith("cp_") else "OK", k_found=used)
+    info["wall_time_s"] = time.perf_counter() - t0
+    info["k_peel"] = k_peel
+    info["reduction"] = asdict(dec.report)
+    return coloring, info
+
+def run_method(G, pos, inst_name, method, timeout, k, show, save_fig, save_json_path, strategy="ascending",
+               chromatic=None, seed=1, decompose=False, blocks=False, jobs=None, encoding="int", symmetry="clique"):
+    if decompose:
+        coloring, info = solve_graph_decomposed(G, method, timeout, k, strategy, seed, blocks, jobs,
+                                                encoding, symmetry)
+    else:
+        coloring, info = solve_graph(G, method, timeout, k, strategy, seed, encoding=encoding, symmetry=symmetry)
+
     valid = is_valid_coloring(G, coloring)
     used = colors_used(coloring) if coloring is not None else 0
 
-    print_result(G, inst_name, method, used, valid, info, k)
+    print_result(G, inst_name, method, used, valid, info, k, chromatic)
 
     # Affichage et visualisation
     title_after = f"{inst_name} | {method} | colors={used} | valid={valid}"
@@ -253,6 +445,7 @@ def run_method(G, pos, inst_name, method, timeout, k, show, save_fig, save_json_
             "k": k,
             "valid": valid,
             "colors_used": used,
+            "chromatic": chromatic,
             "info": info,
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
         }
@@ -260,8 +453,9 @@ def run_method(G, pos, inst_name, method, timeout, k, show, save_fig, save_json_
         print(f"JSON sauvegardé -> {save_json_path}")
 
 
-def run_compare(inst, timeout, show, save_fig, save_json_path):
-    methods = ["greedy", "dsatur", "cp_min"]
+def run_compare(inst, timeout, show, save_fig, save_json_path, strategy="ascending", seed=1,
+                decompose=False, blocks=False, jobs=None, encoding="int", symmetry="clique"):
+    methods = ["greedy", "dsatur", "tabu", "hybrid", "cp_min", "cp_opt"]
     for m in methods:
         fig_path = None
         js_path = None
@@ -274,17 +468,43 @@ def run_compare(inst, timeout, show, save_fig, save_json_path):
 
         show_now = show and (m == methods[-1])
         print(f"\n=== RUN {m} ===")
-        run_method(inst.graph, inst.pos, inst.name, m, timeout, None, show_now, fig_path, js_path)
+        run_method(inst.graph, lambda: inst.pos, inst.name, m, timeout, None, show_now, fig_path, js_path, strategy,
+                   inst.chromatic, seed, decompose, blocks, jobs, encoding, symmetry)
 
 
-def run_bench(timeout: float):
+def run_bench(timeout: float, jobs: Optional[int] = None, task_timeout: float = 120.0, fresh: bool = False,
+              encoding: Optional[str] = None, symmetry: Optional[str] = None,
+              cache_dir: Optional[str] = DEFAULT_CACHE_DIR, seed: int = 0):
     if run_benchmark is None:
         raise SystemExit("benchmark.py manquant: crée src/benchmark.py ou enlève la méthode benchmark.")
     out_csv = "outputs/benchmark.csv"
     print("\n=== BENCHMARK ===")
     print(f"Le CSV sera écrit ici : {out_csv}")
-    rows = run_benchmark(out_csv=out_csv, timeout_cp_min=timeout)
+    # Par défaut, chaque encodage CP est mesuré (bris de symétrie clique et precedence)
+    encodings = list(ENCODINGS) if encoding is None else [encoding]
+    symmetries = ["clique", "precedence"] if symmetry is None else [symmetry]
+    rows = run_benchmark(out_csv=out_csv, timeout_cp_min=timeout, jobs=jobs,
+                         task_timeout_s=task_timeout, resume=not fresh, cache_dir=cache_dir, local_seed=seed,
+                         cp_variants=[(e, s) for e in encodings for s in symmetries])
     print(f"Benchmark terminé ({len(rows)} lignes) -> {out_csv}")
+    for (family, method), (variant, colors, t) in sorted(best_cp_variants(rows).items()):
+        print(f"  {family:<10} {method:<7} meilleur encodage : {variant} ({colors:.1f} couleurs, {t:.2f}s en moyenne)")
+
+def run_scaling():
+    if run_dsatur_scaling is None:
+        raise SystemExit("benchmark.py manquant: crée src/benchmark.py ou enlève la méthode dsatur_scaling.")
+    out_csv = "outputs/dsatur_scaling.csv"
+    print("\n=== DSATUR SCALING ===")
+    rows = run_dsatur_scaling(out_csv=out_csv)
+    for r in rows:
+        if r["time_ref_s"] is None:
+            ref = "ref=-"
+        else:
+            ref = (f"nx={r['time_nx_s']:.3f}s ref={r['time_ref_s']:.3f}s (x{r['speedup']:.1f}) "
+                   f"| couleurs={r['colors_used']} ref={r['colors_ref']} "
+                   f"identique={r['same_coloring']}")
+        print(f"n={r['n']:>7} m={r['m']:>8} | heap={r['time_heap_s']:.3f}s {ref}")
+    print(f"CSV -> {out_csv}")
 
 # ==========================================================
 # Fonction principale
@@ -301,12 +521,20 @@ def main() -> None:
         save_fig = cfg["save_fig"]
         save_js = cfg["save_json"]
         k = cfg["k"]
+        strategy = cfg["strategy"]
+        encoding, symmetry = cfg["encoding"], cfg["symmetry"]
+        seed = cfg["seed"]
+        decompose, blocks, jobs = cfg["decompose"], cfg["blocks"], None
 
         if method == "benchmark":
-            run_bench(timeout)
+            run_bench(timeout, seed=seed)
+            return
+        if method == "dsatur_scaling":
+            run_scaling()
             return
 
-        inst = load_instance(cfg["instance"], n=cfg["n"], p=cfg["p"], seed=cfg["seed"], w=cfg["w"], h=cfg["h"])
+        inst = load_instance(cfg["instance"], n=cfg["n"], p=cfg["p"], seed=cfg["seed"], w=cfg["w"], h=cfg["h"],
+                             k=cfg["chi"], cache_dir=DEFAULT_CACHE_DIR)
 
     else:
         if args.method is None:
@@ -317,19 +545,31 @@ def main() -> None:
         save_fig = args.save_fig
         save_js = args.save_json
         k = args.k
+        strategy = args.strategy
+        encoding, symmetry = args.encoding or "int", args.symmetry or "clique"
+        seed = args.seed
+        decompose, blocks, jobs = args.decompose or args.blocks, args.blocks, args.jobs
+        cache_dir = None if args.no_cache else args.cache_dir
 
         if method == "benchmark":
-            run_bench(timeout)
+            run_bench(timeout, jobs=args.jobs, task_timeout=args.task_timeout, fresh=args.fresh,
+                      encoding=args.encoding, symmetry=args.symmetry, cache_dir=cache_dir, seed=args.seed)
+            return
+        if method == "dsatur_scaling":
+            run_scaling()
             return
 
         if args.instance is None:
-            raise SystemExit("Mode non interactif: --instance requis sauf pour benchmark.")
-        inst = load_instance(args.instance, n=args.n, p=args.p, seed=args.seed, w=args.w, h=args.h)
+            raise SystemExit("Mode non interactif: --instance requis sauf pour benchmark / dsatur_scaling.")
+        inst = load_instance(args.instance, n=args.n, p=args.p, seed=args.seed, w=args.w, h=args.h, k=args.chi,
+                             cache_dir=cache_dir)
 
     if method == "compare":
-        run_compare(inst, timeout=timeout, show=show, save_fig=save_fig, save_json_path=save_js)
+        run_compare(inst, timeout=timeout, show=show, save_fig=save_fig, save_json_path=save_js, strategy=strategy,
+                    seed=seed, decompose=decompose, blocks=blocks, jobs=jobs, encoding=encoding, symmetry=symmetry)
     else:
-        run_method(inst.graph, inst.pos, inst.name, method, timeout, k, show, save_fig, save_js)
+        run_method(inst.graph, lambda: inst.pos, inst.name, method, timeout, k, show, save_fig, save_js, strategy,
+                   inst.chromatic, seed, decompose, blocks, jobs, encoding, symmetry)
 
 
 if __name__ == "__main__":
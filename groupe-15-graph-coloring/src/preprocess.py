@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from graph_core import CSRGraph, as_csr
+from heuristics import greedy_colors
+
+Node = Hashable
+
+# --------------------------------------------------------------------
+# Réduction (kernelisation) pour un nombre de couleurs k donné :
+# un sommet de degré < k peut toujours être colorié en dernier (il lui
+# reste au moins une couleur libre parmi k). On le retire, ce qui fait
+# baisser le degré de ses voisins, et on recommence. Le "noyau" restant
+# est k-coloriable si et seulement si le graphe l’est.
+# Reconstruction : colorier les sommets retirés dans l’ordre inverse du
+# retrait (glouton), chacun a alors moins de k voisins déjà coloriés.
+# Reste valable pour tout k' >= k (k = borne inférieure pour cp_min).
+# --------------------------------------------------------------------
+def peel_low_degree(g: CSRGraph, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Retourne (masque des sommets du noyau, sommets retirés dans l’ordre)
+    n = g.n
+    indptr = g.indptr.tolist()
+    indices = g.indices.tolist()
+    deg = g.degrees().tolist()
+    removed = [d < k for d in deg]
+    stack = [v for v in range(n) if removed[v]]
+    order: List[int] = []
+    while stack:
+        v = stack.pop()
+        order.append(v)
+        for u in indices[indptr[v]:indptr[v + 1]]:
+            if not removed[u]:
+                deg[u] -= 1
+                if deg[u] < k:
+                    removed[u] = True
+                    stack.append(u)
+    kernel = ~np.array(removed, dtype=bool)
+    return kernel, np.array(order, dtype=np.int64)
+
+
+def extend_coloring(g: CSRGraph, colors: np.ndarray, order: np.ndarray) -> np.ndarray:
+    # Colorie les sommets retirés (couleur -1) en remontant l’ordre de retrait
+    return greedy_colors(g, order[::-1].tolist(), colors)
+
+# --------------------------------------------------------------------
+# Composantes connexes sur le graphe compact (parcours en largeur),
+# restreintes aux sommets de `mask` si fourni. Chaque composante est
+# un tableau d’indices trié ; les plus grandes en premier.
+# --------------------------------------------------------------------
+def connected_components(g: CSRGraph, mask: Optional[np.ndarray] = None) -> List[np.ndarray]:
+    n = g.n
+    indptr = g.indptr.tolist()
+    indices = g.indices.tolist()
+    seen = [False] * n if mask is None else (~np.asarray(mask, dtype=bool)).tolist()
+    comps: List[np.ndarray] = []
+    for s in range(n):
+        if seen[s]:
+            continue
+        seen[s] = True
+        comp = [s]
+        queue = deque([s])
+        while queue:
+            v = queue.popleft()
+            for u in indices[indptr[v]:indptr[v + 1]]:
+                if not seen[u]:
+                    seen[u] = True
+                    comp.append(u)
+                    queue.append(u)
+        comps.append(np.sort(np.array(comp, dtype=np.int64)))
+    comps.sort(key=len, reverse=True)
+    return comps
+
+# --------------------------------------------------------------------
+# Décomposition complète : noyau (degré < k retiré), composantes connexes
+# du noyau, puis (option) blocs 2-connexes de chaque composante.
+# Deux blocs partagent au plus un sommet (point d’articulation) et forment
+# un arbre : les blocs sont rangés en largeur d’abord, chacun rattaché à
+# un bloc précédent par un seul sommet (`links`). À la reconstruction,
+# les couleurs d’un bloc sont permutées (échange de deux couleurs) pour
+# que ce sommet garde la couleur déjà attribuée.
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class ReductionReport:
+    n: int
+    m: int
+    peeled: int                 # sommets retirés (degré < k)
+    kernel_n: int
+    kernel_m: int
+    components: int             # composantes connexes du noyau
+    pieces: int                 # morceaux résolus (composantes ou blocs)
+    largest_n: int              # taille du plus gros morceau
+    largest_m: int
+
+    @property
+    def shrink(self) -> float:
+        # Part des sommets qui restent dans le plus gros morceau
+        return self.largest_n / self.n if self.n else 0.0
+
+    def summary(self) -> str:
+        return (f"n={self.n} m={self.m} -> noyau n={self.kernel_n} m={self.kernel_m} "
+                f"(retirés={self.peeled}) | composantes={self.components} morceaux={self.pieces} "
+                f"| plus gros morceau n={self.largest_n} m={self.largest_m} ({self.shrink:.0%} des sommets)")
+
+
+@dataclass(frozen=True)
+class Decomposition:
+    g: CSRGraph
+    order: np.ndarray                   # sommets retirés, dans l’ordre
+    pieces: List[nx.Graph]              # morceaux à résoudre, parents avant enfants
+    links: List[Optional[Node]]         # sommet partagé avec un morceau précédent
+    report: ReductionReport
+
+    def assemble(self, colorings: List[Dict[Node, int]]) -> Dict[Node, int]:
+        coloring: Dict[Node, int] = {}
+        for col, link in zip(colorings, self.links):
+            col = dict(col)
+            if link is not None and col[link] != coloring[link]:
+                a, b = col[link], coloring[link]
+                col = {v: b if c == a else a if c == b else c for v, c in col.items()}
+            coloring.update(col)
+        colors = extend_coloring(self.g, self.g.colors_array(coloring), self.order)
+        return self.g.coloring_dict(colors)
+
+
+def _blocks(H: nx.Graph) -> Tuple[List[nx.Graph], List[Optional[Node]]]:
+    blocks = [set(b) for b in nx.biconnected_components(H)]
+    if len(blocks) <= 1:
+        return [H], [None]
+    of_vertex: Dict[Node, List[int]] = {}
+    for i, b in enumerate(blocks):
+        for v in b:
+            of_vertex.setdefault(v, []).append(i)
+
+    pieces: List[nx.Graph] = []
+    links: List[Optional[Node]] = []
+    visited = {0}
+    queue = deque([(0, None)])
+    while queue:
+        i, link = queue.popleft()
+        pieces.append(H.subgraph(blocks[i]).copy())
+        links.append(link)
+        for v in blocks[i]:
+            for j in of_vertex[v]:
+                if j not in visited:
+                    visited.add(j)
+                    queue.append((j, v))
+    return pieces, links
+
+
+def decompose(G, k: Optional[int] = None, blocks: bool = False) -> Decomposition:
+    g = as_csr(G)
+    if k is not None and k >= 1:
+        kernel, order = peel_low_degree(g, k)
+    else:
+        kernel, order = np.ones(g.n, dtype=bool), np.zeros(0, dtype=np.int64)
+
+    pieces: List[nx.Graph] = []
+    links: List[Optional[Node]] = []
+    comps = connected_components(g, kernel)
+    for comp in comps:
+        H = g.subgraph(comp).to_networkx()
+        if blocks and H.number_of_nodes() > 2:
+            bp, bl = _blocks(H)
+            pieces.extend(bp)
+            links.extend(bl)
+        else:
+            pieces.append(H)
+            links.append(None)
+
+    largest = max(pieces, key=lambda P: (P.number_of_nodes(), P.number_of_edges()), default=None)
+    kernel_idx = np.flatnonzero(kernel)
+    report = ReductionReport(
+        n=g.n,
+        m=g.m,
+        peeled=len(order),
+        kernel_n=len(kernel_idx),
+        kernel_m=g.subgraph(kernel_idx).m,
+        components=len(comps),
+        pieces=len(pieces),
+        largest_n=largest.number_of_nodes() if largest is not None else 0,
+        largest_m=largest.number_of_edges() if largest is not None else 0,
+    )
+    return Decomposition(g, order, pieces, links, report)
+
+# --------------------------------------------------------------------
+# Résolution morceau par morceau, en parallèle (un processus par
+# morceau, au plus `jobs` à la fois, les plus gros lancés d’abord).
+# `solve` : fonction picklable nx.Graph -> (coloration ou None, infos).
+# Les morceaux sans arête sont coloriés directement (couleur 0).
+# --------------------------------------------------------------------
+def solve_pieces(pieces: List[nx.Graph], solve: Callable[[nx.Graph], Tuple[Optional[Dict[Node, int]], Any]],
+                 jobs: int = 1) -> List[Tuple[Optional[Dict[Node, int]], Any]]:
+    results: List[Optional[Tuple[Optional[Dict[Node, int]], Any]]] = [None] * len(pieces)
+    todo = []
+    for i, P in enumerate(pieces):
+        if P.number_of_edges() == 0:
+            results[i] = ({v: 0 for v in P.nodes()}, None)
+        else:
+            todo.append(i)
+    todo.sort(key=lambda i: -pieces[i].number_of_edges())
+
+    if jobs <= 1 or len(todo) <= 1:
+        for i in todo:
+            results[i] = solve(pieces[i])
+    else:
+        ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=ctx) as ex:
+            futures = {i: ex.submit(solve, pieces[i]) for i in todo}
+            for i, fut in futures.items():
+                results[i] = fut.result()
+    return results  # type: ignore[return-value]
+
+
+def solve_decomposed(
+    G,
+    solve: Callable[[nx.Graph], Tuple[Optional[Dict[Node, int]], Any]],
+    k: Optional[int] = None,
+    blocks: bool = False,
+    jobs: int = 1,
+) -> Tuple[Optional[Dict[Node, int]], List[Any], Decomposition]:
+    # Coloration complète (None si un morceau n’a pas de solution),
+    # infos de chaque morceau (None pour les morceaux triviaux), décomposition
+    dec = decompose(G, k, blocks)
+    results = solve_pieces(dec.pieces, solve, jobs)
+    infos = [info for _, info in results]
+    if any(col is None for col, _ in results):
+        return None, infos, dec
+    return dec.assemble([col for col, _ in results]), infos, dec
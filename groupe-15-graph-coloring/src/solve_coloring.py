@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from typing import Dict, Hashable, List, Optional, Tuple
 
+import numpy as np
 from ortools.sat.python import cp_model
 
+from clique import clique_cover
+from graph_core import CSRGraph
+from heuristics import dsatur_colors
+from preprocess import extend_coloring, peel_low_degree
+
 Node = Hashable
 Edge = Tuple[Node, Node]
 
@@ -53,10 +60,186 @@ def _greedy_hint(nodes: List[Node], edges: List[Edge]) -> Dict[Node, int]:
         col[v] = c
     return col
 
+def _csr_graph(nodes: List[Node], edges: List[Edge]) -> CSRGraph:
+    # Graphe compact (étiquettes = nodes) à partir des listes du modèle
+    index = {v: i for i, v in enumerate(nodes)}
+    pairs = [(index[u], index[v]) for u, v in edges if u in index and v in index]
+    src = np.fromiter((u for u, _ in pairs), dtype=np.int64, count=len(pairs))
+    dst = np.fromiter((v for _, v in pairs), dtype=np.int64, count=len(pairs))
+    return CSRGraph.from_edges(len(nodes), src, dst, nodes)
+
+# --------------------------------------------------------------------
+# Bris de symétrie par une clique : ses q sommets ont forcément des
+# couleurs distinctes, on les fixe à 0..q-1 (sans clique, seul le
+# premier sommet est fixé à 0). Le hint est renuméroté en conséquence.
+# --------------------------------------------------------------------
+def _fixed_vertices(nodes: List[Node], clique: Optional[List[Node]], c: Dict[Node, object]) -> List[Node]:
+    fixed = [v for v in (clique or []) if v in c]
+    return fixed or [nodes[0]]
+
+
+def _align_hint(hint: Dict[Node, int], fixed: List[Node], order: Optional[List[Node]] = None) -> Optional[Dict[Node, int]]:
+    # fixed[i] reçoit la couleur i, les autres couleurs du hint suivent
+    # dans l’ordre de première apparition le long de `order` (précédence),
+    # puis dans l’ordre croissant ; None si le hint ne donne pas des
+    # couleurs distinctes aux sommets fixés (il contredirait le bris de
+    # symétrie)
+    order = order or []
+    first = [hint.get(v) for v in fixed]
+    if None in first or len(set(first)) < len(first):
+        return None
+    perm = {hv: i for i, hv in enumerate(first)}
+    for hv in [hint.get(v) for v in order] + sorted(set(hint.values())):
+        if hv is not None and hv not in perm:
+            perm[hv] = len(perm)
+    return {v: perm[hv] for v, hv in hint.items()}
+
+# --------------------------------------------------------------------
+# Encodages du modèle CP-SAT (option encoding) :
+# -int     : une variable entière c[v] dans 0..k-1, c[u] != c[v] par arête
+# -alldiff : mêmes variables, arêtes couvertes par des cliques maximales
+#            (clique.clique_cover), un AllDifferent par clique
+# -bool    : x[v][i] = "v a la couleur i", AddExactlyOne par sommet,
+#            AddAtMostOne par clique de la couverture et par couleur
+# Bris de symétrie (option symmetry) :
+# -first      : premier sommet fixé à la couleur 0
+# -clique     : sommets de la clique fixés à 0..q-1 (premier sommet sinon)
+# -precedence : clique fixée, puis précédence des couleurs le long d’un
+#               ordre (clique puis degrés décroissants) : un sommet ne
+#               prend la couleur i que si i-1 est déjà utilisée avant lui.
+#               Une seule coloration par partition en classes.
+# --------------------------------------------------------------------
+ENCODINGS = ("int", "alldiff", "bool")
+SYMMETRY_MODES = ("first", "clique", "precedence")
+
+
+class _ColorModel:
+    def __init__(self, model: cp_model.CpModel, nodes: List[Node], edges: List[Edge], k: int,
+                 encoding: str = "int", symmetry: Optional[str] = "clique",
+                 clique: Optional[List[Node]] = None):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Encodage inconnu: {encoding} ({'/'.join(ENCODINGS)})")
+        if symmetry is not None and symmetry not in SYMMETRY_MODES:
+            raise ValueError(f"Bris de symétrie inconnu: {symmetry} ({'/'.join(SYMMETRY_MODES)})")
+        self.model = model
+        self.encoding = encoding
+        self.k = k
+        if encoding == "bool":
+            self.x = {v: [model.NewBoolVar(f"x_{v}_{i}") for i in range(k)] for v in nodes}
+            for v in nodes:
+                model.AddExactlyOne(self.x[v])
+            self.c = self.x
+        else:
+            self.c = {v: model.NewIntVar(0, k - 1, f"c_{v}") for v in nodes}
+
+        if encoding == "int":
+            for u, v in edges:
+                if u != v and u in self.c and v in self.c:
+                    model.Add(self.c[u] != self.c[v])
+        else:
+            g = _csr_graph(nodes, edges)
+            for C in clique_cover(g):
+                vs = [g.nodes[i] for i in C]
+                if encoding == "alldiff":
+                    model.AddAllDifferent([self.c[v] for v in vs])
+                else:
+                    for i in range(k):
+                        model.AddAtMostOne([self.x[v][i] for v in vs])
+
+        self.fixed: List[Node] = []
+        self.order: List[Node] = []
+        if symmetry is None:
+            return
+        self.fixed = [nodes[0]] if symmetry == "first" else _fixed_vertices(nodes, clique, self.c)
+        for i, v in enumerate(self.fixed):
+            self._set(v, i)
+        if symmetry == "precedence":
+            deg = {v: 0 for v in nodes}
+            for u, v in edges:
+                if u != v and u in deg and v in deg:
+                    deg[u] += 1; deg[v] += 1
+            fixed = set(self.fixed)
+            self.order = self.fixed + sorted((v for v in nodes if v not in fixed), key=lambda v: -deg[v])
+            self._precedence(len(self.fixed))
+
+    def _set(self, v: Node, i: int) -> None:
+        if self.encoding == "bool":
+            self.model.Add(self.x[v][i] == 1)
+        else:
+            self.model.Add(self.c[v] == i)
+
+    def _precedence(self, q: int) -> None:
+        model, k = self.model, self.k
+        rest = self.order[q:]
+        if self.encoding != "bool":
+            # top = plus grande couleur utilisée jusqu’ici
+            top = model.NewConstant(q - 1)
+            for j, v in enumerate(rest):
+                model.Add(self.c[v] <= top + 1)
+                if j + 1 < len(rest):
+                    nxt = model.NewIntVar(0, k - 1, f"top_{j}")
+                    model.AddMaxEquality(nxt, [top, self.c[v]])
+                    top = nxt
+            return
+        # used[i] : couleur i déjà utilisée (True/False connus, sinon booléen)
+        used: List[object] = [i < q for i in range(k)]
+        for j, v in enumerate(rest):
+            for i in range(1, k):
+                if used[i - 1] is False:
+                    model.Add(self.x[v][i] == 0)
+                elif used[i - 1] is not True:
+                    model.AddImplication(self.x[v][i], used[i - 1])
+            if j + 1 < len(rest):
+                for i in range(k):
+                    if used[i] is True:
+                        continue
+                    if used[i] is False:
+                        used[i] = self.x[v][i]
+                    else:
+                        u = model.NewBoolVar(f"used_{j}_{i}")
+                        model.AddMaxEquality(u, [used[i], self.x[v][i]])
+                        used[i] = u
+
+    def bound_by(self, max_color) -> None:
+        # c[v] <= max_color pour tout sommet (modèle d’optimisation)
+        for v, cv in self.c.items():
+            if self.encoding == "bool":
+                for i in range(1, self.k):
+                    self.model.Add(max_color >= i).OnlyEnforceIf(cv[i])
+            else:
+                self.model.Add(cv <= max_color)
+
+    def add_hint(self, hint: Dict[Node, int]) -> bool:
+        # Hint renuméroté selon les sommets fixés (et la précédence) ;
+        # False s’il est incompatible et n’a pas été ajouté
+        aligned = _align_hint(hint, self.fixed, self.order) if self.fixed else hint
+        if aligned is None or max(aligned.values(), default=-1) >= self.k:
+            return False
+        for v, hv in aligned.items():
+            if v not in self.c:
+                continue
+            if self.encoding == "bool":
+                for i in range(self.k):
+                    self.model.AddHint(self.x[v][i], i == hv)
+            else:
+                self.model.AddHint(self.c[v], int(hv))
+        return True
+
+    def values(self, solver: cp_model.CpSolver) -> Dict[Node, int]:
+        if self.encoding == "bool":
+            return {v: next(i for i, b in enumerate(xv) if solver.BooleanValue(b)) for v, xv in self.x.items()}
+        return {v: int(solver.Value(cv)) for v, cv in self.c.items()}
+
 # --------------------------------------------------------------------
 # Résolution du problème de k-coloration :
 # -chaque noeud a une couleur entre 0 et k-1
 # -2 nœuds adjacents ne peuvent pas avoir la même couleur
+# -peel=True : les sommets de degré < k sont retirés itérativement
+#  (preprocess.peel_low_degree), CP-SAT ne voit que le noyau, puis les
+#  sommets retirés sont coloriés en glouton
+# -clique : clique du graphe (clique.max_clique), fixée à 0..q-1 pour
+#  briser les symétries ; q > k prouve l’infaisabilité sans CP-SAT
+# -encoding / symmetry : voir _ColorModel
 # --------------------------------------------------------------------
 def solve_k_coloring(
     nodes: List[Node],
@@ -66,35 +249,52 @@ def solve_k_coloring(
     num_workers: int = 8,
     symmetry_breaking: bool = True,
     use_hints: bool = True,
+    hint: Optional[Dict[Node, int]] = None,
+    peel: bool = False,
+    clique: Optional[List[Node]] = None,
+    encoding: str = "int",
+    symmetry: str = "clique",
 ) -> Tuple[Optional[Dict[Node, int]], SolveInfo]:
     #Résout un problème de k-coloration avec CP-SAT.
+    # hint : solution initiale fournie (sinon gloutonne), même partiellement hors de [0, k-1]
     if k < 1:
         raise ValueError("k must be >= 1")
 
     nodes = list(nodes)
     if not nodes:
         return {}, SolveInfo("OPTIMAL", 0.0, 0, 0)
+    if clique is not None and len(clique) > k:
+        return None, SolveInfo("INFEASIBLE", 0.0, 0, 0)
 
     edges = list(edges)
-    # Création du modèle CP-SAT
+    if peel:
+        g = _csr_graph(nodes, edges)
+        kernel, order = peel_low_degree(g, k)
+        if len(order):
+            kept = set(g.nodes[i] for i in np.flatnonzero(kernel).tolist())
+            sol, info = solve_k_coloring(
+                [v for v in nodes if v in kept],
+                [(u, v) for u, v in edges if u in kept and v in kept],
+                k, timeout_s, num_workers, symmetry_breaking, use_hints,
+                None if hint is None else {v: hv for v, hv in hint.items() if v in kept},
+                clique=None if clique is None else [v for v in clique if v in kept],
+                encoding=encoding,
+                symmetry=symmetry,
+            )
+            if sol is None:
+                return None, info
+            return g.coloring_dict(extend_coloring(g, g.colors_array(sol), order)), info
+    # Création du modèle CP-SAT : variables, contraintes "2 sommets adjacents
+    # ont des couleurs différentes" et bris de symétrie selon l’encodage
     model = cp_model.CpModel()
-    c = {v: model.NewIntVar(0, k - 1, f"c_{v}") for v in nodes}
-
-     # on fixe arbitrairement la couleur du premier nœud à 0
-    if symmetry_breaking:
-        model.Add(c[nodes[0]] == 0)
-
-    # Contraintes: 2 sommets adjacents doivent avoir des couleurs différentes
-    for u, v in edges:
-        if u != v and u in c and v in c:
-            model.Add(c[u] != c[v])
+    cm = _ColorModel(model, nodes, edges, k, encoding, symmetry if symmetry_breaking else None, clique)
 
-    # Ajout de hints (solution initiale) via une heuristique gloutonne(greedy)
+    # Ajout de hints (solution initiale) : fournie, ou via une heuristique gloutonne(greedy)
     if use_hints:
-        hint = _greedy_hint(nodes, edges)
+        if hint is None:
+            hint = _greedy_hint(nodes, edges)
         if max(hint.values(), default=-1) < k:
-            for v, hv in hint.items():
-                model.AddHint(c[v], int(hv))
+            cm.add_hint(hint)
 
     # Paramétrage du solveur
     solver = cp_model.CpSolver()
@@ -112,12 +312,40 @@ def solve_k_coloring(
     )
     # Si une solution est trouvée: on la retourne
     if st in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        return {v: int(solver.Value(c[v])) for v in nodes}, info
+        return cm.values(solver), info
     return None, info
 
 # --------------------------------------------------------------------
-# Recherche de la coloration minimale :
-# on teste successivement k=k_min, k_min+1,k_max
+# Hint pour k couleurs à partir d’une coloration qui en utilise plus :
+# chaque sommet de couleur >= k (classe du haut) est recolorié avec la
+# couleur < k la moins présente dans son voisinage (0 conflit si possible).
+# Le hint peut rester en conflit : CP-SAT le répare ou l’abandonne.
+# --------------------------------------------------------------------
+def _recolor_hint(coloring: Dict[Node, int], adj: Dict[Node, set], k: int) -> Dict[Node, int]:
+    hint = dict(coloring)
+    top = sorted((v for v, col in hint.items() if col >= k), key=lambda v: -len(adj[v]))
+    for v in top:
+        counts = [0] * k
+        for u in adj[v]:
+            cu = hint[u]
+            if cu < k:
+                counts[cu] += 1
+        hint[v] = counts.index(min(counts))
+    return hint
+
+
+SEARCH_STRATEGIES = ("ascending", "descending", "bisection")
+
+# --------------------------------------------------------------------
+# Recherche de la coloration minimale entre k_min et k_max :
+# -ascending  : k = k_min, k_min+1, ... ; le premier k faisable est minimal
+# -descending : k = k_max, puis (couleurs utilisées - 1) tant que c’est faisable
+# -bisection  : dichotomie sur [k_min, k_max]
+# peel=True : chaque k essayé ne résout que le noyau (degré >= k)
+# clique : fixée dans chaque modèle ; k_min est relevé à sa taille
+# encoding / symmetry : modèle de chaque k (voir _ColorModel)
+# En descending / bisection, la dernière solution trouvée (classe du haut
+# recoloriée) sert de hint à l’appel suivant.
 # --------------------------------------------------------------------
 def solve_min_coloring(
     nodes: List[Node],
@@ -129,8 +357,15 @@ def solve_min_coloring(
     timeout_per_k_s: float = 3.0,
     num_workers: int = 8,
     symmetry_breaking: bool = True,
+    strategy: str = "ascending",
+    peel: bool = False,
+    clique: Optional[List[Node]] = None,
+    encoding: str = "int",
+    symmetry: str = "clique",
 ) -> Tuple[Optional[int], Optional[Dict[Node, int]], List[Tuple[int, SolveInfo]]]:
-    # Recherche la coloration minimale en augmentant progressivement k.
+    # Recherche la coloration minimale ; log : (k, SolveInfo) pour chaque k essayé.
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"Stratégie inconnue: {strategy} ({'/'.join(SEARCH_STRATEGIES)})")
     nodes = list(nodes)
     if not nodes:
         return 0, {}, []
@@ -138,13 +373,14 @@ def solve_min_coloring(
     if k_max is None:
         k_max = len(nodes)
 
-    k_min = max(1, int(k_min))
+    k_min = max(1, int(k_min), len(clique or []))
     k_max = min(int(k_max), len(nodes))
     if k_min > k_max:
         return None, None, []
 
     log: List[Tuple[int, SolveInfo]] = []
-    for k in range(k_min, k_max + 1):
+
+    def solve(k: int, hint: Optional[Dict[Node, int]]):
         sol, info = solve_k_coloring(
             nodes=nodes,
             edges=edges,
@@ -153,11 +389,174 @@ def solve_min_coloring(
             num_workers=num_workers,
             symmetry_breaking=symmetry_breaking,
             use_hints=True,
+            hint=hint,
+            peel=peel,
+            clique=clique,
+            encoding=encoding,
+            symmetry=symmetry,
         )
         log.append((k, info))
-        # Dès qu’une solution existe, k est minimal
+        return sol
+
+    if strategy == "ascending":
+        for k in range(k_min, k_max + 1):
+            sol = solve(k, None)
+            # Dès qu’une solution existe, k est minimal
+            if sol is not None:
+                return k, sol, log
+        # Aucune solution trouvée dans les bornes
+        return None, None, log
+
+    adj: Dict[Node, set] = {v: set() for v in nodes}
+    for u, v in edges:
+        if u != v and u in adj and v in adj:
+            adj[u].add(v); adj[v].add(u)
+
+    best_k: Optional[int] = None
+    best: Optional[Dict[Node, int]] = None
+    lo, hi = k_min, k_max
+    while lo <= hi:
+        k = hi if strategy == "descending" else (lo + hi) // 2
+        sol = solve(k, _recolor_hint(best, adj, k) if best is not None else None)
         if sol is not None:
-            return k, sol, log
+            # La solution peut utiliser moins de k couleurs
+            best, best_k = sol, len(set(sol.values()))
+            hi = best_k - 1
+        elif strategy == "descending":
+            # Infaisable (ou non prouvé dans le temps imparti) : on s’arrête
+            break
+        else:
+            lo = k + 1
+    return best_k, best, log
+
+
+# --------------------------------------------------------------------
+# Optimisation en un seul modèle :
+# -k_max couleurs disponibles, une variable "max_color" >= c[v] pour tout v
+# -objectif : minimiser max_color (nombre de couleurs = max_color + 1)
+# Le solveur garde tout ce qu’il apprend d’une borne à l’autre, au lieu
+# de reconstruire un modèle par valeur de k.
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class BoundPoint:
+    time_s: float
+    lower: int                  # borne inférieure prouvée sur le nombre de couleurs
+    upper: Optional[int]        # meilleure solution connue (None avant la 1re)
+
+
+@dataclass(frozen=True)
+class OptInfo:
+    status: str
+    time_s: float
+    conflicts: int
+    branches: int
+    lower: int
+    upper: Optional[int]
+    trace: List[BoundPoint] = field(default_factory=list)  # évolution LB/UB
+
+    @property
+    def gap(self) -> Optional[int]:
+        return None if self.upper is None else self.upper - self.lower
+
+
+class _BoundTracker(cp_model.CpSolverSolutionCallback):
+    # Enregistre chaque amélioration de la borne supérieure (solution) ou
+    # inférieure (best_bound_callback) avec son instant
+    def __init__(self, lower: int):
+        super().__init__()
+        self.t0 = time.perf_counter()
+        self.lower = lower
+        self.upper: Optional[int] = None
+        self.points: List[BoundPoint] = []
+
+    def _record(self) -> None:
+        self.points.append(BoundPoint(time.perf_counter() - self.t0, self.lower, self.upper))
+
+    def on_solution_callback(self) -> None:
+        self.upper = int(round(self.ObjectiveValue())) + 1
+        self._record()
+
+    def on_bound(self, bound: float) -> None:
+        lower = int(np.ceil(bound - 1e-9)) + 1
+        if lower > self.lower:
+            self.lower = lower
+            self._record()
+
+    def finish(self, lower: int, upper: Optional[int]) -> List[BoundPoint]:
+        # Bornes finales du solveur (après Solve), ajoutées comme dernier point
+        self.lower, self.upper = lower, upper
+        self._record()
+        return self.points
+
+
+def _dsatur_hint(nodes: List[Node], edges: List[Edge]) -> Dict[Node, int]:
+    # DSATUR sur la représentation compacte : hint et borne supérieure
+    g = _csr_graph(nodes, edges)
+    return g.coloring_dict(dsatur_colors(g))
+
+
+def solve_min_coloring_opt(
+    nodes: List[Node],
+    edges: List[Edge],
+    k_min: int = 1,
+    k_max: Optional[int] = None,
+    timeout_s: float = 10.0,
+    num_workers: int = 8,
+    symmetry_breaking: bool = True,
+    hint: Optional[Dict[Node, int]] = None,
+    clique: Optional[List[Node]] = None,
+    encoding: str = "int",
+    symmetry: str = "clique",
+) -> Tuple[Optional[int], Optional[Dict[Node, int]], OptInfo]:
+    # Nombre chromatique en un seul appel CP-SAT.
+    # Par défaut k_max et le hint viennent de DSATUR (solution déjà valide).
+    # clique : fixée à 0..q-1 (bris de symétrie), k_min relevé à sa taille.
+    nodes = list(nodes)
+    if not nodes:
+        return 0, {}, OptInfo("OPTIMAL", 0.0, 0, 0, 0, 0)
+
+    edges = list(edges)
+    if hint is None:
+        hint = _dsatur_hint(nodes, edges)
+    hint_k = max(hint.values(), default=-1) + 1
+    if k_max is None:
+        k_max = hint_k if hint_k > 0 else len(nodes)
+    k_max = min(int(k_max), len(nodes))
+    k_min = max(1, int(k_min), len(clique or []))
+    if k_min > k_max:
+        return None, None, OptInfo("INFEASIBLE", 0.0, 0, 0, k_min, None)
+
+    model = cp_model.CpModel()
+    cm = _ColorModel(model, nodes, edges, k_max, encoding, symmetry if symmetry_breaking else None, clique)
+    max_color = model.NewIntVar(k_min - 1, k_max - 1, "max_color")
+    cm.bound_by(max_color)
+
+    # Hint DSATUR (si compatible avec k_max), renuméroté pour les sommets fixés
+    if 0 < hint_k <= k_max and cm.add_hint(hint):
+        model.AddHint(max_color, hint_k - 1)
+    model.Minimize(max_color)
 
-    # Aucune solution trouvée dans les bornes
-    return None, None, log
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = float(timeout_s)
+    solver.parameters.num_search_workers = int(num_workers)
+    tracker = _BoundTracker(k_min)
+    solver.best_bound_callback = tracker.on_bound
+
+    st = solver.Solve(model, tracker)
+    found = st in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    upper = int(solver.Value(max_color)) + 1 if found else None
+    lower = upper if st == cp_model.OPTIMAL else max(tracker.lower, int(np.ceil(solver.BestObjectiveBound() - 1e-9)) + 1)
+    trace = tracker.finish(lower, upper)
+
+    info = OptInfo(
+        status=_status(st),
+        time_s=float(solver.WallTime()),
+        conflicts=int(solver.NumConflicts()),
+        branches=int(solver.NumBranches()),
+        lower=lower,
+        upper=upper,
+        trace=trace,
+    )
+    if not found:
+        return None, None, info
+    return upper, cm.values(solver), info
@@ -0,0 +1,86 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from graph_core import CSRGraph
+from heuristics import dsatur_coloring, dsatur_coloring_reference, dsatur_colors
+
+
+def _edge_set(g: CSRGraph):
+    src, dst = g.edge_arrays()
+    return set(zip(src.tolist(), dst.tolist()))
+
+
+# ---------------------------------------------------------------------------
+# Construction CSR : doublons fusionnés, boucles ignorées
+# ---------------------------------------------------------------------------
+def test_from_edges_dedup_and_self_loops():
+    src = [0, 1, 1, 2, 2, 3, 0, 4]
+    dst = [1, 0, 1, 3, 3, 2, 1, 4]
+    g = CSRGraph.from_edges(5, src, dst)
+    assert g.n == 5
+    assert g.m == 2
+    assert _edge_set(g) == {(0, 1), (2, 3)}
+    assert g.degrees().tolist() == [1, 1, 1, 1, 0]
+    for i in range(g.n):
+        nb = g.neighbors(i).tolist()
+        assert nb == sorted(set(nb)) and i not in nb
+
+
+def test_from_edges_matches_networkx_on_random_multigraph():
+    rng = np.random.default_rng(1)
+    for n in (1, 7, 60):
+        src, dst = rng.integers(0, n, 5 * n), rng.integers(0, n, 5 * n)
+        g = CSRGraph.from_edges(n, src, dst)
+        G = nx.Graph()
+        G.add_nodes_from(range(n))
+        G.add_edges_from((u, v) for u, v in zip(src.tolist(), dst.tolist()) if u != v)
+        assert g.m == G.number_of_edges()
+        assert _edge_set(g) == {(min(u, v), max(u, v)) for u, v in G.edges()}
+        # indices symétriques : chaque arête présente dans les deux sens
+        assert len(g.indices) == 2 * g.m
+
+
+def test_from_edges_rejects_wrong_label_count():
+    with pytest.raises(ValueError):
+        CSRGraph.from_edges(3, [0], [1], nodes=["a", "b"])
+
+
+# ---------------------------------------------------------------------------
+# Conversions NetworkX <-> CSR
+# ---------------------------------------------------------------------------
+def test_networkx_round_trip():
+    G = nx.relabel_nodes(nx.gnp_random_graph(40, 0.15, seed=3), lambda i: f"v{i}")
+    G.add_node("isolé")
+    g = CSRGraph.from_networkx(G)
+    assert g.nodes == list(G.nodes())
+    assert g.n == G.number_of_nodes() and g.m == G.number_of_edges()
+    H = g.to_networkx()
+    assert list(H.nodes()) == list(G.nodes())
+    assert {frozenset(e) for e in H.edges()} == {frozenset(e) for e in G.edges()}
+    assert CSRGraph.from_networkx(H).indices.tolist() == g.indices.tolist()
+
+
+def test_is_valid():
+    g = CSRGraph.from_networkx(nx.cycle_graph(5))
+    assert g.is_valid([0, 1, 0, 1, 2])
+    assert not g.is_valid([0, 1, 0, 1, 0])       # arête (4, 0) monochrome
+    assert not g.is_valid([0, 1, 0, 1])          # coloration incomplète
+    assert not g.is_valid([0, 1, 0, 1, -1])      # sommet non colorié
+    d = {0: 0, 1: 1, 2: 0, 3: 1, 4: 2}
+    assert g.coloring_dict(g.colors_array(d)) == d
+
+
+# ---------------------------------------------------------------------------
+# DSATUR (file de priorité) contre la version d’origine : même coloration
+# sur des graphes étiquetés 0..n-1 dans l’ordre (mêmes départages)
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("seed", range(10))
+def test_dsatur_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 300))
+    m = int(rng.integers(0, 4 * n))
+    g = CSRGraph.from_edges(n, rng.integers(0, n, m), rng.integers(0, n, m))
+    assert g.is_valid(dsatur_colors(g))
+    G = g.to_networkx()
+    assert dsatur_coloring(G) == dsatur_coloring_reference(G)
@@ -0,0 +1,149 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from benchmark import is_valid_coloring
+from graph_core import CSRGraph
+from heuristics import dsatur_coloring, greedy_colors
+from preprocess import _blocks, decompose, extend_coloring, peel_low_degree, solve_decomposed
+
+
+def _dsatur(P: nx.Graph):
+    # Solveur de morceau (picklable) : coloration DSATUR et nombre de couleurs
+    col = dsatur_coloring(P)
+    return col, max(col.values()) + 1
+
+
+def _ncolors(coloring) -> int:
+    return len(set(coloring.values()))
+
+
+def _random_graph(seed: int) -> nx.Graph:
+    """
+    Plusieurs composantes, chacune faite de blocs denses reliés par des
+    points d’articulation, avec des arbres pendants accrochés un peu partout.
+    """
+    rng = random.Random(seed)
+    G = nx.Graph()
+    nxt = 0
+    for _ in range(rng.randint(2, 4)):
+        prev = None
+        for _ in range(rng.randint(1, 4)):
+            size = rng.randint(3, 9)
+            block = nx.gnp_random_graph(size, rng.uniform(0.5, 1.0), seed=rng.randrange(10**6))
+            block = nx.relabel_nodes(block, {i: nxt + i for i in block})
+            if prev is not None:
+                # Le premier sommet du bloc est fusionné avec un sommet du bloc précédent
+                cut = rng.choice(prev)
+                block = nx.relabel_nodes(block, {nxt: cut})
+            G.add_edges_from(block.edges())
+            G.add_nodes_from(block.nodes())
+            prev = list(block.nodes())
+            nxt += size
+    for _ in range(rng.randint(5, 30)):
+        # Feuille (ou branche d’arbre) accrochée à un sommet existant
+        G.add_edge(rng.choice(list(G.nodes())), nxt)
+        nxt += 1
+    # Étiquettes en désordre : les tests ne doivent pas dépendre de 0..n-1
+    labels = list(G.nodes())
+    rng.shuffle(labels)
+    return nx.relabel_nodes(G, {v: f"v{labels.index(v)}" for v in G.nodes()})
+
+
+def _check_coloring(G: nx.Graph, coloring) -> None:
+    assert coloring is not None
+    assert set(coloring) == set(G.nodes())
+    assert is_valid_coloring(G, coloring)
+
+
+# ---------------------------------------------------------------------------
+# Noyau : degré minimum >= k, chaque sommet retiré a moins de k voisins
+# encore présents au moment du retrait
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("k", [1, 2, 3, 4])
+def test_peel_low_degree(k):
+    for seed in range(10):
+        g = CSRGraph.from_networkx(_random_graph(seed))
+        kernel, order = peel_low_degree(g, k)
+        assert sorted(order.tolist() + np.flatnonzero(kernel).tolist()) == list(range(g.n))
+        for v in np.flatnonzero(kernel).tolist():
+            assert kernel[g.neighbors(v)].sum() >= k
+        present = kernel.copy()
+        for v in order[::-1].tolist():
+            assert present[g.neighbors(v)].sum() < k
+            present[v] = True
+
+
+@pytest.mark.parametrize("k", [2, 3, 4])
+def test_extend_coloring_keeps_kernel_and_bound(k):
+    for seed in range(10):
+        G = _random_graph(seed)
+        g = CSRGraph.from_networkx(G)
+        kernel, order = peel_low_degree(g, k)
+        colors = np.full(g.n, -1, dtype=np.int32)
+        idx = np.flatnonzero(kernel)
+        if len(idx):
+            colors[idx] = greedy_colors(g.subgraph(idx))
+        kernel_colors = int(colors.max()) + 1
+        full = extend_coloring(g, colors.copy(), order)
+        assert g.is_valid(full)
+        assert (full[idx] == colors[idx]).all()
+        assert int(full.max()) + 1 <= max(k, kernel_colors)
+
+
+# ---------------------------------------------------------------------------
+# Blocs 2-connexes : ils recouvrent toutes les arêtes et chacun partage
+# au plus son sommet de rattachement avec les blocs précédents
+# ---------------------------------------------------------------------------
+def test_blocks_cover_edges_and_links():
+    for seed in range(15):
+        G = _random_graph(seed)
+        for comp in nx.connected_components(G):
+            H = G.subgraph(comp).copy()
+            pieces, links = _blocks(H)
+            assert len(pieces) == len(links)
+            assert links[0] is None
+            edges = [frozenset(e) for P in pieces for e in P.edges()]
+            assert len(edges) == len(set(edges))
+            assert set(edges) == {frozenset(e) for e in H.edges()}
+            seen = set(pieces[0].nodes())
+            for P, link in zip(pieces[1:], links[1:]):
+                assert link in P and link in seen
+                assert set(P.nodes()) & seen == {link}
+                seen |= set(P.nodes())
+            assert seen == set(H.nodes())
+
+
+# ---------------------------------------------------------------------------
+# Réassemblage : coloration valide, au plus max(k, couleurs des morceaux)
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("blocks", [False, True])
+@pytest.mark.parametrize("k", [None, 2, 3])
+def test_solve_decomposed_is_valid(k, blocks):
+    for seed in range(10):
+        G = _random_graph(seed)
+        coloring, infos, dec = solve_decomposed(G, _dsatur, k=k, blocks=blocks)
+        _check_coloring(G, coloring)
+        piece_colors = max((c for c in infos if c is not None), default=1)
+        assert _ncolors(coloring) <= max(k or 0, piece_colors)
+        assert dec.report.n == G.number_of_nodes()
+        assert dec.report.kernel_n + dec.report.peeled == dec.report.n
+        if blocks:
+            assert dec.report.pieces >= dec.report.components
+
+
+def test_solve_decomposed_parallel_matches_sequential():
+    G = _random_graph(42)
+    seq, _, _ = solve_decomposed(G, _dsatur, k=3, blocks=True, jobs=1)
+    par, _, _ = solve_decomposed(G, _dsatur, k=3, blocks=True, jobs=2)
+    _check_coloring(G, par)
+    assert par == seq
+
+
+def test_solve_decomposed_propagates_failure():
+    G = _random_graph(1)
+    coloring, _, dec = solve_decomposed(G, lambda P: (None, None), k=2, blocks=True)
+    assert coloring is None
+    assert decompose(G, 2, True).report == dec.report
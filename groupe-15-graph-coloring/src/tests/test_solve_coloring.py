@@ -0,0 +1,61 @@
+import itertools
+
+import networkx as nx
+import pytest
+
+from benchmark import is_valid_coloring
+from clique import max_clique
+from solve_coloring import ENCODINGS, SYMMETRY_MODES, solve_k_coloring, solve_min_coloring, solve_min_coloring_opt
+
+# Petits graphes au nombre chromatique connu
+GRAPHS = {
+    "C6": (nx.cycle_graph(6), 2),
+    "C7": (nx.cycle_graph(7), 3),
+    "petersen": (nx.petersen_graph(), 3),
+    "K5": (nx.complete_graph(5), 5),
+    "wheel8": (nx.wheel_graph(8), 4),        # moyeu + cycle impair C7
+    "grotzsch": (nx.mycielski_graph(4), 4),  # sans triangle : clique de 2 seulement
+}
+
+VARIANTS = list(itertools.product(ENCODINGS, SYMMETRY_MODES))
+
+
+def _check(G, coloring, k):
+    assert coloring is not None
+    assert set(coloring) == set(G.nodes())
+    assert is_valid_coloring(G, coloring)
+    assert len(set(coloring.values())) == k
+
+
+# ---------------------------------------------------------------------------
+# Les 9 combinaisons encodage x bris de symétrie trouvent le même optimum
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("encoding,symmetry", VARIANTS)
+@pytest.mark.parametrize("name", list(GRAPHS))
+def test_opt_variants_reach_chromatic_number(name, encoding, symmetry):
+    G, chi = GRAPHS[name]
+    clique = max_clique(G).clique
+    k, coloring, info = solve_min_coloring_opt(list(G.nodes()), list(G.edges()), timeout_s=10.0,
+                                               num_workers=1, clique=clique,
+                                               encoding=encoding, symmetry=symmetry)
+    assert info.status == "OPTIMAL"
+    assert k == chi and info.lower == info.upper == chi
+    # Dernier point de la trace : bornes finales du solveur
+    assert info.trace and (info.trace[-1].lower, info.trace[-1].upper) == (chi, chi)
+    _check(G, coloring, chi)
+
+
+@pytest.mark.parametrize("encoding,symmetry", VARIANTS)
+@pytest.mark.parametrize("name", ["C7", "wheel8", "grotzsch"])
+def test_min_variants_reach_chromatic_number(name, encoding, symmetry):
+    G, chi = GRAPHS[name]
+    clique = max_clique(G).clique
+    k, coloring, _ = solve_min_coloring(list(G.nodes()), list(G.edges()), timeout_per_k_s=10.0,
+                                          num_workers=1, clique=clique,
+                                          encoding=encoding, symmetry=symmetry)
+    assert k == chi
+    _check(G, coloring, chi)
+    # chi - 1 couleurs : prouvé impossible par chaque variante
+    col, info = solve_k_coloring(list(G.nodes()), list(G.edges()), chi - 1, timeout_s=10.0,
+                                 num_workers=1, clique=clique, encoding=encoding, symmetry=symmetry)
+    assert col is None and info.status == "INFEASIBLE"